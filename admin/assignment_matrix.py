@@ -0,0 +1,202 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from kivy.uix.screenmanager import Screen
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import NumericProperty, ObjectProperty
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from db.base import Session
+from db.models import GradeSection, Subject, Teacher
+from db.assignments import Assignment, load_matrix, sync_assignments
+from admin.superadmin.ui_helpers import ErrorPopup
+
+CELL_WIDTH = 110
+CELL_HEIGHT = 36
+EDITED_COLOR = (1, 0.8, 0.4, 1)
+NORMAL_COLOR = (1, 1, 1, 1)
+
+
+class TeacherChoice(Button):
+    """One teacher in the picker list; recycled as the list scrolls."""
+    teacher_id = NumericProperty(None, allownone=True)
+    pick_action = ObjectProperty(None)
+
+    def on_release(self):
+        self.pick_action(self.teacher_id)
+
+
+class TeacherPicker(Popup):
+    """Pick the teacher for one section x subject cell, or nobody."""
+
+    def __init__(self, teachers, on_pick, **kwargs):
+        super().__init__(size_hint=(0.5, 0.8), **kwargs)
+        self.teachers = teachers
+        self.on_pick = on_pick
+        layout = BoxLayout(orientation='vertical', spacing=5, padding=5)
+        search = TextInput(hint_text="Search by name", multiline=False, size_hint_y=None, height=40)
+        search.bind(text=lambda _, text: self.filter(text))
+        layout.add_widget(search)
+        self.choices = RecycleView(viewclass=TeacherChoice)
+        box = RecycleBoxLayout(orientation='vertical', default_size=(None, CELL_HEIGHT),
+                               default_size_hint=(1, None), size_hint_y=None)
+        box.bind(minimum_height=box.setter('height'))
+        self.choices.add_widget(box)
+        layout.add_widget(self.choices)
+        self.content = layout
+        self.filter('')
+
+    def filter(self, text):
+        text = text.strip().lower()
+        rows = [{'text': "(nobody)", 'teacher_id': None, 'pick_action': self.pick}]
+        rows += [{'text': name, 'teacher_id': teacher_id, 'pick_action': self.pick}
+                 for teacher_id, name in self.teachers.items() if text in name.lower()]
+        self.choices.data = rows
+
+    def pick(self, teacher_id):
+        self.dismiss()
+        self.on_pick(teacher_id)
+
+
+class AssignmentMatrixScreen(Screen):
+    """Sections x subjects grid; each cell shows who teaches that subject there.
+
+    The matrix loads with one query and edits stay in memory until Save,
+    which hands the edited sections' desired assignments to sync_assignments
+    so only the changed cells are written.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.matrix = set()
+        self.edits = {}         # (section_id, subject_id) -> teacher id or None
+        self.cells = {}         # (section_id, subject_id) -> Button
+        self.teachers = {}
+        layout = BoxLayout(orientation='vertical', padding=20, spacing=10)
+        layout.add_widget(Label(text="Teaching Assignments", font_size=24,
+                                color=(0.1, 0.3, 0.6, 1), size_hint_y=None, height=40))
+        self.status = Label(text="", size_hint_y=None, height=30)
+        layout.add_widget(self.status)
+        self.scroll = ScrollView(do_scroll_x=True, do_scroll_y=True)
+        layout.add_widget(self.scroll)
+        buttons = BoxLayout(spacing=10, size_hint_y=None, height=40)
+        for text, action in (("Save", self.save), ("Discard changes", self.load), ("Back", self.go_back)):
+            button = Button(text=text)
+            button.bind(on_press=lambda _, action=action: action())
+            buttons.add_widget(button)
+        layout.add_widget(buttons)
+        self.add_widget(layout)
+
+    def on_pre_enter(self, *args):
+        self.load()
+
+    def load(self):
+        self.teachers = {row.id: f"{row.first_name} {row.father_name}" for row in Session.execute(
+            select(Teacher.id, Teacher.first_name, Teacher.father_name)
+            .where(Teacher.role == 'teacher')
+            .order_by(Teacher.father_name, Teacher.first_name))}
+        subjects = Session.execute(select(Subject.id, Subject.name).order_by(Subject.name)).all()
+        sections = Session.execute(select(GradeSection.id, GradeSection.grade, GradeSection.section)
+                                   .order_by(GradeSection.grade, GradeSection.section)).all()
+        self.matrix = set(load_matrix(Session))
+        self.edits = {}
+        self.build_grid(sections, subjects)
+        self.status.text = f"{len(self.matrix)} assignments"
+
+    def teachers_of(self, section_id, subject_id):
+        if (section_id, subject_id) in self.edits:
+            teacher_id = self.edits[section_id, subject_id]
+            return [] if teacher_id is None else [teacher_id]
+        return sorted(a.teacher_id for a in self.matrix
+                      if a.section_id == section_id and a.subject_id == subject_id)
+
+    def cell_text(self, section_id, subject_id):
+        names = [self.teachers.get(t, f"#{t}") for t in self.teachers_of(section_id, subject_id)]
+        return " + ".join(names) or "-"
+
+    def build_grid(self, sections, subjects):
+        grid = GridLayout(cols=len(subjects) + 1, size_hint=(None, None),
+                          col_default_width=CELL_WIDTH, col_force_default=True,
+                          row_default_height=CELL_HEIGHT, row_force_default=True, spacing=2)
+        grid.bind(minimum_height=grid.setter('height'), minimum_width=grid.setter('width'))
+        grid.add_widget(Label(text=""))
+        for _, name in subjects:
+            grid.add_widget(Label(text=name, shorten=True, text_size=(CELL_WIDTH, None), halign='center'))
+        # index the matrix once instead of scanning it per cell
+        by_cell = {}
+        for a in self.matrix:
+            by_cell.setdefault((a.section_id, a.subject_id), []).append(a.teacher_id)
+        self.cells = {}
+        for section_id, grade, section in sections:
+            grid.add_widget(Label(text=f"{grade} {section}"))
+            for subject_id, _ in subjects:
+                names = [self.teachers.get(t, f"#{t}") for t in sorted(by_cell.get((section_id, subject_id), ()))]
+                cell = Button(text=" + ".join(names) or "-", shorten=True,
+                              text_size=(CELL_WIDTH - 6, None), halign='center')
+                cell.bind(on_press=lambda _, key=(section_id, subject_id): self.open_picker(*key))
+                self.cells[section_id, subject_id] = cell
+                grid.add_widget(cell)
+        self.scroll.clear_widgets()
+        self.scroll.add_widget(grid)
+
+    def open_picker(self, section_id, subject_id):
+        def pick(teacher_id):
+            self.edits[section_id, subject_id] = teacher_id
+            cell = self.cells[section_id, subject_id]
+            cell.text = self.cell_text(section_id, subject_id)
+            cell.background_color = EDITED_COLOR
+            self.status.text = f"{len(self.edits)} unsaved changes"
+        TeacherPicker(self.teachers, pick, title="Assign teacher").open()
+
+    def desired_matrix(self, current):
+        """current with every edited cell replaced by its new teacher."""
+        desired = {a for a in current if (a.section_id, a.subject_id) not in self.edits}
+        desired |= {Assignment(teacher_id, subject_id, section_id)
+                    for (section_id, subject_id), teacher_id in self.edits.items()
+                    if teacher_id is not None}
+        return desired
+
+    def save(self):
+        if not self.edits:
+            return
+        # re-read the edited sections so changes another admin saved to other
+        # cells meanwhile are kept, not overwritten with this screen's copy
+        sections = {section_id for section_id, _ in self.edits}
+        current = load_matrix(Session, sections)
+        try:
+            report = sync_assignments(Session, self.desired_matrix(current), sections=sections)
+        except IntegrityError:
+            ErrorPopup("Could not save: a teacher, subject or section was removed meanwhile.").open()
+            return
+        self.matrix = set(load_matrix(Session))
+        for key in self.edits:
+            self.cells[key].background_color = NORMAL_COLOR
+        self.edits = {}
+        message = f"Saved: {report['inserted']} added, {report['deleted']} removed"
+        if report['kept']:
+            message += f", {len(report['kept'])} kept because they have recorded assessments"
+            for a in report['kept']:
+                self.cells[a.section_id, a.subject_id].text = self.cell_text(a.section_id, a.subject_id)
+        self.status.text = message
+
+    def go_back(self):
+        self.manager.current = 'school_admin_teacher_crud'
@@ -12,37 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from kivy.app import App
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
-from sqlalchemy.exc import IntegrityError
-from kivy.uix.scrollview import ScrollView
-from db import models
+from sqlalchemy.exc import IntegrityError, NoResultFound
+from kivy.clock import Clock
+import os
+from db import models, directory
+from db.base import Session
+from admin.superadmin.ui_helpers import TeacherList, ConfirmPopup, SEARCH_DELAY
 #!! this class is in the kivy ORM code it needs to  be changed  into Sqlalchemy code.
 class SchoolAdminTeacherCRUD:
     def __init__(self, models):
         self.models = models
 
     def create_teacher(self, **kwargs):
-        try:
-            return self.models.session.add(self.models.Teacher(**kwargs))
-        except Exception as e:
-            print(f"Error creating teacher: {e}")
-            return None
+        # IntegrityError goes to the form, which reports the duplicate
+        return self.models.Teacher.create_teacher(Session, **kwargs)
 
     def read_teachers(self):
-        return list(self.models.session.query(self.models.Teacher).all())
+        return list(Session.query(self.models.Teacher).all())
 
     def update_teacher(self, teacher_id, **kwargs):
         try:
-            query = self.models.session.query(self.models.Teacher).filter(self.models.Teacher.id == teacher_id)
+            query = Session.query(self.models.Teacher).filter(self.models.Teacher.id == teacher_id)
             query.update(**kwargs)
-            self.models.session.commit()
+            Session.commit()
             return True
         except Exception as e:
             print(f"Error updating teacher: {e}")
@@ -59,8 +59,8 @@ class SchoolAdminTeacherCRUD:
     
     def get_teacher(self, teacher_id):
         try:
-            return self.models.session.query(self.models.Teacher).filter(self.models.Teacher.id == teacher_id).one()
-        except self.models.session.NoResultFound:
+            return Session.query(self.models.Teacher).filter(self.models.Teacher.id == teacher_id).one()
+        except NoResultFound:
             return None
 
 class SchoolAdminTeacherCRUDScreen(Screen):
@@ -73,38 +73,67 @@ class SchoolAdminTeacherCRUDScreen(Screen):
         self.add_btn = Button(text="Add Teacher", size_hint_y=None, height=40)
         self.add_btn.bind(on_press=lambda instance: self.show_add_popup(instance))
         self.layout.add_widget(self.add_btn)
+        self.import_btn = Button(text="Import Teachers (CSV / XLSX)", size_hint_y=None, height=40)
+        self.import_btn.bind(on_press=lambda _: self.show_import_popup())
+        self.layout.add_widget(self.import_btn)
+        self.assignments_btn = Button(text="Teaching Assignments", size_hint_y=None, height=40)
+        self.assignments_btn.bind(on_press=lambda _: setattr(self.manager, 'current', 'assignment_matrix'))
+        self.layout.add_widget(self.assignments_btn)
 
         self.refresh_button = Button(text="Refresh", size_hint_y=None, height=40)
         self.refresh_button.bind(on_press=lambda _: self.refresh())
         self.layout.add_widget(self.refresh_button)
-        self.teacher_layout = GridLayout(cols=1, spacing=10, size_hint_y=None)
-        self.teacher_layout.bind(minimum_height=self.teacher_layout.setter('height'))
-        scroll = ScrollView(size_hint=(1, 1))
-        scroll.add_widget(self.teacher_layout)
-        self.layout.add_widget(scroll)
+        self.search_prefix = ''
+        # one query once typing pauses, not one per keystroke
+        self._search_trigger = Clock.create_trigger(self.refresh, SEARCH_DELAY)
+        self.search_input = TextInput(hint_text="Search by father name", multiline=False, size_hint_y=None, height=40)
+        self.search_input.bind(text=lambda _, text: self.search(text))
+        self.layout.add_widget(self.search_input)
+        self.teacher_list = TeacherList()
+        self.layout.add_widget(self.teacher_list)
         self.add_widget(self.layout)
+        self.refresh()
     
-    def refresh(self):
-        # Clear existing widgets except the header and add button
-        self.teacher_layout.clear_widgets()
-        self.layout.add_widget(Label(text="School Admin - Teacher Management", font_size=24, color=(0.1, 0.3, 0.6, 1)))
-        self.layout.add_widget(self.add_btn)
-        
-        teachers = self.admin.read_teachers()
-        for teacher in teachers:
-            box = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
-            box.add_widget(Label(text=f"{teacher.full_name} ({teacher.username})", color=(0,0,0,1)))
-            edit_btn = Button(text="Edit", size_hint_x=None, width=80)
-            edit_btn.bind(on_press=lambda _, t=teacher: self.show_edit_popup(t))
-            box.add_widget(edit_btn)
-            del_btn = Button(text="Delete", size_hint_x=None, width=80, background_color=(1,0.3,0.3,1))
-            del_btn.bind(on_press=lambda _, t=teacher: self.delete_teacher(t))
-            box.add_widget(del_btn)
-            self.layout.add_widget(box)
+    def refresh(self, *args):
+        self.teacher_list.load(self.teacher_page)
+
+    def search(self, text):
+        self.search_prefix = text.strip()
+        self._search_trigger()
+
+    def teacher_page(self, cursor):
+        rows, cursor = directory.teacher_page(Session, after=cursor, prefix=self.search_prefix)
+        return [self.teacher_row(row) for row in rows], cursor
+
+    def teacher_row(self, teacher):
+        return {
+            'teacher_id': teacher.id,
+            'sort_key': directory.sort_key(teacher.father_name, teacher.first_name, teacher.id),
+            'text': f"{directory.display_name(teacher)} ({teacher.username})",
+            'edit_action': self.show_edit_popup,
+            'delete_action': self.delete_teacher,
+        }
         
     
     def show_add_popup(self, instance):
         self._show_teacher_popup("Add Teacher")
+
+    def show_edit_popup(self, teacher_id):
+        self._show_teacher_popup("Edit Teacher", teacher=self.admin.get_teacher(teacher_id))
+
+    def delete_teacher(self, teacher_id):
+        teacher = self.admin.get_teacher(teacher_id)
+        if teacher is None:
+            # already deleted elsewhere, only the row was left
+            self.teacher_list.remove_row(teacher_id)
+            return
+
+        def confirm(_):
+            Session.delete(teacher)
+            Session.commit()
+            self.teacher_list.remove_row(teacher_id)
+
+        ConfirmPopup(message=f"Delete {teacher.full_name}?", on_confirm=confirm).open()
     
     def error_popup(self, message):
         content = BoxLayout(orientation='vertical', spacing=10, padding=10)
@@ -115,6 +144,57 @@ class SchoolAdminTeacherCRUDScreen(Screen):
         ok_btn.bind(on_press=lambda _: popup.dismiss())
         popup.open()
         
+    def show_import_popup(self):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        path_input = TextInput(hint_text="Spreadsheet path (.csv or .xlsx)", multiline=False)
+        status = Label(text="The credentials slip is saved next to the spreadsheet.")
+        content.add_widget(path_input)
+        content.add_widget(status)
+        btn_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint_y=None, height=40)
+        import_btn = Button(text="Import")
+        close_btn = Button(text="Close")
+        btn_layout.add_widget(import_btn)
+        btn_layout.add_widget(close_btn)
+        content.add_widget(btn_layout)
+        popup = Popup(title="Import Teachers", content=content, size_hint=(0.7, 0.5))
+
+        def finished(report, error):
+            import_btn.disabled = False
+            if error is not None:
+                status.text = f"Import failed, nothing was saved: {error}"
+                return
+            lines = [f"Imported {report['inserted']} teachers."]
+            if report['slip']:
+                lines.append(f"Credentials slip: {report['slip']}")
+            lines += [f"Row {number}: {reason}" for number, reason in report['invalid'][:5]]
+            if len(report['invalid']) > 5:
+                lines.append(f"... and {len(report['invalid']) - 5} more invalid rows")
+            status.text = "\n".join(lines)
+            self.refresh()
+
+        def run(path):
+            from onboard_teachers import onboard_teachers
+            try:
+                slip = os.path.splitext(path)[0] + "-credentials.docx"
+                return onboard_teachers(path, slip, session=Session())
+            finally:
+                # the worker thread's session must not outlive the call
+                Session.remove()
+
+        def start(_):
+            path = path_input.text.strip()
+            if not os.path.isfile(path):
+                status.text = "No such file."
+                return
+            import_btn.disabled = True
+            status.text = "Importing..."
+            # hashing takes seconds; the auth worker runs it off the UI thread
+            App.get_running_app().auth.submit(run, finished, path)
+
+        import_btn.bind(on_press=start)
+        close_btn.bind(on_press=lambda _: popup.dismiss())
+        popup.open()
+
     def _show_teacher_popup(self, title, teacher=None):
         content = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
@@ -127,9 +207,8 @@ class SchoolAdminTeacherCRUDScreen(Screen):
         if teacher:
             first_name_input.text = teacher.first_name
             father_name_input.text = teacher.father_name
-            grandfather_input.text  = teacher.grandfather_name
-            sex_input.text  = teacher.sex
-            role.text = teacher.role
+            grandfather_name_input.text  = teacher.grandfather_name or ''
+            sex_input.text  = teacher.sex or "Select Sex"
         
         content.add_widget(first_name_input)
         content.add_widget(father_name_input)
@@ -154,14 +233,23 @@ class SchoolAdminTeacherCRUDScreen(Screen):
                 "role" : "teacher"
             }
             try :
-                self.admin.create_teacher(**data)
+                if teacher is None:
+                    saved = self.admin.create_teacher(**data)
+                else:
+                    saved = teacher
+                    for field in ("first_name", "father_name", "grandfather_name", "sex"):
+                        setattr(teacher, field, data[field])
+                    if data["password"]:
+                        teacher.set_password(data["password"])
+                    Session.commit()
             except IntegrityError:
                 self.error_popup("A teacher with the same name already exists.")
-                models.session.rollback()
+                Session.rollback()
                 return
             popup.dismiss()
-            self.refresh()
-        save_btn = Button(text="Save", size_hint_y=None, height=40)
+            if saved is not None:
+                self.teacher_list.upsert_row(self.teacher_row(saved), matches=directory.matches_prefix(
+                    saved.father_name, self.search_prefix))
         save_btn.bind(on_press=save_teacher)
         cancel_btn.bind(on_press=lambda _: popup.dismiss())
 
@@ -12,10 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-import os 
-from passlib.hash import pbkdf2_sha256
-from db import models
+from db import models, directory
+from db.base import Session
 
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
@@ -27,24 +25,8 @@ from kivy.uix.button import Button
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.popup import Popup
 from kivy.core.window import Window
+from kivy.clock import Clock
 from sqlalchemy.exc import IntegrityError
-from kivy.lang.builder import Builder
-
-KV_FILE = os.path.join(os.path.dirname(__file__), 'superadmin.kv')
-
-Builder.load_file(KV_FILE)
-ADMIN_FILE = os.path.join(os.path.dirname(__file__), 'admin.json')
-# ======== AUTHENTICATION ========
-def authenticate_admin(username, password):
-    with open(ADMIN_FILE, 'r') as f:
-        admin_data = json.load(f)
-    admin_name = admin_data.get('admin_name')
-    admin_password = admin_data.get('admin_password')
-    if username is None or password is None:
-        raise Exception('the user name or password can\'t be empty')
-    if username == admin_name and pbkdf2_sha256.verify(password, admin_password):
-        return admin_data
-    return None
 
 class SuperAdmin:
     def __init__(self, models):
@@ -55,27 +37,27 @@ class SuperAdmin:
         # Teacher: peewee Model class
         # teacher_data: dict with teacher info
 
-        return self.models.Teacher.create_teacher(models.session, **kwargs)
+        return self.models.Teacher.create_teacher(Session, **kwargs)
 
     def read_teachers(self):
-        return self.models.session.query(self.models.Teacher).all()
+        return Session.query(self.models.Teacher).all()
 
     @classmethod
     def update_teacher(cls, teacher_id, updated_data):
-        query = cls.models.session.query(cls.models.Teacher).filter(cls.models.Teacher.id == teacher_id)
+        query = Session.query(cls.models.Teacher).filter(cls.models.Teacher.id == teacher_id)
         query.update(**updated_data)
-        cls.models.session.commit()
+        Session.commit()
         return query.one_or_none()
 
     @classmethod
     def delete_teacher(cls, teacher_id):
-        query = cls.models.session.query(cls.models.Teacher).filter(cls.models.Teacher.id == teacher_id)
+        query = Session.query(cls.models.Teacher).filter(cls.models.Teacher.id == teacher_id)
         query.delete()
-        cls.models.session.commit()
+        Session.commit()
         return query.one_or_none()
 
 from kivy.uix.screenmanager import Screen
-from .ui_helpers import ConfirmPopup, ErrorPopup, AdminFormPopup
+from .ui_helpers import ConfirmPopup, ErrorPopup, AdminFormPopup, SEARCH_DELAY
 # from your_models import SuperAdmin, models
 
 class SuperAdminScreen(Screen):
@@ -83,35 +65,32 @@ class SuperAdminScreen(Screen):
 
     def on_kv_post(self, base_widget):
         """Load admins once KV widgets are ready."""
+        self.search_prefix = ''
+        # one query once typing pauses, not one per keystroke
+        self._search_trigger = Clock.create_trigger(self.refresh, SEARCH_DELAY)
         self.refresh()
 
-    def refresh(self):
-        """Reloads admin list into the scrollable layout."""
-        layout = self.ids.admins_layout
-        layout.clear_widgets()
+    def refresh(self, *args):
+        """Reloads the admin list a page at a time; rows are plain dicts rendered by the RecycleView."""
+        self.ids.admins_layout.load(self.admin_page)
 
-        admins = SuperAdmin(models).read_teachers()
-        for admin in admins:
-            self.add_admin_row(admin)
+    def search(self, text):
+        self.search_prefix = text.strip()
+        self._search_trigger()
 
-    def add_admin_row(self, admin):
-        """Adds a row with username, edit, and delete buttons."""
-        from kivy.uix.boxlayout import BoxLayout
-        from kivy.uix.button import Button
-        from kivy.uix.label import Label
+    def admin_page(self, cursor):
+        rows, cursor = directory.teacher_page(Session, after=cursor, prefix=self.search_prefix)
+        return [self.admin_row(row) for row in rows], cursor
 
-        box = BoxLayout(orientation='horizontal', size_hint_y=None, height=40)
-        box.add_widget(Label(text=admin.username, color=(0, 0, 0, 1)))
-
-        edit_btn = Button(text="Edit", size_hint_x=None, width=80)
-        edit_btn.bind(on_press=lambda _, a=admin: self.edit_admin(a))
-        box.add_widget(edit_btn)
-
-        del_btn = Button(text="Delete", size_hint_x=None, width=80, background_color=(1, 0.3, 0.3, 1))
-        del_btn.bind(on_press=lambda _, a=admin: self.delete_admin(a))
-        box.add_widget(del_btn)
-
-        self.ids.admins_layout.add_widget(box)
+    def admin_row(self, admin):
+        """Row data with username, edit, and delete actions."""
+        return {
+            'teacher_id': admin.id,
+            'sort_key': directory.sort_key(admin.father_name, admin.first_name, admin.id),
+            'text': admin.username,
+            'edit_action': self.edit_admin,
+            'delete_action': self.delete_admin,
+        }
 
     # ---------- POPUP HANDLERS ----------
 
@@ -123,8 +102,9 @@ class SuperAdminScreen(Screen):
         )
         popup.open()
 
-    def edit_admin(self, admin):
+    def edit_admin(self, admin_id):
         """Show popup to edit an existing admin."""
+        admin = Session.get(models.Teacher, admin_id)
         popup = AdminFormPopup(
             title="Edit Super Admin",
             admin=admin,
@@ -132,8 +112,9 @@ class SuperAdminScreen(Screen):
         )
         popup.open()
 
-    def delete_admin(self, admin):
+    def delete_admin(self, admin_id):
         """Ask confirmation before deleting admin."""
+        admin = Session.get(models.Teacher, admin_id)
         popup = ConfirmPopup(
             message=f"Delete {admin.username}?",
             on_confirm=lambda _: self._delete_admin_action(admin)
@@ -144,7 +125,7 @@ class SuperAdminScreen(Screen):
 
     def _add_admin_action(self, data):
         try:
-            SuperAdmin(models).create_teacher(
+            admin = SuperAdmin(models).create_teacher(
                 first_name=data['first_name'],
                 father_name=data['father_name'],
                 grandfather_name=data['grandfather_name'],
@@ -152,8 +133,10 @@ class SuperAdminScreen(Screen):
                 password=data['password'],
                 role='admin'
             )
-            self.refresh()
+            self.ids.admins_layout.upsert_row(
+                self.admin_row(admin), matches=directory.matches_prefix(admin.father_name, self.search_prefix))
         except IntegrityError:
+            Session.rollback()
             ErrorPopup("An admin with the same name already exists.").open()
 
     def _edit_admin_action(self, admin, data):
@@ -162,9 +145,12 @@ class SuperAdminScreen(Screen):
         admin.grandfather_name = data['grandfather_name']
         admin.sex = data['sex']
         admin.set_password(data['password'])
-        admin.save()
-        self.refresh()
+        Session.commit()
+        self.ids.admins_layout.upsert_row(
+            self.admin_row(admin), matches=directory.matches_prefix(admin.father_name, self.search_prefix))
 
     def _delete_admin_action(self, admin):
-        admin.delete_instance()
-        self.refresh()
+        admin_id = admin.id
+        Session.delete(admin)
+        Session.commit()
+        self.ids.admins_layout.remove_row(admin_id)
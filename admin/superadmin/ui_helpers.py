@@ -13,17 +13,100 @@
 # limitations under the License.
 
 import os
+from bisect import bisect
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.spinner import Spinner
+from kivy.uix.recycleview import RecycleView
+from kivy.properties import NumericProperty, StringProperty, ObjectProperty
 from kivy.lang.builder import Builder
 
 KV_FILE = os.path.join(os.path.dirname(__file__), 'superadmin.kv')
+# seconds of no typing before a search box queries
+SEARCH_DELAY = 0.3
 
 Builder.load_file(KV_FILE)
+
+
+class TeacherRow(BoxLayout):
+    """One row of a TeacherList; instances are recycled as the list scrolls."""
+    teacher_id = NumericProperty(0)
+    sort_key = ObjectProperty(None)
+    text = StringProperty('')
+    edit_action = ObjectProperty(None)
+    delete_action = ObjectProperty(None)
+
+
+class TeacherList(RecycleView):
+    """Virtualized teacher list backed by plain dicts.
+
+    Each row dict has teacher_id, sort_key (directory.sort_key of the row),
+    text, edit_action and delete_action keys. Only the visible rows have
+    widgets, and upsert_row / remove_row change single entries so the view
+    updates in place instead of rebuilding.
+
+    Rows are fetched a page at a time from ``page_source(cursor)``, which
+    returns (rows, next_cursor); the next page loads when the list is
+    scrolled near its end.
+    """
+    LOAD_MORE_AT = 0.05
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._page_source = None
+        self._cursor = None
+        self._exhausted = True
+        self._last_key = None
+
+    def load(self, page_source):
+        self._page_source = page_source
+        self._cursor = None
+        self._exhausted = False
+        self.data = []
+        self.load_next_page()
+
+    def load_next_page(self):
+        if self._exhausted:
+            return
+        rows, self._cursor = self._page_source(self._cursor)
+        self._exhausted = self._cursor is None
+        if rows:
+            self._last_key = rows[-1]['sort_key']
+        self.data.extend(rows)
+
+    def on_scroll_y(self, instance, scroll_y):
+        if scroll_y <= self.LOAD_MORE_AT:
+            self.load_next_page()
+
+    def _position(self, teacher_id):
+        for i, row in enumerate(self.data):
+            if row['teacher_id'] == teacher_id:
+                return i
+        return None
+
+    def upsert_row(self, row, matches=True):
+        """Add or update one row at its place in sort_key order.
+
+        A row that no longer ``matches`` the active search is dropped. One
+        that sorts after the last fetched row is left out, the next page
+        brings it, so it never shows twice.
+        """
+        i = self._position(row['teacher_id'])
+        if i is not None:
+            del self.data[i]
+        if not matches or (not self._exhausted and row['sort_key'] > self._last_key):
+            return
+        self.data.insert(bisect([r['sort_key'] for r in self.data], row['sort_key']), row)
+
+    def remove_row(self, teacher_id):
+        i = self._position(teacher_id)
+        if i is not None:
+            del self.data[i]
+
+
 class ErrorPopup(Popup):
     """Displays a simple error message."""
     def __init__(self, message, **kwargs):
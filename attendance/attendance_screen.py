@@ -0,0 +1,133 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.screenmanager import Screen
+from kivy.properties import (
+    BooleanProperty, NumericProperty, ObjectProperty, StringProperty
+)
+from kivy.lang.builder import Builder
+
+from db.base import Session
+from db.models import Attendance, AttendanceStatusEnum
+from db.roster import roster_for_day, teacher_sections
+from db.teacher_context import current_teacher
+from eth_custom_calendar.calendar_core import calendar
+
+KV_FILE = os.path.join(os.path.dirname(__file__), 'attendance.kv')
+
+Builder.load_file(KV_FILE)
+
+
+class AttendanceRow(BoxLayout):
+    """One student with a button per status; recycled as the list scrolls."""
+    student_id = NumericProperty(0)
+    text = StringProperty('')
+    status = StringProperty('')
+    mark_action = ObjectProperty(None)
+
+
+class RosterList(RecycleView):
+    """Roster rows as plain dicts: student_id, text, status and mark_action."""
+
+    def set_status(self, student_id, status):
+        for row in self.data:
+            if row['student_id'] == student_id:
+                row['status'] = status
+                break
+        self.refresh_from_data()
+
+
+class AttendanceScreen(Screen):
+    """Mark one section for one day.
+
+    usage :
+        screen.open_day(teacher_id, date)   # date is a datetime.date
+    """
+    teacher_id = NumericProperty(None, allownone=True)
+    day = ObjectProperty(None)
+    title = StringProperty('')
+    # shown under the title, e.g. how many students the last save wrote
+    message = StringProperty('')
+    dirty = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sections = {}
+        self.section_id = None
+        self.marks = {}
+
+    def open_day(self, teacher_id, day):
+        self.teacher_id = teacher_id
+        self.day = day
+        eth = calendar.to_ethiopian(day)
+        self.title = f"Attendance {eth.year}/{eth.month}/{eth.day}"
+
+    def on_pre_enter(self, *args):
+        context = current_teacher.get(Session)
+        if context is not None and context.teacher_id == self.teacher_id:
+            sections = context.sections
+        else:
+            sections = teacher_sections(Session, self.teacher_id)
+        self.sections = {label: section_id for section_id, label in sections}
+        spinner = self.ids.section_spinner
+        spinner.values = list(self.sections)
+        if spinner.text in self.sections:
+            self.load()
+        elif spinner.values:
+            spinner.text = spinner.values[0]   # on_text loads it
+        else:
+            spinner.text = 'No assigned sections'
+            self.ids.roster_list.data = []
+
+    def show_section(self, label):
+        if label in self.sections:
+            self.load()
+
+    def load(self):
+        """Fill the list from the cached roster; one query for the day's marks."""
+        self.section_id = self.sections[self.ids.section_spinner.text]
+        roster, marks = roster_for_day(Session, self.section_id, self.teacher_id, self.day)
+        self.marks = marks
+        self.dirty = False
+        self.message = ''
+        self.ids.roster_list.data = [
+            {'student_id': student.id, 'text': student.name,
+             'status': marks.get(student.id, ''), 'mark_action': self.mark}
+            for student in roster.students
+        ]
+
+    def mark(self, student_id, status):
+        self.marks[student_id] = status
+        self.dirty = True
+        self.ids.roster_list.set_status(student_id, status)
+
+    def mark_all_present(self):
+        present = AttendanceStatusEnum.PRESENT.value
+        for row in self.ids.roster_list.data:
+            row['status'] = present
+            self.marks[row['student_id']] = present
+        self.dirty = True
+        self.ids.roster_list.refresh_from_data()
+
+    def save(self):
+        outcomes = Attendance.bulk_mark(Session, self.teacher_id, self.day, self.marks)
+        written = sum(1 for outcome in outcomes.values() if outcome in ("inserted", "updated"))
+        self.message = f"Saved attendance for {written} students"
+        self.dirty = False
+
+    def go_back(self):
+        self.manager.current = 'calendar'
@@ -0,0 +1,88 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Super admin credentials, kept apart from the admin screens.
+
+auth.service checks these at login from a worker thread; living here
+rather than in admin.superadmin.admin means that does not import Kivy
+widgets or open a window.
+"""
+
+import json
+import os
+import threading
+
+from auth import policy
+
+ADMIN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          'admin', 'superadmin', 'admin.json')
+
+
+class AdminCredentialStore:
+    """Super admin credentials from admin.json, loaded once and reloaded when the file's mtime changes.
+
+    admin.json holds either one admin object or a list of them, each with
+    admin_name / admin_password / admin_role keys.
+
+    usage :
+        store = AdminCredentialStore(ADMIN_FILE)
+        if username in store:
+            admin_data = store.authenticate(username, password)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._admins = {}
+        self._lock = threading.Lock()
+
+    def _entries(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime != self._mtime:
+                admins = {}
+                if mtime is not None:
+                    with open(self.path, 'r') as f:
+                        data = json.load(f)
+                    for entry in (data if isinstance(data, list) else [data]):
+                        admins[entry['admin_name']] = entry
+                self._admins = admins
+                self._mtime = mtime
+            return self._admins
+
+    def __contains__(self, username):
+        return username in self._entries()
+
+    def get(self, username):
+        return self._entries().get(username)
+
+    def authenticate(self, username, password):
+        """admin_data for a correct username and password, else None after the same KDF time."""
+        admin_data = self.get(username) if username and password else None
+        if admin_data is None:
+            policy.dummy_verify(password or '')
+            return None
+        if policy.verify(password, admin_data.get('admin_password')):
+            return admin_data
+        return None
+
+
+admin_store = AdminCredentialStore(ADMIN_FILE)
+
+
+def authenticate_admin(username, password):
+    return admin_store.authenticate(username, password)
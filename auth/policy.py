@@ -0,0 +1,147 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Password hashing policy.
+
+The pbkdf2 cost is chosen per deployment profile, set with the
+SMIS_HASH_PROFILE environment variable or configure(). Hashes weaker than
+the active profile are upgraded the next time their owner logs in.
+
+Successful verifications are remembered for a few minutes so a teacher
+unlocking the screen again doesn't pay the full KDF. Cache keys are an HMAC
+of (username, password, stored hash) under a per-process random key, so the
+cache never holds anything cheaper to brute force than the database, and a
+password change invalidates old entries automatically.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from passlib.context import CryptContext
+
+# profile name -> pbkdf2_sha256 rounds
+PROFILES = {
+    "lab": 29000,         # passlib's default, for the slow lab PCs
+    "standard": 100000,
+    "strong": 310000,
+}
+DEFAULT_PROFILE = "standard"
+
+CACHE_TTL = 15 * 60       # seconds
+CACHE_SIZE = 256          # entries
+
+context = None
+profile = None
+
+
+def make_context(profile_name):
+    if profile_name not in PROFILES:
+        raise ValueError(f"unknown hash profile {profile_name!r}, expected one of {sorted(PROFILES)}")
+    rounds = PROFILES[profile_name]
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        default="pbkdf2_sha256",
+        pbkdf2_sha256__default_rounds=rounds,
+        # anything below the profile's cost is reported by needs_update and rehashed
+        pbkdf2_sha256__min_rounds=rounds,
+    )
+
+
+def configure(profile_name):
+    global context, profile, _dummy_hash
+    context = make_context(profile_name)
+    profile = profile_name
+    _dummy_hash = None
+    verification_cache.clear()
+
+
+class VerificationCache:
+    """Bounded LRU of recent successful verifications with a time limit."""
+
+    def __init__(self, ttl=CACHE_TTL, maxsize=CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._key = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, username, password, password_hash):
+        message = "\0".join((username or "", password, password_hash)).encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def hit(self, username, password, password_hash):
+        key = (username, self._digest(username, password, password_hash))
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, username, password, password_hash):
+        key = (username, self._digest(username, password, password_hash))
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, username):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == username]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verification_cache = VerificationCache()
+_dummy_hash = None
+
+
+def hash_password(password):
+    return context.hash(password)
+
+
+def verify_and_update(password, password_hash, username=None):
+    """Return (ok, new_hash); new_hash is set when the stored hash should be replaced."""
+    if username is not None and verification_cache.hit(username, password, password_hash):
+        return True, None
+    ok, new_hash = context.verify_and_update(password, password_hash)
+    if ok and username is not None:
+        verification_cache.add(username, password, new_hash or password_hash)
+    return ok, new_hash
+
+
+def verify(password, password_hash):
+    return context.verify(password, password_hash)
+
+
+def dummy_verify(password):
+    """Spend the same KDF time as a real check so unknown usernames don't return faster."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = context.hash(os.urandom(16).hex())
+    context.verify(password, _dummy_hash)
+
+
+configure(os.environ.get("SMIS_HASH_PROFILE", DEFAULT_PROFILE))
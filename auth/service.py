@@ -0,0 +1,134 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Password hashing and login off the Kivy UI thread.
+
+pbkdf2 takes hundreds of ms on the lab PCs, so login runs in a worker thread
+(hashlib releases the GIL while hashing) and the result is handed back to the
+UI thread with Clock.schedule_once. Bulk password setting fans out over a
+process pool so every core is used; the workers hash with the calling
+process's policy profile, whatever configure() set it to.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+from kivy.clock import Clock
+
+from auth import policy
+from auth.admins import admin_store
+from db import models
+from db.base import Session
+from db.teacher_context import load_teacher_context
+
+# below this many passwords the process pool start-up costs more than it saves
+MIN_PARALLEL_BATCH = 4
+
+
+@lru_cache(maxsize=None)
+def _context(profile):
+    return policy.make_context(profile)
+
+
+def hash_password(password, profile=None):
+    """Top level so it can be pickled into pool workers.
+
+    profile is the parent's policy profile: a worker only knows the one
+    SMIS_HASH_PROFILE or the default gives it.
+    """
+    if profile is None or profile == policy.profile:
+        return policy.hash_password(password)
+    return _context(profile).hash(password)
+
+
+def hash_passwords(passwords, max_workers=None):
+    """Hash a list of passwords in order, in parallel across cores for large batches."""
+    passwords = list(passwords)
+    workers = min(max_workers or os.cpu_count() or 1, len(passwords))
+    if len(passwords) < MIN_PARALLEL_BATCH or workers <= 1:
+        return [policy.hash_password(p) for p in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_password, passwords, repeat(policy.profile),
+                             chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def set_passwords(pairs, max_workers=None):
+    """Batch version of Teacher.set_password for a list of (teacher, password)."""
+    pairs = list(pairs)
+    hashes = hash_passwords((password for _, password in pairs), max_workers=max_workers)
+    for (teacher, _), password_hash in zip(pairs, hashes):
+        teacher.password_hash = password_hash
+    return [teacher for teacher, _ in pairs]
+
+
+def authenticate(username, password):
+    """Blocking check of super admin then teacher credentials.
+
+    Returns ("super_admin", admin_data), ("teacher", TeacherContext) or (None, None).
+    """
+    # super admins are looked up in memory first so teacher logins skip the admin KDF
+    if username in admin_store:
+        admin_data = admin_store.authenticate(username, password)
+        return ("super_admin", admin_data) if admin_data is not None else (None, None)
+    try:
+        session = Session()
+        teacher = models.Teacher.authenticate(session, username, password)
+        # the assignments are loaded here too, so the UI thread gets a detached snapshot
+        context = load_teacher_context(session, teacher.id) if teacher is not None else None
+    finally:
+        # the worker thread's session must not outlive the call
+        Session.remove()
+    if context is not None:
+        return "teacher", context
+    return None, None
+
+
+class AuthService:
+    """Runs authentication in a background thread and calls back on the UI thread.
+
+    usage :
+        auth = AuthService()
+        auth.login(username, password, callback)   # callback(kind, user)
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+
+    def submit(self, fn, callback, *args):
+        """Run fn(*args) in the worker and call callback(result, error) on the UI thread."""
+        future = self._executor.submit(fn, *args)
+
+        def deliver(done):
+            error = done.exception()
+            result = None if error is not None else done.result()
+            Clock.schedule_once(lambda dt: callback(result, error))
+
+        future.add_done_callback(deliver)
+        return future
+
+    def login(self, username, password, callback):
+        def unpack(result, error):
+            if error is not None:
+                print(f"Error during login: {error}")
+                result = (None, None)
+            callback(*result)
+        return self.submit(authenticate, unpack, username, password)
+
+    def set_passwords(self, pairs, callback, max_workers=None):
+        return self.submit(set_passwords, callback, pairs, max_workers)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,114 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Attendance analytics over synthetic school data.
+
+Seeds students x school days of attendance (two teachers mark each student
+a day), then times the cursor load into arrays and every metric. A plain
+Python loop computing absence rates is timed alongside for comparison.
+
+usage :
+    python -m benchmarks.bench_analytics [students] [days]
+"""
+
+import datetime
+import random
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy.orm import sessionmaker
+
+from db.analytics import (
+    ABSENT, AttendanceMatrix, load_attendance, load_sections, score_distribution
+)
+from db.base import make_engine
+from db.models import Base
+
+TEACHERS_PER_DAY = 2
+SECTIONS = 40
+
+
+def seed(session, students, days, rng):
+    connection = session.connection().connection
+    connection.executemany("INSERT INTO grade_section (id, grade, section) VALUES (?, ?, ?)",
+                           [(i + 1, str(9 + i // 10), str(i % 10)) for i in range(SECTIONS)])
+    connection.executemany("INSERT INTO teacher (id, first_name, father_name, username, password_hash, role) "
+                           "VALUES (?, 't', 't', ?, 'x', 'teacher')",
+                           [(i + 1, f"TH{i:05d}") for i in range(TEACHERS_PER_DAY)])
+    connection.executemany("INSERT INTO student (id, first_name, father_name, age, section_id) "
+                           "VALUES (?, ?, 'f', 16, ?)",
+                           [(i + 1, f"s{i}", i % SECTIONS + 1) for i in range(students)])
+    # a tenth of the students miss school often
+    absence = [0.25 if rng.random() < 0.1 else 0.03 for _ in range(students)]
+    start = datetime.date(2025, 9, 11)
+    school_days = [d for d in (start + datetime.timedelta(days=i) for i in range(days * 7 // 5 + 7))
+                   if d.weekday() < 5][:days]
+    rows = []
+    for day in school_days:
+        iso = day.isoformat()
+        for student in range(students):
+            status = "Absent" if rng.random() < absence[student] else "Present"
+            for teacher in range(TEACHERS_PER_DAY):
+                rows.append((student + 1, teacher + 1, iso, status))
+    connection.executemany("INSERT INTO attendance (student_id, teacher_id, date, status) "
+                           "VALUES (?, ?, ?, ?)", rows)
+    session.commit()
+    return len(rows)
+
+
+def timed(label, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    print(f"{label:<28} {(time.perf_counter() - started) * 1000:9.1f} ms")
+    return result
+
+
+def python_absence_rates(student_ids, days, statuses):
+    marks = defaultdict(lambda: [0, 0])
+    for student, day, status in zip(student_ids.tolist(), days.tolist(), statuses.tolist()):
+        cell = marks[student, day]
+        cell[0] += 1
+        cell[1] += status == ABSENT
+    per_student = defaultdict(lambda: [0, 0])
+    for (student, _), (total, absent) in marks.items():
+        per_student[student][0] += 1
+        per_student[student][1] += absent * 2 >= total
+    return {student: absent / marked for student, (marked, absent) in per_student.items()}
+
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    engine = make_engine(":memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    rows = seed(session, students, days, random.Random(11))
+    print(f"{students} students x {days} school days, {rows:,} attendance rows")
+
+    started = time.perf_counter()
+    arrays = timed("cursor load -> arrays", load_attendance, session)
+    sections = timed("student sections", load_sections, session)
+    data = timed("build matrix", AttendanceMatrix.from_arrays, *arrays)
+    timed("chronic absentees", data.chronic_absentees)
+    timed("absence streaks", data.absence_streaks)
+    timed("weekly trend per section", data.weekly_absence, sections)
+    rng = np.random.default_rng(5)
+    subjects = rng.integers(1, 13, size=students * 12)
+    scores = np.clip(rng.normal(68, 14, size=students * 12), 0, 100)
+    timed("score distribution", score_distribution, subjects, scores)
+    print(f"{'total':<28} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+    timed("python loop absence rates", python_absence_rates, *arrays)
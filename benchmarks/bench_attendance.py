@@ -0,0 +1,76 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of Attendance.bulk_mark.
+
+usage :
+    python -m benchmarks.bench_attendance
+"""
+
+import datetime
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from db import rollups
+from db.base import make_engine
+from db.models import Base, GradeSection, Student, Teacher, Attendance
+
+CLASS_SIZE = 1000
+
+
+def setup(class_size=CLASS_SIZE):
+    engine = make_engine(":memory:")
+    Base.metadata.create_all(engine)
+    # the rollup triggers are part of every attendance write
+    rollups.install(engine)
+    session = sessionmaker(bind=engine)()
+
+    section = GradeSection(grade="9", section="A")
+    teacher = Teacher(first_name="bench", father_name="teacher", username="TH00001",
+                      password_hash="x", role="teacher")
+    session.add_all([section, teacher])
+    session.commit()
+    session.execute(insert(Student), [
+        {"first_name": f"s{i}", "father_name": "f", "grandfather_name": "g",
+         "age": 15, "section_id": section.id}
+        for i in range(class_size)
+    ])
+    session.commit()
+    student_ids = [row[0] for row in session.query(Student.id)]
+    return session, teacher.id, student_ids
+
+
+def run(total_marks):
+    session, teacher_id, student_ids = setup(min(total_marks, CLASS_SIZE))
+    days = max(1, total_marks // len(student_ids))
+    start_day = datetime.date(2025, 9, 11)
+
+    started = time.perf_counter()
+    for offset in range(days):
+        marks = {student_id: "Present" for student_id in student_ids}
+        Attendance.bulk_mark(session, teacher_id, start_day + datetime.timedelta(days=offset), marks)
+    elapsed = time.perf_counter() - started
+
+    written = days * len(student_ids)
+    assert session.query(Attendance).count() == written
+    session.close()
+    return written, elapsed
+
+
+if __name__ == "__main__":
+    for total in (1_000, 10_000, 100_000):
+        written, elapsed = run(total)
+        print(f"{written:>7} marks  {elapsed:8.3f}s  {written / elapsed:>10,.0f} rows/sec")
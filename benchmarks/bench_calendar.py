@@ -0,0 +1,62 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Calendar screen build and month navigation time.
+
+Each navigation is followed by a few frames so layout, label texture and
+canvas work is counted, not just widget construction.
+
+usage :
+    python -m benchmarks.bench_calendar [navigations]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from kivy.base import EventLoop
+from kivy.core.text import LabelBase
+from kivy.core.window import Window
+
+from eth_custom_calendar.ethiopia_custom_calender import EthiopianCalendarScreen
+
+FONT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                    "AbyssinicaSIL-2.300", "AbyssinicaSIL-2.300", "AbyssinicaSIL-Regular.ttf")
+
+
+def frame(settle=3):
+    for _ in range(settle):
+        EventLoop.idle()
+
+
+if __name__ == "__main__":
+    navigations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    LabelBase.register(name="AmharicFont", fn_regular=FONT)
+    EventLoop.ensure_window()
+
+    started = time.perf_counter()
+    screen = EthiopianCalendarScreen(name="calendar")
+    Window.add_widget(screen)
+    frame()
+    print(f"build + first frame  {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+    started = time.perf_counter()
+    for i in range(navigations):
+        screen.change_month(1 if (i // 20) % 2 == 0 else -1)
+        frame()
+    elapsed = time.perf_counter() - started
+    print(f"navigate x{navigations}      {elapsed * 1000 / navigations:8.2f} ms per month")
@@ -0,0 +1,89 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory vs streaming mark list import on a synthetic whole-school docx.
+
+usage :
+    python -m benchmarks.bench_docx_import [students]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from docx import Document
+
+from extract_students import MarkListProcessor, iter_rows_from_files
+
+SECTIONS = [(grade, section) for grade in (9, 10, 11, 12) for section in "ABCDEFGHIJ"]
+
+
+def make_document(path, students, sections=SECTIONS):
+    doc = Document()
+    per_section = max(1, students // len(sections))
+    for grade, section in sections:
+        doc.add_paragraph("CHENCHA SECONDARY SCHOOL STUDENTS 2017 E.C YEER")
+        doc.add_paragraph(f"GRADE & SECTION {grade} {section}")
+        table = doc.add_table(rows=per_section + 1, cols=4)
+        for cell, title in zip(table.rows[0].cells, ("No", "Name", "Sex", "Age")):
+            cell.text = title
+        for i, row in enumerate(table.rows[1:], start=1):
+            values = (str(i), f"Student{i} Father{i} Grand{i}", "M" if i % 2 else "F", str(grade + 6))
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+    doc.save(path)
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def in_memory(path):
+    arranged = MarkListProcessor(path).arrange_by_grade_section()
+    return sum(len(rows) for rows in arranged.values())
+
+
+def streaming(path):
+    return sum(1 for _ in MarkListProcessor(path).iter_rows())
+
+
+def report(name, count, elapsed, peak):
+    print(f"{name:<28} {count:>7} rows  {elapsed:7.2f}s  peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "school.docx")
+        make_document(path, students)
+
+        report("arrange_by_grade_section", *measure(lambda: in_memory(path)))
+        report("iter_rows", *measure(lambda: streaming(path)))
+
+        paths = []
+        for n in range(4):
+            copy = os.path.join(tmp, f"campus{n}.docx")
+            make_document(copy, students // 4)
+            paths.append(copy)
+        started = time.perf_counter()
+        count = sum(1 for _ in iter_rows_from_files(paths))
+        print(f"{'iter_rows_from_files (4)':<28} {count:>7} rows  {time.perf_counter() - started:7.2f}s")
@@ -0,0 +1,116 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Report card and attendance sheet generation over a synthetic school.
+
+Seeds students in 40 sections with 10 subjects of three assessments each
+and a month of attendance, ranks the term, then renders every report card
+and every section's attendance sheet, inline and with the process pool.
+Finally one card is re-opened with python-docx to check it is valid.
+
+usage :
+    python -m benchmarks.bench_reports [students] [workers]
+"""
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from docx import Document
+from sqlalchemy.orm import sessionmaker
+
+from db import rollups
+from db.base import make_engine
+from db.models import Base
+from db.ranking import rank_term
+from eth_custom_calendar.calendar_core import calendar
+from reports.generate import attendance_sheet_batches, generate, report_card_batches, template_bytes
+
+SECTIONS = 40
+SUBJECTS = 10
+ASSESSMENTS = (("quiz", 20), ("mid", 30), ("final", 50))
+YEAR, TERM, MONTH = 2018, 1, 2
+
+
+def seed(session, students, rng):
+    connection = session.connection().connection
+    connection.executemany("INSERT INTO grade_section (id, grade, section) VALUES (?, ?, ?)",
+                           [(i + 1, str(9 + i // 10), "ABCDEFGHIJ"[i % 10]) for i in range(SECTIONS)])
+    connection.executemany("INSERT INTO subject (id, name) VALUES (?, ?)",
+                           [(i + 1, f"Subject {i + 1}") for i in range(SUBJECTS)])
+    connection.execute("INSERT INTO teacher (id, first_name, father_name, username, password_hash, role) "
+                       "VALUES (1, 't', 't', 'TH00001', 'x', 'teacher')")
+    connection.executemany("INSERT INTO student (id, first_name, father_name, grandfather_name, age, section_id) "
+                           "VALUES (?, ?, ?, ?, 16, ?)",
+                           [(i + 1, f"Student{i}", f"Father{i % 97}", f"Grandfather{i % 13}", i % SECTIONS + 1)
+                            for i in range(students)])
+    assessments, scores = [], []
+    for section in range(SECTIONS):
+        for subject in range(SUBJECTS):
+            assignment = section * SUBJECTS + subject + 1
+            connection.execute("INSERT INTO teaching_assignment (id, teacher_id, subject_id, grade_section_id) "
+                               "VALUES (?, 1, ?, ?)", (assignment, subject + 1, section + 1))
+            for name, max_score in ASSESSMENTS:
+                assessments.append((len(assessments) + 1, assignment, YEAR, TERM, name, max_score))
+                scores.extend((len(assessments), student + 1, round(rng.uniform(0.3, 1) * max_score))
+                              for student in range(section, students, SECTIONS))
+    connection.executemany("INSERT INTO assessment (id, teaching_assignment_id, year, term, name, max_score) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", assessments)
+    connection.executemany("INSERT INTO score (assessment_id, student_id, score) VALUES (?, ?, ?)", scores)
+    first = calendar.to_gregorian(YEAR, MONTH, 1)
+    days = [(first + datetime.timedelta(days=i)).isoformat() for i in range(30)]
+    connection.executemany("INSERT INTO attendance (student_id, teacher_id, date, status) VALUES (?, 1, ?, ?)",
+                           [(student + 1, day, "Absent" if rng.random() < 0.05 else "Present")
+                            for day in days for student in range(students)])
+    session.commit()
+    return len(scores)
+
+
+def run(label, session, batches, kind, out_dir, workers):
+    result = generate(batches, out_dir, template_bytes(kind), workers=workers)
+    print(f"{label:<28} {result.documents:6d} docs {result.seconds:7.2f} s "
+          f"{result.documents / result.seconds:7.0f} docs/s {result.bytes / 1e6:6.1f} MB")
+    return result
+
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    engine = make_engine(":memory:")
+    Base.metadata.create_all(engine)
+    rollups.install(engine)
+    session = sessionmaker(bind=engine)()
+    scores = seed(session, students, random.Random(7))
+    print(f"{students} students, {scores:,} scores, {workers} workers")
+
+    started = time.perf_counter()
+    rank_term(session, YEAR, TERM)
+    print(f"{'rank term':<28} {time.perf_counter() - started:24.2f} s")
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        run("report cards, inline", session, report_card_batches(session, YEAR, TERM),
+            "cards", os.path.join(out_dir, "inline"), 1)
+        run(f"report cards, {workers} workers", session, report_card_batches(session, YEAR, TERM),
+            "cards", os.path.join(out_dir, "pool"), workers)
+        run("attendance sheets", session, attendance_sheet_batches(session, YEAR, MONTH),
+            "sheets", os.path.join(out_dir, "sheets"), workers)
+
+        card = Document(os.path.join(out_dir, "pool", "9A", "1.docx"))
+        subject_rows = len(card.tables[0].rows) - 1
+        sheet = Document(os.path.join(out_dir, "sheets", "9A", f"attendance-{YEAR}-{MONTH:02d}.docx"))
+        print(f"card check: {subject_rows} subject rows, '{card.paragraphs[1].text}'; "
+              f"sheet check: {len(sheet.tables[0].rows) - 1} students")
@@ -0,0 +1,94 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Name search latency over 100k synthetic persons.
+
+Exits non-zero if a median or p95 goes over TARGETS_MS.
+
+usage :
+    python -m benchmarks.bench_search [persons]
+"""
+
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, insert
+
+from db.base import Session, init_db
+from db.models import GradeSection, Student, Teacher
+from db.search import search_people
+
+SYLLABLES = ["a", "be", "ke", "de", "ma", "ru", "ti", "se", "la", "ha", "mi", "gi", "zu", "ne",
+             "ሰ", "ላ", "ም", "አ", "በ", "ቤ", "ከ", "ደ"]
+# label: (median, p95) in ms
+TARGETS_MS = {"exact": (10, 50), "partial": (10, 50), "misspelled": (10, 50)}
+
+
+def name(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def seed(persons, rng):
+    sections = [GradeSection(grade=str(g), section=s) for g in (9, 10, 11, 12) for s in "ABC"]
+    Session.add_all(sections)
+    Session.commit()
+    teachers = persons // 50
+    Session.execute(insert(Teacher), [
+        {"first_name": name(rng), "father_name": name(rng), "grandfather_name": name(rng),
+         "username": f"TH{i:05d}", "password_hash": "x", "role": "teacher"}
+        for i in range(teachers)
+    ])
+    Session.execute(insert(Student), [
+        {"first_name": name(rng), "father_name": name(rng), "grandfather_name": name(rng),
+         "age": 16, "section_id": rng.choice(sections).id}
+        for _ in range(persons - teachers)
+    ])
+    Session.commit()
+
+
+def misspell(word, rng):
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+if __name__ == "__main__":
+    persons = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(7)
+    init_db(":memory:")
+    started = time.perf_counter()
+    seed(persons, rng)
+    print(f"seeded {persons} persons (index kept by triggers) in {time.perf_counter() - started:.1f}s")
+
+    names = [row[0] for row in Session.query(Student.father_name).order_by(func.random()).limit(200)]
+    failed = []
+    misspelled = [misspell(n, rng) for n in names]
+    for label, queries in (
+        ("exact", names),
+        ("partial", [n[:4] for n in names]),
+        ("misspelled", misspelled),
+    ):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            search_people(Session, query)
+            timings.append((time.perf_counter() - started) * 1000)
+        median, p95 = statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+        print(f"{label:<11} median {median:6.2f} ms   p95 {p95:6.2f} ms")
+        if median > TARGETS_MS[label][0] or p95 > TARGETS_MS[label][1]:
+            failed.append(f"{label} over {TARGETS_MS[label][0]} / {TARGETS_MS[label][1]} ms")
+
+    if failed:
+        sys.exit("\n".join(failed))
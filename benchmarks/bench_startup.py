@@ -0,0 +1,120 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Time to the first frame of the login screen, over fresh interpreters.
+
+Each run starts `python -m benchmarks.bench_startup --child`, which imports
+main, runs SmisApp against a scratch database and exits once login is
+enabled. The parent times from process start to the first frame; the
+child reports where the time went (imports, build, first frame), how long
+starting the services then held the UI thread, when login was enabled, and
+which screens already exist at the first frame. The first run creates the
+database; later runs find it in place, like an ordinary start.
+
+usage :
+    python -m benchmarks.bench_startup [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(database):
+    started = time.perf_counter()
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ["KIVY_NO_ARGS"] = "1"
+    import main
+    from kivy.core.window import Window
+    times = [time.perf_counter()]
+
+    app_build = main.SmisApp.build
+    app_start_services, app_start_thread = main.SmisApp.start_services, main.SmisApp._start_services
+
+    def build(app):
+        root = app_build(app)
+        times.append(time.perf_counter())
+        return root
+
+    def first_frame(*args):
+        Window.unbind(on_flip=first_frame)
+        times.append(time.perf_counter())
+        frame_time.append(time.time())
+        screens.extend(main.App.get_running_app().root.screen_names)
+
+    # same name as the method: Clock looks a bound method up again by name
+    def start_services(app, *args):
+        app_start_services(app, *args)
+        times.append(time.perf_counter())
+
+    def _start_services(app):
+        # the app's own init_db call goes to the scratch database
+        import db.base
+        init_db = db.base.init_db
+        db.base.init_db = lambda: init_db(database)
+        app_start_thread(app)
+
+    def services_ready(app, ready):
+        times.append(time.perf_counter())
+        # after the login screen's own bindings have seen the change
+        main.Clock.schedule_once(lambda dt: app.stop())
+
+    screens, frame_time = [], []
+    main.SmisApp.build = build
+    main.SmisApp.start_services = start_services
+    main.SmisApp._start_services = _start_services
+    Window.bind(on_flip=first_frame)
+    app = main.SmisApp()
+    app.bind(services_ready=services_ready)
+    app.run()
+    imported, built, frame, services, ready = times
+    print(f"{frame_time[0]:.6f} {imported - started:.3f} {built - imported:.3f} {frame - built:.3f} "
+          f"{services - frame:.3f} {ready - frame:.3f} " + ",".join(screens), flush=True)
+
+
+def run(database):
+    started = time.time()
+    process = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", database],
+                             cwd=ROOT, capture_output=True, text=True)
+    if process.returncode != 0 or not process.stdout.strip():
+        sys.exit(f"app did not start:\n{process.stderr}")
+    *seconds, screens = process.stdout.split()[-7:]
+    frame_time, imports, build, frame, services, ready = map(float, seconds)
+    # wall clock, since the interval spans two processes
+    elapsed = frame_time - started
+    return elapsed, imports, build, frame, services, ready, screens.split(",")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+        sys.exit(0)
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "highschool.db")
+        results = []
+        for number in range(runs + 1):
+            elapsed, imports, build, frame, services, ready, screens = run(database)
+            label = "new database" if number == 0 else f"run {number}"
+            print(f"{label:<14} first frame {elapsed:6.2f} s  (imports {imports:5.2f}  build {build:5.2f}  "
+                  f"to frame {frame:5.2f})  then UI thread busy {services:5.2f} s, login enabled after {ready:5.2f} s")
+            if number:
+                results.append(elapsed)
+    print(f"median of {runs}: {statistics.median(results):.2f} s to the login screen; "
+          f"screens built by then: {', '.join(screens)}")
@@ -0,0 +1,105 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrent teacher creation against one SQLite file.
+
+Writer threads, each with its own session, create teachers at the same
+time through Teacher.allocate_codes: half one username per commit, half a
+batch of ten per call. The old "last id + 1" scheme runs the same
+load for comparison. tests/test_usernames.py checks that the usernames
+come out unique and gap-free; this only times the two schemes.
+
+usage :
+    python -m benchmarks.bench_usernames [threads] [teachers per thread]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from db.base import make_engine
+from db.models import Base, Teacher
+
+BATCH = 10
+
+
+def legacy_code(session, role):
+    """The id-based scheme generate_code used before code_sequence."""
+    last = session.query(Teacher).order_by(Teacher.id.desc()).first()
+    next_id = (last.id + 1) if last else 1
+    return f"STF{next_id:03d}" if role == "admin" else f"TH{next_id:05d}"
+
+
+def teacher(thread, number, username):
+    return Teacher(first_name=f"T{thread}", father_name=f"F{number}", username=username,
+                   password_hash="x", role="teacher")
+
+
+def writer(Session, thread, count, scheme, failures):
+    session = Session()
+    try:
+        number = 0
+        while number < count:
+            batch = min(BATCH, count - number) if scheme == "batch" else 1
+            try:
+                if scheme == "legacy":
+                    codes = [legacy_code(session, "teacher")]
+                else:
+                    codes = Teacher.allocate_codes(session, "teacher", batch)
+                session.add_all(teacher(thread, number + i, code) for i, code in enumerate(codes))
+                session.commit()
+            except (IntegrityError, OperationalError):
+                # duplicate username, or still locked after the busy timeout
+                session.rollback()
+                failures.append(thread)
+            number += batch
+    finally:
+        session.close()
+
+
+def run(scheme_of, threads, count):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(os.path.join(directory, "school.db"))
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        failures = []
+        workers = [threading.Thread(target=writer, args=(Session, t, count, scheme_of(t), failures))
+                   for t in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        with Session() as session:
+            usernames = [username for (username,) in session.query(Teacher.username)]
+        engine.dispose()
+    return usernames, len(failures), elapsed
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{threads} writer threads x {count} teachers on one SQLite file")
+
+    usernames, failed, elapsed = run(lambda t: "legacy", threads, count)
+    print(f"{'last id + 1':<24} {len(usernames):6d} created {failed:5d} failed commits {elapsed:6.2f} s")
+
+    usernames, failed, elapsed = run(lambda t: "batch" if t % 2 else "single", threads, count)
+    print(f"{'code_sequence':<24} {len(usernames):6d} created {failed:5d} failed commits {elapsed:6.2f} s")
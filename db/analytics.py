@@ -0,0 +1,185 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""School-wide attendance and mark analytics on NumPy arrays.
+
+Attendance comes out of SQLite as three integer columns (student id, date
+ordinal, status code) through a plain DB-API cursor, never as ORM objects,
+and NumPy reads the rows straight off the cursor into one array.
+AttendanceMatrix folds the columns into a students x school-days grid once,
+and every metric is a handful of array operations over that grid.
+
+A student counts as absent for a day when at least ABSENT_DAY_SHARE of
+that day's marks (one per teacher) are Absent. School days are the days
+on which anybody was marked.
+
+usage :
+    data = AttendanceMatrix.from_arrays(*load_attendance(session, start, end))
+    ids, rates = data.chronic_absentees()
+    longest, current = data.absence_streaks()
+    weekly = data.weekly_absence(load_sections(session))   # one row per section
+"""
+
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+from .models import AttendanceStatusEnum
+
+# status -> small integer code, as returned by load_attendance
+STATUS_CODES = {status.value: code for code, status in enumerate(AttendanceStatusEnum)}
+ABSENT = STATUS_CODES[AttendanceStatusEnum.ABSENT.value]
+
+ABSENT_DAY_SHARE = 0.5
+# missing a tenth of school days is the usual definition of chronic absence
+CHRONIC_ABSENCE_RATE = 0.1
+
+_ATTENDANCE_SQL = (
+    "SELECT student_id, CAST(julianday(date) - 1721424.5 AS INTEGER), CASE status "
+    + " ".join(f"WHEN '{status}' THEN {code}" for status, code in STATUS_CODES.items())
+    + f" ELSE {len(STATUS_CODES)} END FROM attendance {{where}}"
+)
+
+Weekly = namedtuple("Weekly", "groups weeks rates")
+Distribution = namedtuple("Distribution", "groups counts histogram mean quartiles")
+
+
+def load_attendance(session, start=None, end=None):
+    """(student_id, day ordinal, status code) int arrays for attendance between two dates."""
+    where, params = "", []
+    if start is not None and end is not None:
+        where, params = "WHERE date BETWEEN ? AND ?", [start.isoformat(), end.isoformat()]
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute(_ATTENDANCE_SQL.format(where=where), params)
+        rows = np.fromiter(chain.from_iterable(cursor), dtype=np.int64).reshape(-1, 3)
+    finally:
+        cursor.close()
+    return rows[:, 0], rows[:, 1], rows[:, 2].astype(np.int8)
+
+
+def load_sections(session):
+    """{student_id: section_id} for grouping metrics by section."""
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute("SELECT id, section_id FROM student")
+        return dict(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+class AttendanceMatrix:
+    """Per student x school day marked / absent grids built from load_attendance arrays."""
+
+    def __init__(self, students, days, marked, absent):
+        self.students = students    # sorted student ids, one per row
+        self.days = days            # sorted day ordinals, one per column
+        self.marked = marked        # bool, the student has any mark that day
+        self.absent = absent        # bool, absent by ABSENT_DAY_SHARE
+
+    @classmethod
+    def from_arrays(cls, student_ids, day_ordinals, statuses):
+        students, rows = np.unique(student_ids, return_inverse=True)
+        days, columns = np.unique(day_ordinals, return_inverse=True)
+        cells = rows * len(days) + columns
+        shape = (len(students), len(days))
+        total = np.bincount(cells, minlength=shape[0] * shape[1]).reshape(shape)
+        absent = np.bincount(cells, weights=statuses == ABSENT,
+                             minlength=shape[0] * shape[1]).reshape(shape)
+        marked = total > 0
+        return cls(students, days, marked, marked & (absent >= ABSENT_DAY_SHARE * total))
+
+    def absence_rates(self):
+        """Absent days / marked days per student (NaN for students never marked)."""
+        marked_days = self.marked.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.absent.sum(axis=1) / marked_days
+
+    def chronic_absentees(self, threshold=CHRONIC_ABSENCE_RATE):
+        """(student ids, absence rates) at or above threshold, worst first."""
+        rates = self.absence_rates()
+        hits = np.flatnonzero(rates >= threshold)
+        order = hits[np.argsort(-rates[hits], kind="stable")]
+        return self.students[order], rates[order]
+
+    def absence_streaks(self):
+        """(longest, current) runs of consecutive absent school days per student.
+
+        An unmarked day ends a run, since the student can't be called absent on it.
+        """
+        running = np.cumsum(self.absent, axis=1, dtype=np.int32)
+        # running total at the last non-absent day, carried forward
+        base = np.maximum.accumulate(np.where(self.absent, 0, running), axis=1)
+        streak = running - base
+        if streak.shape[1] == 0:
+            empty = np.zeros(len(self.students), dtype=np.int32)
+            return empty, empty
+        return streak.max(axis=1), streak[:, -1]
+
+    def weekly_absence(self, groups=None):
+        """Weekly absence rates, one row per group and one column per week.
+
+        ``groups`` maps student id -> group (e.g. section id); without it there
+        is a single whole-school row (group 0) and students missing from it
+        fall in group -1. Weeks start on Sunday, like the calendar.
+        Week-over-week change is np.diff(weekly.rates, axis=1).
+        """
+        week_of_day = self.days - self.days % 7
+        weeks, week_columns = np.unique(week_of_day, return_inverse=True)
+        if groups is None:
+            group_keys = np.zeros(1, dtype=np.int64)
+            row_groups = np.zeros(len(self.students), dtype=np.int64)
+        else:
+            keys = np.array([groups.get(int(s), -1) for s in self.students], dtype=np.int64)
+            group_keys, row_groups = np.unique(keys, return_inverse=True)
+
+        cells = (row_groups[:, None] * len(weeks) + week_columns[None, :]).ravel()
+        size = len(group_keys) * len(weeks)
+        marked = np.bincount(cells, weights=self.marked.ravel(), minlength=size)
+        absent = np.bincount(cells, weights=self.absent.ravel(), minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = (absent / marked).reshape(len(group_keys), len(weeks))
+        return Weekly(group_keys, weeks, rates)
+
+
+def score_distribution(groups, scores, bins=(0, 50, 60, 70, 80, 90, 101)):
+    """Per-group mark histogram, mean and quartiles without a Python loop over rows.
+
+    ``groups`` (e.g. subject ids) and ``scores`` are equal-length arrays. The
+    histogram counts scores in [bins[i], bins[i + 1]).
+    """
+    groups = np.asarray(groups)
+    scores = np.asarray(scores, dtype=np.float64)
+    keys, index = np.unique(groups, return_inverse=True)
+    counts = np.bincount(index, minlength=len(keys))
+
+    bins = np.asarray(bins, dtype=np.float64)
+    slot = np.clip(np.searchsorted(bins, scores, side="right") - 1, 0, len(bins) - 2)
+    histogram = np.bincount(index * (len(bins) - 1) + slot,
+                            minlength=len(keys) * (len(bins) - 1)).reshape(len(keys), -1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(index, weights=scores, minlength=len(keys)) / counts
+
+    # sort by (group, score); each group's scores are then one contiguous block
+    ordered = scores[np.lexsort((scores, index))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    quartiles = np.empty((len(keys), 3))
+    for column, q in enumerate((0.25, 0.5, 0.75)):
+        position = starts + q * np.maximum(counts - 1, 0)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + np.maximum(counts - 1, 0))
+        fraction = position - low
+        quartiles[:, column] = ordered[low] * (1 - fraction) + ordered[high] * fraction
+    return Distribution(keys, counts, histogram, mean, quartiles)
@@ -0,0 +1,92 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Teaching assignments as one matrix: loaded with one query, saved by set difference.
+
+A timetable change rewrites the desired teacher x subject x section matrix;
+sync_assignments diffs it against the current rows in memory and writes
+only the difference, one INSERT executemany and one DELETE, in a single
+transaction.
+
+usage :
+    matrix = load_matrix(session)            # {Assignment: row id}
+    desired = set(matrix) - {Assignment(3, 1, 7)} | {Assignment(5, 1, 7)}
+    report = sync_assignments(session, desired)
+    report = sync_assignments(session, desired, sections={7})   # only section 7 changes
+"""
+
+from collections import namedtuple
+
+from sqlalchemy import delete, insert, select
+
+from .models import Assessment, TeachingAssignment
+from .month_status import month_status_cache
+from .teacher_context import current_teacher
+
+Assignment = namedtuple("Assignment", "teacher_id subject_id section_id")
+
+
+def load_matrix(session, sections=None):
+    """{Assignment: id} for every teaching assignment, or those of ``sections``, in one query."""
+    query = select(TeachingAssignment.teacher_id, TeachingAssignment.subject_id,
+                   TeachingAssignment.grade_section_id, TeachingAssignment.id)
+    if sections is not None:
+        query = query.where(TeachingAssignment.grade_section_id.in_(list(sections)))
+    return {Assignment(*row[:3]): row[3] for row in session.execute(query)}
+
+
+def sync_assignments(session, desired, sections=None):
+    """Make the teaching assignments (of ``sections``, default all) exactly ``desired``.
+
+    Assignments with assessments are not deleted, since that would orphan
+    recorded scores; they are listed under "kept" instead. Returns
+    {"inserted": n, "deleted": n, "unchanged": n, "kept": [Assignment, ...]}.
+    Raises ValueError for a desired assignment outside ``sections``.
+    """
+    desired = {Assignment(*assignment) for assignment in desired}
+    if sections is not None:
+        sections = set(sections)
+        outside = [a for a in desired if a.section_id not in sections]
+        if outside:
+            raise ValueError(f"{len(outside)} assignments are outside the sections being synced")
+
+    current = load_matrix(session, sections)
+    added = desired - current.keys()
+    removed = {current[a]: a for a in current.keys() - desired}
+    graded = set(session.scalars(
+        select(Assessment.teaching_assignment_id)
+        .where(Assessment.teaching_assignment_id.in_(list(removed)))
+        .distinct()
+    )) if removed else set()
+    kept = [removed.pop(assignment_id) for assignment_id in graded]
+
+    try:
+        if removed:
+            session.execute(delete(TeachingAssignment).where(TeachingAssignment.id.in_(list(removed))))
+        if added:
+            session.execute(insert(TeachingAssignment), [
+                {"teacher_id": a.teacher_id, "subject_id": a.subject_id, "grade_section_id": a.section_id}
+                for a in added
+            ])
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    # the calendar counts a teacher's assigned sections
+    changed = {a.teacher_id for a in added | set(removed.values())}
+    for teacher_id in changed:
+        month_status_cache.forget(teacher_id)
+    current_teacher.invalidate(*changed)
+    return {"inserted": len(added), "deleted": len(removed),
+            "unchanged": len(desired & current.keys()), "kept": kept}
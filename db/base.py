@@ -12,10 +12,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-form .models import *
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-DATABASE_URL = "sqlite:///smis_database.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from . import rollups, search
+from .models import Base
+
+DATABASE_PATH = "highschool.db"
+
+# Applied to every new SQLite connection by the connect hook in make_engine.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",          # readers don't block the writer
+    "synchronous": "NORMAL",        # safe with WAL, far fewer fsyncs
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,           # negative means KiB, i.e. ~64MB
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+# Thread-local sessions; bound to an engine by init_db().
+Session = scoped_session(sessionmaker(autoflush=False))
+
+_engine = None
+
+
+def make_engine(path=DATABASE_PATH, echo=False, pragmas=None):
+    """Create a tuned SQLite engine for a file path or ":memory:".
+
+    ``pragmas`` overrides or extends SQLITE_PRAGMAS.
+    """
+    settings = dict(SQLITE_PRAGMAS, **(pragmas or {}))
+    if path in (None, "", ":memory:"):
+        # A single shared connection, otherwise every checkout gets an empty database.
+        engine = create_engine("sqlite://", echo=echo, poolclass=StaticPool,
+                               connect_args={"check_same_thread": False})
+        settings.pop("journal_mode", None)
+        settings.pop("mmap_size", None)
+    else:
+        engine = create_engine(f"sqlite:///{path}", echo=echo)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def init_db(path=DATABASE_PATH, echo=False, pragmas=None):
+    """Create the schema on ``path`` and bind Session to it."""
+    global _engine
+    engine = make_engine(path, echo=echo, pragmas=pragmas)
+    Base.metadata.create_all(engine)
+    search.install(engine)
+    rollups.install(engine)
+    Session.remove()
+    Session.configure(bind=engine)
+    _engine = engine
+    return engine
+
+
+def get_engine():
+    if _engine is None:
+        raise RuntimeError("database not initialised, call db.base.init_db() first")
+    return _engine
@@ -0,0 +1,105 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Paged teacher / student directory queries.
+
+Pages are ordered by (father_name, first_name, id), ignoring case, and
+fetched with keyset (seek) pagination: the next page starts after the last
+row's key instead of using OFFSET, so page 500 costs the same as page 1.
+The prefix filter matches the start of the father name, the leading column
+of the NOCASE name index, so it is a range over that index rather than a
+table scan; first names and misspellings are for db.search.search_people.
+Rows are plain named tuples, not ORM entities.
+
+usage :
+    rows, cursor = teacher_page(session, prefix="ab")
+    more, cursor = teacher_page(session, prefix="ab", after=cursor)   # cursor is None on the last page
+"""
+
+import string
+
+from sqlalchemy import select, tuple_
+
+from .models import GradeSection, Student, Teacher
+
+PAGE_SIZE = 50
+# SQLite's NOCASE folds ASCII letters only
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _like_prefix(prefix):
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def page_key(model):
+    """The directory order; ix_teacher_name / ix_student_name index exactly this."""
+    return model.father_name.collate("NOCASE"), model.first_name.collate("NOCASE"), model.id
+
+
+def sort_key(father_name, first_name, id):
+    """page_key in Python, for placing one row among those already loaded."""
+    return (father_name or "").translate(_ASCII_LOWER), (first_name or "").translate(_ASCII_LOWER), id
+
+
+def matches_prefix(father_name, prefix):
+    """The page functions' prefix filter in Python."""
+    prefix = (prefix or "").strip().translate(_ASCII_LOWER)
+    return (father_name or "").translate(_ASCII_LOWER).startswith(prefix)
+
+
+def _page(session, stmt, model, after, limit, prefix):
+    key = page_key(model)
+    if prefix:
+        # LIKE ignores ASCII case like the NOCASE index, so SQLite turns it into a range
+        stmt = stmt.where(model.father_name.like(_like_prefix(prefix.strip()), escape="\\"))
+    if after is not None:
+        # the row-value test alone is not a range SQLite can seek on; the
+        # redundant father_name bound is, over the same index
+        stmt = stmt.where(key[0] >= after[0], tuple_(*key) > tuple_(*after))
+    stmt = stmt.order_by(*key).limit(limit)
+
+    rows = session.execute(stmt).all()
+    cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        cursor = (last.father_name, last.first_name, last.id)
+    return rows, cursor
+
+
+def teacher_page(session, after=None, limit=PAGE_SIZE, prefix=None, role=None):
+    """One page of (id, first_name, father_name, grandfather_name, username, role) rows."""
+    stmt = select(Teacher.id, Teacher.first_name, Teacher.father_name,
+                  Teacher.grandfather_name, Teacher.username, Teacher.role)
+    if role:
+        stmt = stmt.where(Teacher.role == role)
+    return _page(session, stmt, Teacher, after, limit, prefix)
+
+
+def student_page(session, after=None, limit=PAGE_SIZE, prefix=None, section_id=None):
+    """One page of (id, first_name, father_name, grandfather_name, sex, section_id, grade, section) rows."""
+    stmt = (
+        select(Student.id, Student.first_name, Student.father_name, Student.grandfather_name,
+               Student.sex, Student.section_id, GradeSection.grade, GradeSection.section)
+        .join(GradeSection, Student.section_id == GradeSection.id)
+    )
+    if section_id is not None:
+        stmt = stmt.where(Student.section_id == section_id)
+    return _page(session, stmt, Student, after, limit, prefix)
+
+
+def display_name(row):
+    """Same formatting as Person.full_name, for directory rows."""
+    names = [row.first_name, row.father_name, row.grandfather_name]
+    return " ".join(n.title() for n in names if n)
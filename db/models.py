@@ -13,16 +13,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from sqlalchemy import (
-    Column, Integer, String, Date, ForeignKey, CheckConstraint,
-    UniqueConstraint, create_engine
+    Column, Integer, Float, String, Date, ForeignKey, CheckConstraint,
+    UniqueConstraint, Index, cast, func, select, text
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from enum import Enum
-from passlib.hash import pbkdf2_sha256
+from auth import policy
+from .month_status import month_status_cache
 import datetime
 
 Base = declarative_base()
 
+
 # ======== ENUMS ========
 class SexEnum(str, Enum):
     MALE = "Male"
@@ -94,9 +97,17 @@ class Student(Person):
     section = relationship("GradeSection", back_populates="students")
 
     attendances = relationship("Attendance", back_populates="student")
+    scores = relationship("Score", back_populates="student")
 
     __table_args__ = (
         UniqueConstraint('first_name', 'father_name', 'grandfather_name', 'section_id', name='uix_student_fullname_section'),
+        # section roster ordered by father name, first name
+        Index('ix_student_section_name', 'section_id', 'father_name', 'first_name', 'grandfather_name'),
+        # whole-school directory pages and their name prefix filter, see db/directory.py
+        Index('ix_student_name', text('father_name COLLATE NOCASE'), text('first_name COLLATE NOCASE'), 'id'),
+        # first name prefixes and near misses in db/search.py
+        Index('ix_student_first_name', text('first_name COLLATE NOCASE')),
+        Index('ix_student_grandfather_name', text('grandfather_name COLLATE NOCASE')),
     )
     
     
@@ -107,6 +118,14 @@ class Student(Person):
         return f"<Student(full_name={self.full_name}, section={self.section})>"
 
 # ======== TEACHER ========
+class CodeSequence(Base):
+    """Last number handed out per username prefix; see Teacher.allocate_codes."""
+    __tablename__ = "code_sequence"
+
+    prefix = Column(String, primary_key=True)
+    last_value = Column(Integer, nullable=False)
+
+
 class Teacher(Person):
     __tablename__ = "teacher"
 
@@ -119,49 +138,104 @@ class Teacher(Person):
 
     __table_args__ = (
         UniqueConstraint('first_name', 'father_name', 'grandfather_name', name='uix_teacher'),
-        CheckConstraint("role IN ('admin','teacher')", name='check_role')
+        CheckConstraint("role IN ('admin','teacher')", name='check_role'),
+        # directory pages and their name prefix filter, see db/directory.py
+        Index('ix_teacher_name', text('father_name COLLATE NOCASE'), text('first_name COLLATE NOCASE'), 'id'),
+        Index('ix_teacher_first_name', text('first_name COLLATE NOCASE')),
+        Index('ix_teacher_grandfather_name', text('grandfather_name COLLATE NOCASE')),
     )
 
     # ---- Password methods ----
 
     def set_password(self, password):
-        self.password_hash = pbkdf2_sha256.hash(password)
+        self.password_hash = policy.hash_password(password)
+        policy.verification_cache.forget(self.username)
 
 
     def verify_password(self, password):
-        return pbkdf2_sha256.verify(password, self.password_hash)
+        """Check password, swapping in a stronger hash if the policy asks for one.
+
+        The caller commits; Teacher.authenticate does it for logins.
+        """
+        ok, new_hash = policy.verify_and_update(password, self.password_hash, username=self.username)
+        if ok and new_hash is not None:
+            self.password_hash = new_hash
+        return ok
 
     # ---- Generate system username/code ----
-    
+
+    # role -> (username prefix, digits); any other role gets DEFAULT_CODE_FORMAT
+    CODE_FORMATS = {"admin": ("STF", 3)}
+    DEFAULT_CODE_FORMAT = ("TH", 5)
+
+    @classmethod
+    def allocate_codes(cls, session, role, count=1):
+        """Reserve ``count`` consecutive usernames for role in one statement.
+
+        The prefix's counter in code_sequence is bumped with
+        ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``, which takes SQLite's
+        write lock, so concurrent writers always get disjoint ranges. The first
+        allocation for a prefix starts after the highest existing username.
+        The reservation is part of the caller's transaction: rolling back
+        returns the codes, and other writers wait until the caller commits,
+        so commit soon after.
+        """
+        prefix, digits = cls.CODE_FORMATS.get(role, cls.DEFAULT_CODE_FORMAT)
+        # usernames are zero-padded, so the highest one sorts last; a range
+        # instead of LIKE keeps this an index lookup on the username
+        highest = (
+            select(func.coalesce(cast(func.substr(func.max(cls.username), len(prefix) + 1), Integer), 0))
+            .where(cls.username >= prefix, cls.username < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+            .scalar_subquery()
+        )
+        stmt = sqlite_insert(CodeSequence).values(prefix=prefix, last_value=highest + count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["prefix"],
+            set_={"last_value": CodeSequence.last_value + count},
+        ).returning(CodeSequence.last_value)
+        last = session.execute(stmt).scalar_one()
+        return [f"{prefix}{number:0{digits}d}" for number in range(last - count + 1, last + 1)]
+
     @classmethod
     def generate_code(cls, session, role):
-        last = session.query(cls).order_by(cls.id.desc()).first()
-        next_id = (last.id + 1) if last else 1
-        return f"STF{next_id:03d}" if role == "admin" else f"TH{next_id:05d}"
+        return cls.allocate_codes(session, role)[0]
 
     # ---- Create teacher ----
-        print(f"Dear {teacher.full_name}, your username is {username}.please change your password upon first login.")
-        return teacher
+
     @classmethod
     def authenticate(cls, session, username, password):
         teacher = session.query(cls).filter_by(username=username).first()
-        if teacher and teacher.verify_password(password):
+        if teacher is None:
+            # same KDF cost as a real check so unknown usernames aren't detectable by timing
+            policy.dummy_verify(password)
+            return None
+        old_hash = teacher.password_hash
+        if teacher.verify_password(password):
+            if teacher.password_hash != old_hash:
+                # upgraded to the current hash policy; reload so the caller can
+                # still read the teacher after the session is removed
+                session.commit()
+                session.refresh(teacher)
             return teacher
         return None
     
     
     @classmethod
     def create_teacher(cls, session, **kwargs):
-        user_name = cls.generate_code(session, kwargs.get('role'))
         teacher = cls(first_name=kwargs.get('first_name'),
                     father_name=kwargs.get('father_name'),
                     grandfather_name=kwargs.get('grandfather_name'),
                     sex=kwargs.get('sex'),
-                    username=user_name,
                     role=kwargs.get('role'))
+        # hash before reserving the username: the reservation holds the write lock
         teacher.set_password(kwargs.get('password'))
+        teacher.username = cls.generate_code(session, kwargs.get('role'))
         session.add(teacher)
-        session.commit()
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
         
         return teacher
     
@@ -191,9 +265,12 @@ class TeachingAssignment(Base):
     teacher = relationship("Teacher", back_populates="assignments")
     subject = relationship("Subject", back_populates="assignments")
     grade_section = relationship("GradeSection", back_populates="assignments")
+    assessments = relationship("Assessment", back_populates="teaching_assignment")
 
     __table_args__ = (
+        # uix_teacher_subject_section already serves lookups by teacher_id
         UniqueConstraint('teacher_id', 'subject_id', 'grade_section_id', name='uix_teacher_subject_section'),
+        Index('ix_teaching_assignment_section', 'grade_section_id', 'teacher_id', 'subject_id'),
     )
 
 # ======== ATTENDANCE ========
@@ -211,11 +288,199 @@ class Attendance(Base):
 
     __table_args__ = (
         UniqueConstraint('student_id', 'teacher_id', 'date', name='uix_attendance'),
+        # daily / date-range reports
+        Index('ix_attendance_date_student_status', 'date', 'student_id', 'status'),
+        # one student's history over a date range
+        Index('ix_attendance_student_date_status', 'student_id', 'date', 'status'),
+        # what a teacher marked on a day (Attendance.bulk_mark)
+        Index('ix_attendance_teacher_date', 'teacher_id', 'date', 'student_id', 'status'),
+    )
+
+    # ---- Bulk marking ----
+
+    @classmethod
+    def bulk_mark(cls, session, teacher_id, date, marks):
+        """Record a whole class for one day in a single transaction.
+
+        ``marks`` maps student_id -> status. Rows are upserted against
+        ``uix_attendance`` with one ``INSERT ... ON CONFLICT DO UPDATE``
+        executemany. Returns a dict student_id -> outcome, where outcome is
+        "inserted", "updated", "unchanged" or "invalid" (unknown status, not written).
+        """
+        valid_statuses = {status.value for status in AttendanceStatusEnum}
+        existing = dict(
+            session.query(cls.student_id, cls.status)
+            .filter(cls.teacher_id == teacher_id, cls.date == date)
+        )
+
+        outcomes = {}
+        rows = []
+        for student_id, status in marks.items():
+            status = getattr(status, "value", status)
+            if status not in valid_statuses:
+                outcomes[student_id] = "invalid"
+                continue
+            previous = existing.get(student_id)
+            if previous == status:
+                outcomes[student_id] = "unchanged"
+                continue
+            outcomes[student_id] = "inserted" if previous is None else "updated"
+            rows.append({"student_id": student_id, "teacher_id": teacher_id,
+                         "date": date, "status": status})
+
+        if rows:
+            stmt = sqlite_insert(cls.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["student_id", "teacher_id", "date"],
+                set_={"status": stmt.excluded.status},
+            )
+            try:
+                session.execute(stmt, rows)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            # the calendar overlay for this teacher's month is now stale
+            month_status_cache.forget(teacher_id, date)
+        return outcomes
+
+
+# ======== ASSESSMENT / SCORE ========
+class Assessment(Base):
+    """One graded piece of work (quiz, mid exam, ...) of a teaching assignment.
+
+    ``max_score`` is its weight: a subject's assessments in a term add up to 100.
+    """
+    __tablename__ = "assessment"
+
+    id = Column(Integer, primary_key=True)
+    teaching_assignment_id = Column(Integer, ForeignKey("teaching_assignment.id"), nullable=False)
+    year = Column(Integer, nullable=False)  # Ethiopian calendar year
+    term = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    max_score = Column(Float, nullable=False)
+
+    teaching_assignment = relationship("TeachingAssignment", back_populates="assessments")
+    scores = relationship("Score", back_populates="assessment")
+
+    __table_args__ = (
+        UniqueConstraint('teaching_assignment_id', 'year', 'term', 'name', name='uix_assessment'),
+        CheckConstraint('term IN (1, 2)', name='check_term'),
+        CheckConstraint('max_score > 0', name='check_max_score'),
+        # every assessment of a term (db/ranking.py)
+        Index('ix_assessment_term', 'year', 'term', 'teaching_assignment_id'),
+    )
+
+    def __str__(self):
+        return f"{self.name} ({self.max_score:g})"
+
+
+class Score(Base):
+    __tablename__ = "score"
+
+    id = Column(Integer, primary_key=True)
+    assessment_id = Column(Integer, ForeignKey("assessment.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("student.id"), nullable=False)
+    score = Column(Float, nullable=False)
+
+    assessment = relationship("Assessment", back_populates="scores")
+    student = relationship("Student", back_populates="scores")
+
+    __table_args__ = (
+        UniqueConstraint('assessment_id', 'student_id', name='uix_score'),
+        CheckConstraint('score >= 0', name='check_score'),
+    )
+
+    # ---- Batch entry ----
+
+    @classmethod
+    def bulk_record(cls, session, assessment_id, scores):
+        """Record a whole section's scores for one assessment in one statement.
+
+        ``scores`` maps student_id -> score. Rows are upserted against
+        ``uix_score`` with one ``INSERT ... ON CONFLICT DO UPDATE`` executemany.
+        Returns a dict student_id -> outcome, where outcome is "inserted",
+        "updated", "unchanged" or "invalid" (not a number in 0..max_score, or
+        not a student of the assessment's section; not written).
+        """
+        assessment = session.get(Assessment, assessment_id)
+        if assessment is None:
+            raise ValueError(f"no assessment with id {assessment_id}")
+        section_id = assessment.teaching_assignment.grade_section_id
+        in_section = {student_id for (student_id,) in
+                      session.query(Student.id).filter(Student.section_id == section_id)}
+        existing = dict(
+            session.query(cls.student_id, cls.score).filter(cls.assessment_id == assessment_id)
+        )
+
+        outcomes = {}
+        rows = []
+        for student_id, score in scores.items():
+            try:
+                score = float(score)
+            except (TypeError, ValueError):
+                score = None
+            if student_id not in in_section or score is None or not 0 <= score <= assessment.max_score:
+                outcomes[student_id] = "invalid"
+                continue
+            previous = existing.get(student_id)
+            if previous == score:
+                outcomes[student_id] = "unchanged"
+                continue
+            outcomes[student_id] = "inserted" if previous is None else "updated"
+            rows.append({"assessment_id": assessment_id, "student_id": student_id, "score": score})
+
+        if rows:
+            stmt = sqlite_insert(cls.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["assessment_id", "student_id"],
+                set_={"score": stmt.excluded.score},
+            )
+            try:
+                session.execute(stmt, rows)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        return outcomes
+
+
+# ======== MATERIALIZED RESULTS (db/ranking.py) ========
+class SubjectResult(Base):
+    """A student's total in one subject for a term."""
+    __tablename__ = "subject_result"
+
+    student_id = Column(Integer, ForeignKey("student.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    term = Column(Integer, primary_key=True)
+    subject_id = Column(Integer, ForeignKey("subject.id"), primary_key=True)
+    total = Column(Float, nullable=False)
+    out_of = Column(Float, nullable=False)
+    section_rank = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # clearing a term before it is ranked again
+        Index('ix_subject_result_term', 'year', 'term'),
     )
 
-# ======== DATABASE SETUP ========
-engine = create_engine("sqlite:///highschool.db", echo=True, future=True)
-Base.metadata.create_all(engine)
 
-Session = sessionmaker(bind=engine)
-session = Session()
+class TermResult(Base):
+    """A student's overall result and ranks for a term."""
+    __tablename__ = "term_result"
+
+    student_id = Column(Integer, ForeignKey("student.id"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    term = Column(Integer, primary_key=True)
+    section_id = Column(Integer, ForeignKey("grade_section.id"), nullable=False)
+    grade = Column(String, nullable=False)
+    subjects = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    average = Column(Float, nullable=False)
+    section_rank = Column(Integer, nullable=False)
+    grade_rank = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # a section's or a grade's report cards in rank order
+        Index('ix_term_result_section', 'year', 'term', 'section_id', 'section_rank'),
+        Index('ix_term_result_grade', 'year', 'term', 'grade', 'grade_rank'),
+    )
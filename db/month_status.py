@@ -0,0 +1,118 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-day attendance completion for one teacher and one Ethiopian month.
+
+A day is complete when every section the teacher is assigned to has
+attendance recorded by that teacher. The whole month comes from a single
+GROUP BY over attendance joined to teaching_assignment and is cached per
+(teacher, year, month); Attendance.bulk_mark forgets the affected month.
+
+usage :
+    status = month_status(session, teacher_id, 2018, 2)
+    status.assigned          # sections the teacher is assigned to
+    status.recorded.get(7)   # sections with attendance on the 7th, None if none
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date
+
+from sqlalchemy import text
+
+from eth_custom_calendar.calendar_core import calendar
+
+# the trailing NULL-date row carries the number of assigned sections, so a
+# month with no attendance at all still comes back in the same statement
+MONTH_STATUS_SQL = (
+    "SELECT a.date AS date, COUNT(DISTINCT s.section_id) AS sections "
+    "FROM attendance AS a "
+    "JOIN student AS s ON s.id = a.student_id "
+    "JOIN teaching_assignment AS ta "
+    "ON ta.teacher_id = a.teacher_id AND ta.grade_section_id = s.section_id "
+    "WHERE a.teacher_id = :teacher_id AND a.date BETWEEN :start AND :end "
+    "GROUP BY a.date "
+    "UNION ALL "
+    "SELECT NULL, COUNT(DISTINCT grade_section_id) FROM teaching_assignment "
+    "WHERE teacher_id = :teacher_id"
+)
+
+MonthStatus = namedtuple("MonthStatus", "assigned recorded")
+
+
+class MonthStatusCache:
+    """Bounded LRU of MonthStatus keyed by (teacher_id, year, month)."""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        # key -> (first ordinal, last ordinal, MonthStatus)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, first, last, status):
+        with self._lock:
+            self._entries[key] = (first, last, status)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, teacher_id, day=None):
+        """Drop the teacher's month holding ``day`` (a date), or all of them."""
+        ordinal = day.toordinal() if day is not None else None
+        with self._lock:
+            for key in [k for k, (first, last, _) in self._entries.items()
+                        if k[0] == teacher_id
+                        and (ordinal is None or first <= ordinal <= last)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+month_status_cache = MonthStatusCache()
+
+
+def month_status(session, teacher_id, year, month, cache=month_status_cache):
+    key = (teacher_id, year, month)
+    status = cache.get(key)
+    if status is not None:
+        return status
+
+    first = calendar.month_start_ordinal(year, month)
+    last = first + calendar.month_length(year, month) - 1
+    rows = session.execute(text(MONTH_STATUS_SQL), {
+        "teacher_id": teacher_id,
+        "start": date.fromordinal(first).isoformat(),
+        "end": date.fromordinal(last).isoformat(),
+    })
+    assigned = 0
+    recorded = {}
+    for day, sections in rows:
+        if day is None:
+            assigned = sections
+        else:
+            recorded[date.fromisoformat(day).toordinal() - first + 1] = sections
+
+    status = MonthStatus(assigned, recorded)
+    cache.put(key, first, last, status)
+    return status
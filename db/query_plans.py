@@ -0,0 +1,169 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""EXPLAIN QUERY PLAN guard for the hot code paths, against a real database file.
+
+HOT_PATHS calls the functions the screens use and records the SQL they
+send, so the plans checked are those of the statements the code builds;
+tests/test_query_plans.py runs them on the test schema. A database file is
+opened read-only: tables, indexes and triggers it lacks are reported, not
+created (db.base.init_db and migrations/ add them).
+
+usage :
+    python -m db.query_plans [database path]
+
+exits non-zero if an object is missing or a hot path falls back to a full
+table SCAN or a temp b-tree sort.
+"""
+
+import datetime
+import os
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from . import directory, ranking, rollups, search
+from .base import DATABASE_PATH, make_engine
+from .models import Base
+from .month_status import MonthStatusCache, month_status
+from .roster import RosterCache, roster_for_day, teacher_sections
+
+BAD_PLAN_STEPS = ("SCAN ", "USE TEMP B-TREE")
+# de-duplicating within one group is not a sort of the whole result
+ALLOWED_PLAN_STEPS = ("USE TEMP B-TREE FOR count(DISTINCT)",)
+# FTS5 looks its MATCH up in its own index, which the plan shows as a SCAN
+FTS_PLAN_STEPS = ("SCAN student_fts VIRTUAL TABLE", "SCAN teacher_fts VIRTUAL TABLE")
+
+DAY = datetime.date(2025, 9, 11)
+AFTER = ("Abebe", "Kebede", 1)
+
+# name -> (call on a session, plan steps allowed for it); the statements it runs are checked
+HOT_PATHS = {
+    "section roster with day marks": (
+        lambda session: roster_for_day(session, 1, 1, DAY, cache=RosterCache()), ()),
+    # de-duplicating and sorting one teacher's assignments
+    "teacher sections": (
+        lambda session: teacher_sections(session, 1),
+        ("USE TEMP B-TREE FOR DISTINCT", "USE TEMP B-TREE FOR ORDER BY")),
+    "teacher directory next page": (lambda session: directory.teacher_page(session, after=AFTER), ()),
+    "teacher directory role page": (
+        lambda session: directory.teacher_page(session, after=AFTER, role="teacher"), ()),
+    "teacher directory prefix page": (lambda session: directory.teacher_page(session, prefix="ab"), ()),
+    "teacher directory prefix next page": (
+        lambda session: directory.teacher_page(session, prefix="ab", after=AFTER), ()),
+    "student directory next page": (lambda session: directory.student_page(session, after=AFTER), ()),
+    "student directory prefix page": (lambda session: directory.student_page(session, prefix="ab"), ()),
+    "student directory prefix next page": (
+        lambda session: directory.student_page(session, prefix="ab", after=AFTER), ()),
+    # the sort covers one section's students only
+    "section directory page": (
+        lambda session: directory.student_page(session, section_id=1, after=AFTER),
+        ("USE TEMP B-TREE FOR ORDER BY",)),
+    "calendar month status": (
+        lambda session: month_status(session, 1, 2018, 2, cache=MonthStatusCache()), ()),
+    "student term rates": (lambda session: rollups.student_rates(session, 1, 2018, 1, 5), ()),
+    # grouping and ordering at most sections x days-in-range rollup rows; with
+    # statistics the planner may walk the sections and look their days up instead
+    "section term rates": (
+        lambda session: rollups.section_rates(session, 2018, 1, 5),
+        ("USE TEMP B-TREE FOR GROUP BY", "USE TEMP B-TREE FOR ORDER BY", "SCAN g")),
+    "section term ranking": (lambda session: ranking.section_ranking(session, 1, 2018, 1), ()),
+    "grade term ranking": (lambda session: ranking.grade_ranking(session, "9", 2018, 1), ()),
+    # subject names sorted within each student
+    "student subject results": (
+        lambda session: ranking.subject_results(session, [1], 2018, 1),
+        ("USE TEMP B-TREE FOR RIGHT PART OF ORDER BY",)),
+    # bm25 order over the matches, and distinct names out of a word's variants
+    "name search": (
+        lambda session: search.search_people(session, "abebe ke"),
+        FTS_PLAN_STEPS + ("USE TEMP B-TREE FOR ORDER BY", "USE TEMP B-TREE FOR DISTINCT")),
+    "short name search": (lambda session: search.search_people(session, "ab"), ()),
+    "misspelled name search": (
+        lambda session: search.search_people(session, "kebde"),
+        FTS_PLAN_STEPS + ("USE TEMP B-TREE FOR ORDER BY", "USE TEMP B-TREE FOR DISTINCT")),
+}
+
+
+@contextmanager
+def recorded(engine):
+    """Collect (sql, parameters) for every SELECT run on engine inside the block."""
+    seen = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def explain(session, sql, parameters):
+    rows = session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parameters)
+    return [row[-1] for row in rows]
+
+
+def bad_steps(session, seen, allowed=()):
+    """Plan steps of the recorded statements that SCAN a table or sort, other than allowed ones."""
+    allowed = ALLOWED_PLAN_STEPS + tuple(allowed)
+    return [step for sql, parameters in seen for step in explain(session, sql, parameters)
+            if step.startswith(BAD_PLAN_STEPS) and not step.startswith(allowed)]
+
+
+def check_query_plans(session, paths=HOT_PATHS):
+    """Return {hot path name: offending plan steps} for every regressed path."""
+    regressions = {}
+    for name, (run, allowed) in paths.items():
+        with recorded(session.get_bind()) as seen:
+            run(session)
+        bad = bad_steps(session, seen, allowed) if seen else ["ran no query"]
+        if bad:
+            regressions[name] = bad
+    return regressions
+
+
+def schema_objects(connection):
+    return {tuple(row) for row in connection.exec_driver_sql(
+        "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+
+
+def missing_objects(connection):
+    """(type, name) of every table, index and trigger init_db would create that connection lacks."""
+    reference = make_engine(":memory:")
+    Base.metadata.create_all(reference)
+    search.install(reference)
+    rollups.install(reference)
+    with reference.connect() as expected:
+        return sorted(schema_objects(expected) - schema_objects(connection))
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH
+    if not os.path.exists(path):
+        sys.exit(f"no database at {path}")
+    engine = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+    with Session(engine) as session:
+        missing = missing_objects(session.connection())
+        for kind, name in missing:
+            print(f"missing {kind} {name}")
+        regressions = {} if missing else check_query_plans(session)
+    for name, steps in regressions.items():
+        print(f"{name}: {'; '.join(steps)}")
+    if not missing:
+        print(f"{len(HOT_PATHS) - len(regressions)}/{len(HOT_PATHS)} hot paths use an index")
+    sys.exit(1 if missing or regressions else 0)
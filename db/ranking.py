@@ -0,0 +1,148 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Term totals, averages and ranks, materialized for report cards.
+
+rank_term recomputes one term in a single transaction with SQL window
+functions:
+
+    subject_result  a student's total per subject assessed in their section
+                    (missing scores count 0) and rank in the section for
+                    that subject
+    term_result     subject count, grand total, average of subject
+                    percentages, rank in the section and in the grade
+
+Report cards and rank lists then read these rows directly. Run it again
+after scores change; results are only as fresh as the last run.
+
+usage :
+    python -m db.ranking <year> <term> [database path]
+"""
+
+import sys
+import time
+from collections import defaultdict
+
+from sqlalchemy import select, text
+
+from .models import Subject, SubjectResult, TermResult
+
+_SUBJECT_RESULTS_SQL = """
+WITH term_assessment AS (
+    SELECT a.id, a.max_score, ta.subject_id, ta.grade_section_id AS section_id
+    FROM assessment AS a
+    JOIN teaching_assignment AS ta ON ta.id = a.teaching_assignment_id
+    WHERE a.year = :year AND a.term = :term
+),
+counted AS (
+    -- every assessment of the student's section, and any other one they have
+    -- a score in (a student who changed section mid-term)
+    SELECT st.id AS student_id, st.section_id, ta.subject_id, ta.id AS assessment_id, ta.max_score
+    FROM student AS st JOIN term_assessment AS ta ON ta.section_id = st.section_id
+    UNION
+    SELECT s.student_id, st.section_id, ta.subject_id, ta.id, ta.max_score
+    FROM score AS s
+    JOIN term_assessment AS ta ON ta.id = s.assessment_id
+    JOIN student AS st ON st.id = s.student_id
+),
+subject_total AS (
+    SELECT c.student_id, c.section_id, c.subject_id,
+           COALESCE(SUM(s.score), 0) AS total, SUM(c.max_score) AS out_of
+    FROM counted AS c
+    LEFT JOIN score AS s ON s.assessment_id = c.assessment_id AND s.student_id = c.student_id
+    -- section_id is the student's current one, so this is one row per student and subject
+    GROUP BY c.student_id, c.subject_id, c.section_id
+)
+INSERT INTO subject_result (student_id, year, term, subject_id, total, out_of, section_rank)
+SELECT student_id, :year, :term, subject_id, total, out_of,
+       RANK() OVER (PARTITION BY section_id, subject_id ORDER BY 1.0 * total / out_of DESC)
+FROM subject_total
+"""
+
+_TERM_RESULTS_SQL = """
+INSERT INTO term_result (student_id, year, term, section_id, grade, subjects, total, average,
+                         section_rank, grade_rank)
+SELECT r.student_id, :year, :term, st.section_id, gs.grade, COUNT(*), SUM(r.total),
+       AVG(100.0 * r.total / r.out_of),
+       RANK() OVER (PARTITION BY st.section_id ORDER BY AVG(100.0 * r.total / r.out_of) DESC),
+       RANK() OVER (PARTITION BY gs.grade ORDER BY AVG(100.0 * r.total / r.out_of) DESC)
+FROM subject_result AS r
+JOIN student AS st ON st.id = r.student_id
+JOIN grade_section AS gs ON gs.id = st.section_id
+WHERE r.year = :year AND r.term = :term
+GROUP BY r.student_id
+"""
+
+
+def rank_term(session, year, term):
+    """Recompute subject and term results for one term; returns the number of students ranked."""
+    params = {"year": year, "term": term}
+    try:
+        session.execute(text("DELETE FROM subject_result WHERE year = :year AND term = :term"), params)
+        session.execute(text("DELETE FROM term_result WHERE year = :year AND term = :term"), params)
+        session.execute(text(_SUBJECT_RESULTS_SQL), params)
+        ranked = session.execute(text(_TERM_RESULTS_SQL), params).rowcount
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return ranked
+
+
+def section_ranking(session, section_id, year, term):
+    """TermResult rows of a section, best first."""
+    return session.scalars(
+        select(TermResult)
+        .where(TermResult.year == year, TermResult.term == term, TermResult.section_id == section_id)
+        .order_by(TermResult.section_rank)
+    ).all()
+
+
+def grade_ranking(session, grade, year, term):
+    """TermResult rows of a whole grade, best first."""
+    return session.scalars(
+        select(TermResult)
+        .where(TermResult.year == year, TermResult.term == term, TermResult.grade == grade)
+        .order_by(TermResult.grade_rank)
+    ).all()
+
+
+def subject_results(session, student_ids, year, term):
+    """{student_id: [(subject name, total, out_of, section rank), ...]} in one query."""
+    rows = session.execute(
+        select(SubjectResult.student_id, Subject.name, SubjectResult.total,
+               SubjectResult.out_of, SubjectResult.section_rank)
+        .join(Subject, Subject.id == SubjectResult.subject_id)
+        .where(SubjectResult.year == year, SubjectResult.term == term,
+               SubjectResult.student_id.in_(list(student_ids)))
+        .order_by(SubjectResult.student_id, Subject.name)
+    )
+    results = defaultdict(list)
+    for student_id, *subject in rows:
+        results[student_id].append(tuple(subject))
+    return results
+
+
+if __name__ == "__main__":
+    from sqlalchemy.orm import Session as OrmSession
+
+    from .base import DATABASE_PATH, init_db
+
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+    engine = init_db(sys.argv[3] if len(sys.argv) > 3 else DATABASE_PATH)
+    started = time.perf_counter()
+    with OrmSession(engine) as session:
+        ranked = rank_term(session, int(sys.argv[1]), int(sys.argv[2]))
+    print(f"ranked {ranked} students in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,262 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Attendance rollups: status counts per student x Ethiopian month and per section x day.
+
+Triggers on attendance keep both tables current on every insert, correction
+(update) and delete, whoever writes, so reports read a handful of rollup
+rows instead of scanning years of raw attendance. The Ethiopian year and
+month are computed in SQL with the same arithmetic as calendar_core.
+
+Section rollups count a mark against the student's section when it was
+written; a rebuild re-attributes history to the students' current sections.
+
+usage :
+    python -m db.rollups rebuild [database path]
+    python -m db.rollups check [database path]     # exits non-zero on drift
+
+    student_rates(session, section_id, 2018, *TERMS[1])
+    section_rates(session, 2018, 2)                 # one month
+"""
+
+import sys
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import text
+
+from eth_custom_calendar.calendar_core import ETHIOPIC_EPOCH, calendar
+from .models import AttendanceStatusEnum
+
+# attendance status -> rollup column
+STATUS_COLUMNS = {
+    AttendanceStatusEnum.PRESENT.value: "present",
+    AttendanceStatusEnum.ABSENT.value: "absent",
+    AttendanceStatusEnum.LATE.value: "late",
+    AttendanceStatusEnum.HAS_PERMISSION.value: "permission",
+}
+COUNT_COLUMNS = tuple(STATUS_COLUMNS.values())
+
+# (first month, last month) of each semester: Meskerem-Tir and Yekatit-Sene
+TERMS = {1: (1, 5), 2: (6, 10)}
+
+
+def _ordinal_sql(day):
+    # julianday('0001-01-01') is 1721425.5, so this matches date.toordinal()
+    return f"CAST(julianday({day}) - 1721424.5 AS INTEGER)"
+
+
+def eth_year_sql(day):
+    return f"((4 * ({_ordinal_sql(day)} - {ETHIOPIC_EPOCH}) + 1463) / 1461)"
+
+
+def eth_month_sql(day):
+    year = eth_year_sql(day)
+    year_start = f"({ETHIOPIC_EPOCH} + 365 * ({year} - 1) + {year} / 4)"
+    return f"(({_ordinal_sql(day)} - {year_start}) / 30 + 1)"
+
+
+def _counts_sql(status, sign=""):
+    return ", ".join(f"{sign}({status} = '{value}')" for value in STATUS_COLUMNS)
+
+
+def _sums_sql(status):
+    return ", ".join(f"SUM({status} = '{value}')" for value in STATUS_COLUMNS)
+
+
+def _add_counts_sql():
+    return ", ".join(f"{c} = {c} + excluded.{c}" for c in COUNT_COLUMNS)
+
+
+def _apply_sql(row, sign):
+    """Trigger statements adding (sign "") or removing (sign "-") one attendance row."""
+    columns = ", ".join(COUNT_COLUMNS)
+    return (
+        f"INSERT INTO attendance_student_month (student_id, eth_year, eth_month, {columns}) "
+        f"VALUES ({row}.student_id, {eth_year_sql(f'{row}.date')}, {eth_month_sql(f'{row}.date')}, "
+        f"{_counts_sql(f'{row}.status', sign)}) "
+        f"ON CONFLICT (student_id, eth_year, eth_month) DO UPDATE SET {_add_counts_sql()}; "
+        f"INSERT INTO attendance_section_day (section_id, date, {columns}) "
+        f"SELECT section_id, {row}.date, {_counts_sql(f'{row}.status', sign)} "
+        f"FROM student WHERE id = {row}.student_id "
+        f"ON CONFLICT (section_id, date) DO UPDATE SET {_add_counts_sql()};"
+    )
+
+
+def _ddl():
+    counts = ", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in COUNT_COLUMNS)
+    return [
+        "CREATE TABLE IF NOT EXISTS attendance_student_month ("
+        f"student_id INTEGER NOT NULL, eth_year INTEGER NOT NULL, eth_month INTEGER NOT NULL, {counts}, "
+        "PRIMARY KEY (student_id, eth_year, eth_month)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS attendance_section_day ("
+        f"section_id INTEGER NOT NULL, date DATE NOT NULL, {counts}, "
+        "PRIMARY KEY (section_id, date)) WITHOUT ROWID",
+        # every section over a date range (section_rates)
+        "CREATE INDEX IF NOT EXISTS ix_attendance_section_day_date ON attendance_section_day (date)",
+        "CREATE TRIGGER IF NOT EXISTS attendance_rollup_ai AFTER INSERT ON attendance BEGIN "
+        f"{_apply_sql('new', '')} END",
+        "CREATE TRIGGER IF NOT EXISTS attendance_rollup_ad AFTER DELETE ON attendance BEGIN "
+        f"{_apply_sql('old', '-')} END",
+        "CREATE TRIGGER IF NOT EXISTS attendance_rollup_au "
+        "AFTER UPDATE OF student_id, date, status ON attendance BEGIN "
+        f"{_apply_sql('old', '-')} {_apply_sql('new', '')} END",
+    ]
+
+
+def _fresh_student_month_sql():
+    return (
+        f"SELECT student_id, {eth_year_sql('date')}, {eth_month_sql('date')}, {_sums_sql('status')} "
+        "FROM attendance GROUP BY 1, 2, 3"
+    )
+
+
+def _fresh_section_day_sql():
+    return (
+        f"SELECT s.section_id, a.date, {_sums_sql('a.status')} "
+        "FROM attendance AS a JOIN student AS s ON s.id = a.student_id GROUP BY 1, 2"
+    )
+
+
+def install(engine):
+    """Create the rollup tables and triggers if missing; new tables are filled from attendance."""
+    with engine.begin() as connection:
+        existing = {row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for statement in _ddl():
+            connection.exec_driver_sql(statement)
+        if not {"attendance_student_month", "attendance_section_day"} <= existing:
+            _rebuild(connection)
+
+
+def _rebuild(connection):
+    columns = ", ".join(COUNT_COLUMNS)
+    connection.exec_driver_sql("DELETE FROM attendance_student_month")
+    connection.exec_driver_sql("DELETE FROM attendance_section_day")
+    connection.exec_driver_sql(
+        f"INSERT INTO attendance_student_month (student_id, eth_year, eth_month, {columns}) "
+        f"{_fresh_student_month_sql()}")
+    connection.exec_driver_sql(
+        f"INSERT INTO attendance_section_day (section_id, date, {columns}) "
+        f"{_fresh_section_day_sql()}")
+
+
+def rebuild(engine):
+    """Recompute both rollups from the attendance table in one transaction."""
+    with engine.begin() as connection:
+        _rebuild(connection)
+
+
+def check(engine):
+    """{rollup table: rows that differ from a fresh aggregation}; empty when consistent."""
+    nonzero = " OR ".join(f"{c} != 0" for c in COUNT_COLUMNS)
+    pairs = {
+        "attendance_student_month": (
+            f"SELECT student_id, eth_year, eth_month, {', '.join(COUNT_COLUMNS)} "
+            f"FROM attendance_student_month WHERE {nonzero}",
+            _fresh_student_month_sql()),
+        "attendance_section_day": (
+            f"SELECT section_id, date, {', '.join(COUNT_COLUMNS)} "
+            f"FROM attendance_section_day WHERE {nonzero}",
+            _fresh_section_day_sql()),
+    }
+    drift = {}
+    with engine.connect() as connection:
+        for table, (stored, fresh) in pairs.items():
+            differing = connection.exec_driver_sql(
+                f"SELECT COUNT(*) FROM ({stored} EXCEPT {fresh}) "
+                f"UNION ALL SELECT COUNT(*) FROM ({fresh} EXCEPT {stored})").scalars().all()
+            if sum(differing):
+                drift[table] = sum(differing)
+    return drift
+
+
+# ---- reports ----
+
+class Rates(namedtuple("Rates", ("id", "label") + COUNT_COLUMNS)):
+    __slots__ = ()
+
+    @property
+    def marked(self):
+        return self.present + self.absent + self.late + self.permission
+
+    @property
+    def absence_rate(self):
+        return self.absent / self.marked if self.marked else None
+
+
+def student_rates(session, section_id, year, first_month, last_month=None):
+    """Rates per student of a section over Ethiopian months first_month..last_month of year."""
+    sums = ", ".join(f"COALESCE(SUM(r.{c}), 0)" for c in COUNT_COLUMNS)
+    rows = session.execute(text(
+        "SELECT s.id, s.first_name || ' ' || s.father_name, " + sums + " "
+        "FROM student AS s LEFT JOIN attendance_student_month AS r "
+        "ON r.student_id = s.id AND r.eth_year = :year "
+        "AND r.eth_month BETWEEN :first_month AND :last_month "
+        "WHERE s.section_id = :section_id "
+        # grouped in ix_student_section_name order, so no sort is needed
+        "GROUP BY s.father_name, s.first_name, s.grandfather_name, s.id "
+        "ORDER BY s.father_name, s.first_name, s.grandfather_name, s.id"
+    ), {"section_id": section_id, "year": year, "first_month": first_month,
+        "last_month": last_month or first_month})
+    return [Rates(*row) for row in rows]
+
+
+def section_rates(session, year, first_month, last_month=None):
+    """Rates per section over Ethiopian months first_month..last_month of year."""
+    start = calendar.to_gregorian(year, first_month, 1)
+    last_month = last_month or first_month
+    end = calendar.to_gregorian(year, last_month, calendar.month_length(year, last_month))
+    sums = ", ".join(f"SUM(r.{c})" for c in COUNT_COLUMNS)
+    rows = session.execute(text(
+        "SELECT g.id, g.grade || ' ' || g.section, " + sums + " "
+        "FROM attendance_section_day AS r JOIN grade_section AS g ON g.id = r.section_id "
+        "WHERE r.date BETWEEN :start AND :end "
+        "GROUP BY g.id ORDER BY g.grade, g.section"
+    ), {"start": start.isoformat(), "end": end.isoformat()})
+    return [Rates(*row) for row in rows]
+
+
+def verify_month_sql(engine, first_year=1990, last_year=2100):
+    """Return days in the range where the SQL month arithmetic disagrees with calendar_core."""
+    first = calendar.month_start_ordinal(first_year, 1)
+    last = calendar.month_start_ordinal(last_year, 13)
+    sql = f"SELECT {eth_year_sql(':day')}, {eth_month_sql(':day')}"
+    bad = []
+    with engine.connect() as connection:
+        for ordinal in range(first, last, 5):
+            day = date.fromordinal(ordinal)
+            expected = calendar.to_ethiopian(day)
+            got = tuple(connection.execute(text(sql), {"day": day.isoformat()}).one())
+            if got != (expected.year, expected.month):
+                bad.append(day)
+    return bad
+
+
+if __name__ == "__main__":
+    from .base import DATABASE_PATH, init_db
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    # init_db creates anything missing, including the rollup tables and triggers
+    engine = init_db(sys.argv[2] if len(sys.argv) > 2 else DATABASE_PATH)
+    if command == "rebuild":
+        rebuild(engine)
+    elif command == "check":
+        drift = check(engine)
+        for table, rows in drift.items():
+            print(f"{table}: {rows} rows differ, run 'python -m db.rollups rebuild'")
+        print("rollups consistent" if not drift else "rollups drifted")
+        sys.exit(1 if drift else 0)
+    else:
+        sys.exit(__doc__)
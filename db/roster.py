@@ -0,0 +1,128 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Section rosters for attendance taking.
+
+A roster is a section's students as a tuple of small named tuples, cached
+per section_id. The first load for a day brings the students and the
+teacher's existing marks back in one LEFT JOIN; after that only the marks
+are read. Screens never go back to the database per row.
+
+Student inserts, transfers and deletes made through the ORM drop the
+affected sections from the cache; bulk Core inserts (import_student_to_db)
+call roster_cache.forget themselves.
+
+usage :
+    roster, marks = roster_for_day(session, section_id, teacher_id, date)
+    roster.students[0].name      # "Abebe Kebede Alemu"
+    marks.get(student_id)        # "Present", ... or None when not marked yet
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import and_, event, inspect, select
+
+from .directory import display_name
+from .models import Attendance, GradeSection, Student, TeachingAssignment
+
+Roster = namedtuple("Roster", "section_id students")
+RosterStudent = namedtuple("RosterStudent", "id name")
+
+
+class RosterCache:
+    """Bounded LRU of Roster keyed by section_id."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, section_id):
+        with self._lock:
+            roster = self._entries.get(section_id)
+            if roster is not None:
+                self._entries.move_to_end(section_id)
+            return roster
+
+    def put(self, roster):
+        with self._lock:
+            self._entries[roster.section_id] = roster
+            self._entries.move_to_end(roster.section_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, *section_ids):
+        with self._lock:
+            for section_id in section_ids:
+                self._entries.pop(section_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+roster_cache = RosterCache()
+
+
+def roster_for_day(session, section_id, teacher_id, date, cache=roster_cache):
+    """Return (Roster, {student_id: status}) for what ``teacher_id`` marked on ``date``."""
+    roster = cache.get(section_id)
+    if roster is not None:
+        ids = {student.id for student in roster.students}
+        rows = session.execute(
+            select(Attendance.student_id, Attendance.status)
+            .where(Attendance.teacher_id == teacher_id, Attendance.date == date)
+        )
+        return roster, {student_id: status for student_id, status in rows if student_id in ids}
+
+    rows = session.execute(
+        select(Student.id, Student.first_name, Student.father_name,
+               Student.grandfather_name, Attendance.status)
+        .outerjoin(Attendance, and_(Attendance.student_id == Student.id,
+                                    Attendance.teacher_id == teacher_id,
+                                    Attendance.date == date))
+        .where(Student.section_id == section_id)
+        .order_by(Student.father_name, Student.first_name)
+    ).all()
+    roster = Roster(section_id, tuple(RosterStudent(row.id, display_name(row)) for row in rows))
+    cache.put(roster)
+    return roster, {row.id: row.status for row in rows if row.status is not None}
+
+
+def teacher_sections(session, teacher_id):
+    """[(section_id, "9 A"), ...] for the sections a teacher is assigned to."""
+    rows = session.execute(
+        select(GradeSection.id, GradeSection.grade, GradeSection.section)
+        .join(TeachingAssignment, TeachingAssignment.grade_section_id == GradeSection.id)
+        .where(TeachingAssignment.teacher_id == teacher_id)
+        .distinct()
+        .order_by(GradeSection.grade, GradeSection.section)
+    )
+    return [(row.id, f"{row.grade} {row.section}") for row in rows]
+
+
+# ---- cache invalidation for ORM writes ----
+
+@event.listens_for(Student, "after_insert")
+@event.listens_for(Student, "after_delete")
+def _forget_student_section(mapper, connection, student):
+    roster_cache.forget(student.section_id)
+
+
+@event.listens_for(Student, "after_update")
+def _forget_changed_sections(mapper, connection, student):
+    # a transfer changes two rosters; a rename changes the one it is in
+    history = inspect(student).attrs.section_id.history
+    roster_cache.forget(student.section_id, *history.deleted)
@@ -0,0 +1,335 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Full-text name search over students and teachers (SQLite FTS5).
+
+student_fts and teacher_fts are external-content FTS5 tables over the name
+columns, kept in sync by triggers. They use the trigram tokenizer, which
+works the same for Amharic and Latin names and matches parts of words.
+A search first asks for names containing every word typed, ranked by
+bm25. If that finds too few, it tops up with names one edit (a wrong,
+missing, extra or swapped letter) from each word, ranked by the number of
+edits. name_variant, also kept by triggers, holds every name in lower case
+once as it is and once with each of its letters left out. A name one edit
+from a word always shares one of these variants with it, so one index
+lookup of the word's own variants gives the few names worth comparing.
+
+Trigrams cannot index words shorter than three characters; those are
+matched as first or father name prefixes through the NOCASE name indexes.
+
+usage :
+    python -m db.search rebuild [database path]
+    python -m db.search find <name> [database path]
+"""
+
+import heapq
+import sys
+from collections import namedtuple
+
+from sqlalchemy import bindparam, text
+
+from .models import Student, Teacher
+
+SearchResult = namedtuple(
+    "SearchResult", "kind id first_name father_name grandfather_name rank"
+)
+
+NAME_COLUMNS = ("first_name", "father_name", "grandfather_name")
+# the ones short words are looked up in, through ix_*_first_name and ix_*_name
+PREFIX_COLUMNS = ("first_name", "father_name")
+FTS_TABLES = {"student": Student.__tablename__, "teacher": Teacher.__tablename__}
+# letters past this one are never left out of a name_variant entry
+LONGEST_NAME = 64
+# at most this many people per name column are compared
+CANDIDATES = 200
+
+
+def _ddl(table):
+    columns = ", ".join(NAME_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in NAME_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in NAME_COLUMNS)
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{columns}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def _variants(names):
+    """INSERT filling name_variant from names, a SELECT of one lower-cased column called name."""
+    # n = 0 keeps the whole name, n = 1.. leaves out the n-th letter
+    return (
+        "INSERT OR IGNORE INTO name_variant(variant, name) "
+        "SELECT substr(v.name, 1, max(p.n - 1, 0)) || substr(v.name, p.n + 1), v.name "
+        f"FROM ({names}) v JOIN name_position p ON p.n <= length(v.name) WHERE v.name IS NOT NULL"
+    )
+
+
+def _names(row, source=""):
+    return " UNION ".join(f"SELECT lower({row}{column}) AS name{source}" for column in NAME_COLUMNS)
+
+
+def _variant_ddl(table):
+    columns = ", ".join(NAME_COLUMNS)
+    # names no one has any more are left behind; they only cost a lookup, and rebuild drops them
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_names_ai AFTER INSERT ON {table} BEGIN "
+        f"{_variants(_names('new.'))}; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_names_au AFTER UPDATE OF {columns} ON {table} BEGIN "
+        f"{_variants(_names('new.'))}; END",
+    ]
+
+
+def _fill_variants(connection):
+    for table in FTS_TABLES.values():
+        connection.exec_driver_sql(_variants(_names("", f" FROM {table}")))
+
+
+def install(engine):
+    """Create the FTS tables, name_variant and their triggers if missing; new tables are filled from existing rows."""
+    with engine.begin() as connection:
+        existing = {row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in FTS_TABLES.values():
+            for statement in _ddl(table):
+                connection.exec_driver_sql(statement)
+            if f"{table}_fts" not in existing:
+                connection.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS name_position (n INTEGER PRIMARY KEY)")
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS name_variant (variant TEXT NOT NULL, name TEXT NOT NULL, "
+            "PRIMARY KEY (variant, name)) WITHOUT ROWID")
+        for table in FTS_TABLES.values():
+            for statement in _variant_ddl(table):
+                connection.exec_driver_sql(statement)
+        if "name_position" not in existing:
+            connection.exec_driver_sql(
+                "WITH RECURSIVE p(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM p WHERE n < ?) "
+                "INSERT INTO name_position(n) SELECT n FROM p", (LONGEST_NAME,))
+        if "name_variant" not in existing:
+            _fill_variants(connection)
+
+
+def rebuild(engine):
+    """Re-index every name from the content tables."""
+    with engine.begin() as connection:
+        for table in FTS_TABLES.values():
+            connection.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        connection.exec_driver_sql("DELETE FROM name_variant")
+        _fill_variants(connection)
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def match_query(query):
+    """FTS5 MATCH expression needing every word of a free-text name query as a substring.
+
+    Words shorter than three characters can't use a trigram index and are
+    left out; search_people matches them as prefixes. None if no word is left.
+    """
+    words = [word for word in query.lower().split() if len(word) >= 3]
+    if not words:
+        return None
+    return " AND ".join(_quote(word) for word in words)
+
+
+def _like_prefix(word):
+    return word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _prefix_conditions(words, alias):
+    """SQL requiring, for each word, some name column starting with it, and its parameters."""
+    conditions = " AND ".join(
+        "(" + " OR ".join(f"{alias}.{column} LIKE :prefix{i} ESCAPE '\\'" for column in NAME_COLUMNS) + ")"
+        for i in range(len(words)))
+    return conditions, {f"prefix{i}": _like_prefix(word) for i, word in enumerate(words)}
+
+
+def _search_table(connection, kind, match, limit, prefixes=()):
+    table = FTS_TABLES[kind]
+    params = {"match": match, "limit": limit}
+    where = f"{table}_fts MATCH :match"
+    if prefixes:
+        conditions, prefix_params = _prefix_conditions(prefixes, "p")
+        where += " AND " + conditions
+        params.update(prefix_params)
+    sql = text(
+        f"SELECT p.id, p.first_name, p.father_name, p.grandfather_name, bm25({table}_fts) AS rank "
+        f"FROM {table}_fts JOIN {table} p ON p.id = {table}_fts.rowid "
+        f"WHERE {where} ORDER BY rank LIMIT :limit"
+    )
+    return [SearchResult(kind, *row) for row in connection.execute(sql, params)]
+
+
+def _prefix_table(connection, kind, prefixes, limit):
+    """People with a first or father name starting with the longest of prefixes, and some name
+    starting with each of the others; rank 0."""
+    table = FTS_TABLES[kind]
+    first, *others = sorted(prefixes, key=len, reverse=True)
+    conditions, params = _prefix_conditions(others, "p")
+    results = {}
+    for column in PREFIX_COLUMNS:
+        sql = text(
+            f"SELECT p.id, p.first_name, p.father_name, p.grandfather_name, 0.0 FROM {table} p "
+            f"WHERE p.{column} LIKE :first ESCAPE '\\' {'AND ' + conditions if conditions else ''} "
+            f"ORDER BY p.{column} COLLATE NOCASE LIMIT :limit"
+        )
+        for row in connection.execute(sql, dict(params, first=_like_prefix(first), limit=limit)):
+            results.setdefault(row[0], SearchResult(kind, *row))
+    return list(results.values())[:limit]
+
+
+def distance_from(word, cutoff):
+    """edit_distance(word, name, cutoff) as a function of name, with word's bit masks built once.
+
+    Bit-parallel (Myers, with Hyyrö's swap step): one pass over the name with
+    word's positions as the bits of an int, several times faster than the table.
+    """
+    mask = (1 << len(word)) - 1
+    last = 1 << (len(word) - 1) if word else 0
+    positions = {}
+    for i, char in enumerate(word):
+        positions[char] = positions.get(char, 0) | 1 << i
+
+    def distance(name):
+        if name == word:
+            return 0
+        if abs(len(word) - len(name)) > cutoff or not word or not name:
+            return min(max(len(word), len(name)), cutoff + 1)
+        plus, minus, diagonal, previous, edits = mask, 0, 0, 0, len(word)
+        for char in name:
+            match = positions.get(char, 0)
+            swap = ((~diagonal & match) << 1) & previous
+            diagonal = ((((match & plus) + plus) ^ plus) | match | minus | swap) & mask
+            up = (minus | ~(diagonal | plus)) & mask
+            down = diagonal & plus
+            if up & last:
+                edits += 1
+            elif down & last:
+                edits -= 1
+            up = ((up << 1) | 1) & mask
+            down = (down << 1) & mask
+            plus = (down | ~(diagonal | up)) & mask
+            minus = up & diagonal
+            previous = match
+        return min(edits, cutoff + 1)
+
+    return distance
+
+
+def edit_distance(a, b, cutoff):
+    """Levenshtein distance counting an adjacent swap as one edit, capped at cutoff + 1."""
+    return distance_from(a, cutoff)(b)
+
+
+def _variant_keys(word):
+    return {word} | {word[:i] + word[i + 1:] for i in range(min(len(word), LONGEST_NAME))}
+
+
+def _near_names(connection, word):
+    """Lower-cased names one edit from word, out of those sharing a name_variant entry with it."""
+    distance = distance_from(word, 1)
+    names = connection.execute(text(
+        "SELECT DISTINCT name FROM name_variant WHERE variant IN :keys"
+    ).bindparams(bindparam("keys", expanding=True)), {"keys": sorted(_variant_keys(word))}).scalars()
+    return [name for name in names if distance(name) <= 1]
+
+
+def _near_table(connection, kind, words, names, limit):
+    """People with a name one edit or less from each of words, ranked by total edits.
+
+    Every word has to match, so names, the _near_names of the longest word,
+    pick the people to compare.
+    """
+    table = FTS_TABLES[kind]
+    if not names:
+        return []
+    rows = {}
+    for column in NAME_COLUMNS:
+        rows.update((row[0], row) for row in connection.execute(text(
+            f"SELECT id, first_name, father_name, grandfather_name FROM {table} "
+            f"WHERE {column} COLLATE NOCASE IN :names LIMIT :candidates"
+        ).bindparams(bindparam("names", expanding=True)), {"names": names, "candidates": CANDIDATES}))
+    distances = {word: distance_from(word, 1) for word in words}
+    scored = []
+    for row in rows.values():
+        person = [name.lower() for name in row[1:] if name]
+        total = 0
+        for word in words:
+            best = min(map(distances[word], person), default=2)
+            if best > 1:
+                break
+            total += best
+        else:
+            scored.append(SearchResult(kind, *row, float(total)))
+    return heapq.nsmallest(limit, scored, key=lambda result: result.rank)
+
+
+def search_people(session, query, limit=20, kinds=("student", "teacher")):
+    """Ranked SearchResult list for a (possibly partial or misspelled) name.
+
+    rank is bm25 for full-text hits and the number of edits for the others;
+    lower is better, and each fallback only tops up what the earlier ones found.
+    """
+    words = query.lower().split()
+    if not words:
+        return []
+    strict = match_query(query)
+    short = [word for word in words if len(word) < 3]
+    connection = session.connection()
+    results = []
+
+    def top_up(search):
+        seen = {(r.kind, r.id) for r in results}
+        results.extend(heapq.nsmallest(limit - len(results), (
+            result for kind in kinds for result in search(kind) if (result.kind, result.id) not in seen
+        ), key=lambda result: result.rank))
+
+    if strict is not None:
+        top_up(lambda kind: _search_table(connection, kind, strict, limit, short))
+    else:
+        top_up(lambda kind: _prefix_table(connection, kind, short, limit))
+    if len(results) < limit and strict is not None:
+        # not enough exact substring hits, top up with misspellings
+        names = _near_names(connection, max(words, key=len))
+        top_up(lambda kind: _near_table(connection, kind, words, names, limit))
+    return results
+
+if __name__ == "__main__":
+    from sqlalchemy.orm import Session as OrmSession
+
+    from .base import DATABASE_PATH, init_db, make_engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command == "rebuild":
+        # init_db creates anything missing, including the FTS tables and triggers
+        rebuild(init_db(sys.argv[2] if len(sys.argv) > 2 else DATABASE_PATH))
+    elif command == "find":
+        engine = make_engine(sys.argv[3] if len(sys.argv) > 3 else DATABASE_PATH)
+        with OrmSession(engine) as session:
+            for result in search_people(session, sys.argv[2]):
+                print(f"{result.kind:<8} {result.id:>6}  {result.first_name} {result.father_name} "
+                      f"{result.grandfather_name or ''}  ({result.rank:.2f})")
+    else:
+        sys.exit(__doc__)
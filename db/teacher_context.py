@@ -0,0 +1,136 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The logged-in teacher with their assignments, loaded once at login.
+
+load_teacher_context reads the teacher, their teaching assignments and the
+subjects and sections those name in one joined query, into a read-only
+TeacherContext. Screens share it through current_teacher instead of
+querying the teacher again; sync_assignments marks it stale when an admin
+changes that teacher's assignments and the next get() reloads it.
+
+usage :
+    context = load_teacher_context(session, teacher_id)
+    current_teacher.set(context)                   # at login
+    context = current_teacher.get(session)         # in a screen
+    context.sections                               # ((section_id, "9 A"), ...)
+    context.subjects_in(section_id)                # ((subject_id, "Maths"), ...)
+"""
+
+import threading
+from collections import namedtuple
+
+from sqlalchemy import select
+
+from .models import GradeSection, Subject, Teacher, TeachingAssignment
+
+AssignmentInfo = namedtuple("AssignmentInfo", "id subject_id subject section_id section")
+
+
+class TeacherContext:
+    """Read-only snapshot of one teacher and their teaching assignments."""
+    __slots__ = ("teacher_id", "username", "full_name", "role", "assignments", "sections", "subjects")
+
+    def __init__(self, teacher_id, username, full_name, role, assignments):
+        assignments = tuple(assignments)
+        values = {
+            "teacher_id": teacher_id, "username": username, "full_name": full_name, "role": role,
+            "assignments": assignments,
+            # dict.fromkeys drops repeats and keeps the query's order
+            "sections": tuple(dict.fromkeys((a.section_id, a.section) for a in assignments)),
+            "subjects": tuple(sorted(dict.fromkeys((a.subject_id, a.subject) for a in assignments),
+                                     key=lambda subject: subject[1])),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TeacherContext is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("TeacherContext is read-only")
+
+    @property
+    def id(self):
+        return self.teacher_id
+
+    def subjects_in(self, section_id):
+        """((subject_id, name), ...) the teacher teaches in one section."""
+        return tuple((a.subject_id, a.subject) for a in self.assignments if a.section_id == section_id)
+
+    def __repr__(self):
+        return f"<TeacherContext({self.username}, {len(self.assignments)} assignments)>"
+
+
+def load_teacher_context(session, teacher_id):
+    """TeacherContext for teacher_id from one query, or None if there is no such teacher."""
+    rows = session.execute(
+        select(Teacher.username, Teacher.first_name, Teacher.father_name, Teacher.grandfather_name,
+               Teacher.role, TeachingAssignment.id, Subject.id, Subject.name,
+               GradeSection.id, GradeSection.grade, GradeSection.section)
+        .select_from(Teacher)
+        .outerjoin(TeachingAssignment, TeachingAssignment.teacher_id == Teacher.id)
+        .outerjoin(Subject, Subject.id == TeachingAssignment.subject_id)
+        .outerjoin(GradeSection, GradeSection.id == TeachingAssignment.grade_section_id)
+        .where(Teacher.id == teacher_id)
+        .order_by(GradeSection.grade, GradeSection.section, Subject.name)
+    ).all()
+    if not rows:
+        return None
+    username, first_name, father_name, grandfather_name, role = rows[0][:5]
+    full_name = " ".join(n.title() for n in (first_name, father_name, grandfather_name) if n)
+    # a teacher without assignments comes back as one row of NULLs from the outer join
+    assignments = [AssignmentInfo(row[5], row[6], row[7], row[8], f"{row[9]} {row[10]}")
+                   for row in rows if row[5] is not None]
+    return TeacherContext(teacher_id, username, full_name, role, assignments)
+
+
+class CurrentTeacher:
+    """Holds the logged-in teacher's context for every screen to share."""
+
+    def __init__(self):
+        self._context = None
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def set(self, context):
+        with self._lock:
+            self._context = context
+            self._stale = False
+
+    def get(self, session):
+        """The current context, reloaded first if its assignments changed; None when logged out."""
+        with self._lock:
+            context, stale = self._context, self._stale
+        if context is None or not stale:
+            return context
+        context = load_teacher_context(session, context.teacher_id)
+        with self._lock:
+            # a logout or another login meanwhile wins over this reload
+            if self._context is not None and context is not None \
+                    and self._context.teacher_id == context.teacher_id:
+                self._context, self._stale = context, False
+            return self._context
+
+    def invalidate(self, *teacher_ids):
+        """Mark the context stale if it belongs to one of teacher_ids."""
+        with self._lock:
+            if self._context is not None and self._context.teacher_id in teacher_ids:
+                self._stale = True
+
+    def clear(self):
+        self.set(None)
+
+
+current_teacher = CurrentTeacher()
@@ -1,2 +1,9 @@
-from .ethiopia_custom_calender import EthiopianCalendarScreen 
-__all__ = ["EthiopianCalenderScreen"]
+__all__ = ["EthiopianCalendarScreen"]
+
+
+def __getattr__(name):
+    # the screen pulls in Kivy; calendar_core is imported by the db layer without it
+    if name == "EthiopianCalendarScreen":
+        from .ethiopia_custom_calender import EthiopianCalendarScreen
+        return EthiopianCalendarScreen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,206 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Ethiopian <-> Gregorian conversion from precomputed month tables.
+
+For every Ethiopian year in the configured range the Gregorian ordinal
+(date.toordinal()) of each month start and each month's length are computed
+once, so converting either way is a couple of integer operations. Batches of
+dates convert in one vectorized step when numpy is installed.
+
+usage :
+    from eth_custom_calendar.calendar_core import calendar
+    calendar.to_ethiopian(date.today())      # EthiopianDate(year, month, day)
+    calendar.to_gregorian(2018, 1, 1)        # date(2025, 9, 11)
+
+    python -m eth_custom_calendar.calendar_core   # check every day against ethiopian_date
+"""
+
+import functools
+from collections import namedtuple
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # batch conversion falls back to plain lists
+    np = None
+
+# date.toordinal() of Meskerem 1, year 1 (29 August 8 CE, Julian)
+ETHIOPIC_EPOCH = 2796
+MONTHS_PER_YEAR = 13
+DAYS_PER_MONTH = 30
+MONTH_NAMES = (
+    "መስከረም", "ጥቅምት", "ኅዳር", "ታህሳስ", "ጥር",
+    "የካቲት", "መጋቢት", "ሚያዝያ", "ግንቦት", "ሰኔ",
+    "ሐምሌ", "ነሐሴ", "ጳጉሜን",
+)
+
+EthiopianDate = namedtuple("EthiopianDate", "year month day")
+
+
+def is_leap_year(year):
+    # Ethiopian leap year rule: leap every 4 years (no century exception)
+    return year % 4 == 3
+
+
+def year_start_ordinal(year):
+    """Gregorian ordinal of Meskerem 1 of an Ethiopian year."""
+    return ETHIOPIC_EPOCH + 365 * (year - 1) + year // 4
+
+
+class EthiopianCalendar:
+    def __init__(self, first_year=1900, last_year=2100):
+        self.first_year = first_year
+        self.last_year = last_year
+        years = range(first_year, last_year + 1)
+        # one entry past last_year so the last year's end is known too
+        self.year_starts = [year_start_ordinal(year) for year in range(first_year, last_year + 2)]
+        # flat tables indexed by (year - first_year) * 13 + (month - 1)
+        self.month_starts = []
+        self.month_lengths = []
+        for year, start in zip(years, self.year_starts):
+            for month in range(1, MONTHS_PER_YEAR + 1):
+                self.month_starts.append(start + (month - 1) * DAYS_PER_MONTH)
+                if month < MONTHS_PER_YEAR:
+                    self.month_lengths.append(DAYS_PER_MONTH)
+                else:
+                    self.month_lengths.append(6 if is_leap_year(year) else 5)
+        self.first_ordinal = self.year_starts[0]
+        self.last_ordinal = self.year_starts[-1] - 1
+        if np is not None:
+            self._year_starts_array = np.asarray(self.year_starts, dtype=np.int64)
+
+    def _month_index(self, year, month):
+        if not (self.first_year <= year <= self.last_year) or not 1 <= month <= MONTHS_PER_YEAR:
+            raise ValueError(f"{year}/{month} is outside {self.first_year}-{self.last_year}")
+        return (year - self.first_year) * MONTHS_PER_YEAR + month - 1
+
+    def month_length(self, year, month):
+        return self.month_lengths[self._month_index(year, month)]
+
+    def month_start_ordinal(self, year, month):
+        return self.month_starts[self._month_index(year, month)]
+
+    def first_weekday(self, year, month):
+        """Weekday of the 1st of an Ethiopian month, Sunday=0."""
+        # date.fromordinal(1) is a Monday
+        return self.month_start_ordinal(year, month) % 7
+
+    def to_gregorian_ordinal(self, year, month, day):
+        index = self._month_index(year, month)
+        if not 1 <= day <= self.month_lengths[index]:
+            raise ValueError(f"day {day} is outside {year}/{month}")
+        return self.month_starts[index] + day - 1
+
+    def to_gregorian(self, year, month, day):
+        return date.fromordinal(self.to_gregorian_ordinal(year, month, day))
+
+    def ethiopian_from_ordinal(self, ordinal):
+        if not self.first_ordinal <= ordinal <= self.last_ordinal:
+            raise ValueError(f"{date.fromordinal(ordinal)} is outside {self.first_year}-{self.last_year}")
+        year = (4 * (ordinal - ETHIOPIC_EPOCH) + 1463) // 1461
+        offset = ordinal - self.year_starts[year - self.first_year]
+        return EthiopianDate(year, offset // DAYS_PER_MONTH + 1, offset % DAYS_PER_MONTH + 1)
+
+    def to_ethiopian(self, gregorian):
+        return self.ethiopian_from_ordinal(gregorian.toordinal())
+
+    # ---- batch conversion ----
+
+    def to_ethiopian_batch(self, ordinals):
+        """(years, months, days) for a sequence of Gregorian ordinals."""
+        if np is None:
+            converted = [self.ethiopian_from_ordinal(o) for o in ordinals]
+            return ([d.year for d in converted], [d.month for d in converted], [d.day for d in converted])
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if ordinals.size and (ordinals.min() < self.first_ordinal or ordinals.max() > self.last_ordinal):
+            raise ValueError(f"dates outside {self.first_year}-{self.last_year}")
+        years = (4 * (ordinals - ETHIOPIC_EPOCH) + 1463) // 1461
+        offsets = ordinals - self._year_starts_array[years - self.first_year]
+        return years, offsets // DAYS_PER_MONTH + 1, offsets % DAYS_PER_MONTH + 1
+
+    def to_gregorian_batch(self, years, months, days):
+        """Gregorian ordinals for parallel sequences of Ethiopian year, month, day."""
+        if np is None:
+            return [self.to_gregorian_ordinal(y, m, d) for y, m, d in zip(years, months, days)]
+        years, months, days = (np.asarray(a, dtype=np.int64) for a in (years, months, days))
+        if years.size and (years.min() < self.first_year or years.max() > self.last_year):
+            raise ValueError(f"years outside {self.first_year}-{self.last_year}")
+        return self._year_starts_array[years - self.first_year] + (months - 1) * DAYS_PER_MONTH + days - 1
+
+
+calendar = EthiopianCalendar()
+
+
+@functools.lru_cache(maxsize=1)
+def _today(ordinal):
+    return calendar.ethiopian_from_ordinal(ordinal)
+
+
+def today():
+    """Today's Ethiopian date, converted once per day."""
+    return _today(date.today().toordinal())
+
+
+def library_is_wrong(year):
+    """True for the Ethiopian years ethiopian_date gets wrong around a Gregorian non-leap century.
+
+    The package moves the new-year offset at the Ethiopian century (E.C. 1900,
+    2100) instead of at Gregorian 1900 / 2100, so E.C. 1893-1900 and
+    2093-2100 come out a day off.
+    """
+    century = (year + 7) // 100
+    return century != (year - 1) // 100 and century % 4 != 0
+
+
+def verify_against_ethiopian_date(cal=calendar):
+    """Check every day of cal's range; returns (mismatches, skipped years).
+
+    Every day must round-trip through our own tables, and must agree with
+    the ethiopian_date package except in the years library_is_wrong() flags.
+    """
+    from ethiopian_date import EthiopianDateConverter
+
+    mismatches = []
+    skipped = []
+    for year in range(cal.first_year, cal.last_year + 1):
+        compare = not library_is_wrong(year)
+        if not compare:
+            skipped.append(year)
+        for month in range(1, MONTHS_PER_YEAR + 1):
+            for day in range(1, cal.month_length(year, month) + 1):
+                gregorian = cal.to_gregorian(year, month, day)
+                if cal.to_ethiopian(gregorian) != (year, month, day):
+                    mismatches.append(((year, month, day), gregorian))
+                if not compare:
+                    continue
+                if EthiopianDateConverter.to_gregorian(year, month, day) != gregorian:
+                    mismatches.append(((year, month, day), gregorian))
+                try:
+                    expected = EthiopianDateConverter.date_to_ethiopian(gregorian)
+                except ValueError:
+                    # ethiopian_date returns a datetime.date, which can't hold
+                    # Pagumen (month 13) or day 29/30 of a "February"
+                    continue
+                if (expected.year, expected.month, expected.day) != (year, month, day):
+                    mismatches.append((gregorian, (year, month, day)))
+    return mismatches, skipped
+
+
+if __name__ == "__main__":
+    mismatches, skipped = verify_against_ethiopian_date(EthiopianCalendar(1850, 2092))
+    for mismatch in mismatches[:20]:
+        print(mismatch)
+    print(f"E.C. 1850-2092: {len(mismatches)} mismatches, "
+          f"not compared with ethiopian_date: {skipped[0]}-{skipped[-1]}")
@@ -12,62 +12,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from ethiopian_date import EthiopianDateConverter
+from . import calendar_core
+from .calendar_core import calendar
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
-from datetime import datetime, date
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.utils import get_color_from_hex
 
-from kivy.uix.widget import Widget
-from kivy.graphics import Color, Line, Rectangle
-from kivy.lang.builder import Builder
-
-# Builder.load_file('calender.kv')
-
-class BorderedButton(Button):
-    """take a given button and color its boarder so  
-        usage :
-            btn = BorderedButton(boarder_color=(int,int,int,int),**kwargs)
-        
-        this class has similar usage as Button class in addition to a keyword argument called boarder_color which is a list of tuple.
-    
-    """
-    def __init__(self, border_color=(1,0,0,1), **kwargs):
-        super().__init__(**kwargs)
-        self.border_color = border_color
-        self.bind(pos=self.update_canvas, size=self.update_canvas)
+from kivy.graphics import Color, Line
+from kivy.properties import NumericProperty
+
+from db.base import Session
+from db.month_status import month_status
+
 
-    def update_canvas(self, *args):
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*self.border_color)
-            Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
+# day cell looks, applied in place on navigation; colors are lists so they
+# compare equal to the cells' ListProperty values and unchanged ones are skipped
+FUTURE_DAY = dict(background_color=get_color_from_hex("#CCCCCC"), color=[0.5, 0.5, 0.5, 1], disabled=True)
+TODAY = dict(background_color=get_color_from_hex("#CCCCCC"), color=[1, 1, 1, 1], disabled=False)
+NORMAL_DAY = dict(background_color=get_color_from_hex("#E0F7FA"), color=[0, 0, 0, 1], disabled=False)
+EMPTY_CELL = dict(background_color=[0, 0, 0, 0], color=[0, 0, 0, 0], disabled=True)
+# attendance overlay: every assigned section recorded / only some of them
+COMPLETE_DAY = dict(background_color=get_color_from_hex("#A5D6A7"), color=[0, 0, 0, 1], disabled=False)
+PARTIAL_DAY = dict(background_color=get_color_from_hex("#FFCC80"), color=[0, 0, 0, 1], disabled=False)
 
 
 class EthiopianCalendarScreen(Screen):
+    # 6 weeks x 7 days covers any month start
+    GRID_CELLS = 42
+    # set at login; None shows the plain calendar without the attendance overlay
+    teacher_id = NumericProperty(None, allownone=True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
-        self.layout.add_widget(Label(text='calender'))
         self.add_widget(self.layout)
 
         # Initialize with the current Ethiopian date
-        today = datetime.now()
-        eth_today = EthiopianDateConverter.to_ethiopian(today.year, today.month, today.day)
+        eth_today = calendar_core.today()
         self.current_year = eth_today.year
         self.current_month = eth_today.month
         self.current_day = eth_today.day
         self.today = eth_today
 
+        self.build_calendar()
         self.display_calendar()
 
-    def display_calendar(self):
-        self.layout.clear_widgets()
-        
+    def build_calendar(self):
+        """Create every widget once; display_calendar only updates them."""
         self.layout.add_widget(Label(text='calender'))
         # --- Navigation bar ---
         nav_layout = BoxLayout(size_hint_y=None, height=50, spacing=10)
@@ -78,15 +72,14 @@ class EthiopianCalendarScreen(Screen):
         prev_btn.bind(on_press=lambda _: self.change_month(-1))
         next_btn.bind(on_press=lambda _: self.change_month(1))
 
-        title_label = Label(
-            text=f"{self.get_month_name(self.current_month)} {self.current_year}",
+        self.title_label = Label(
             font_size=22,
             color=(0.1, 0.3, 0.6, 1),
             font_name="AmharicFont"
         )
 
         nav_layout.add_widget(prev_btn)
-        nav_layout.add_widget(title_label)
+        nav_layout.add_widget(self.title_label)
         nav_layout.add_widget(next_btn)
         self.layout.add_widget(nav_layout)
 
@@ -103,60 +96,22 @@ class EthiopianCalendarScreen(Screen):
             ))
         self.layout.add_widget(week_grid)
 
-        # --- Calendar grid ---
+        # --- Calendar grid: a fixed pool of day cells ---
         grid = GridLayout(cols=7, spacing=5, size_hint_y=None)
         grid.bind(minimum_height=grid.setter('height'))
-
-        # Determine weekday of the first day in this Ethiopian month
-        greg_start = EthiopianDateConverter.to_gregorian(self.current_year, self.current_month, 1)
-        weekday_start = date(greg_start.year, greg_start.month, greg_start.day).weekday()  # Monday=0
-        weekday_start = (weekday_start + 1) % 7  # make Sunday=0
-
-        # Add empty slots before first day
-        for _ in range(weekday_start):
-            grid.add_widget(Label(text=""))
-
-        # Fill the calendar (Pagumen has 5 or 6 days)
-        num_days = 6 if (self.current_month == 13 and self.is_leap_year(self.current_year)) else \
-                    5 if self.current_month == 13 else 30
-
-        for day in range(1, num_days + 1):
-            et_day = EthiopianDateConverter.to_ethiopian(datetime.now().year, datetime.now().month, datetime.now().day)
-            # Only blur future days if it's the current month/year
-            if (self.current_year,self.current_month,day) > (et_day.year, et_day.month, et_day.day) :
-                # Dim future days
-                btn = Button(
-                    text=str(day),
-                    size_hint_y=None,
-                    height=50,
-                    background_color=get_color_from_hex("#CCCCCC"),
-                    color=(0.5, 0.5, 0.5, 1),
-                    disabled=True
-                )
-            else:
-                # Normal day
-                if self.is_today(day):
-        
-                    # Highlight current day
-                    btn = BorderedButton(
-                        text=str(day),
-                        size_hint_y=None,
-                        height=50,
-                        border_color=(1,0,0,1),  # red border
-                        background_color=get_color_from_hex("#CCCCCC"),
-                        color=(1,1,1,1)
-                    )
-
-                else:
-                    btn = Button(
-                        text=str(day),
-                        size_hint_y=None,
-                        height=50,
-                        background_color=get_color_from_hex("#E0F7FA"),
-                    color=(0, 0, 0, 1)
-                )
-                btn.bind(on_press=lambda inst, d=day: self.select_day(self.current_year, self.current_month, d))
-            grid.add_widget(btn)
+        self.day_cells = []
+        for _ in range(self.GRID_CELLS):
+            cell = Button(size_hint_y=None, height=50)
+            cell.day = 0
+            cell.bind(on_press=lambda inst: self.select_day(self.current_year, self.current_month, inst.day))
+            cell.bind(pos=self.place_today_border, size=self.place_today_border)
+            grid.add_widget(cell)
+            self.day_cells.append(cell)
+        # a single red border follows today's cell instead of one per cell
+        with grid.canvas.after:
+            self.today_border_color = Color(1, 0, 0, 0)
+            self.today_border = Line(width=2)
+        self.today_cell = None
         self.layout.add_widget(grid)
 
         # --- Back button ---
@@ -169,23 +124,90 @@ class EthiopianCalendarScreen(Screen):
         back_btn.bind(on_press=lambda _: setattr(self.manager, 'current', 'dashboard'))
         self.layout.add_widget(back_btn)
 
+    def display_calendar(self):
+        """Point the existing cells at the current month."""
+        self.title_label.text = f"{self.get_month_name(self.current_month)} {self.current_year}"
+
+        # Determine weekday of the first day in this Ethiopian month (Sunday=0)
+        weekday_start = calendar.first_weekday(self.current_year, self.current_month)
+        # Fill the calendar (Pagumen has 5 or 6 days)
+        num_days = calendar.month_length(self.current_year, self.current_month)
+        et_day = calendar_core.today()
+        status = self.month_status()
+        self.today_cell = None
+
+        for i, cell in enumerate(self.day_cells):
+            day = i - weekday_start + 1
+            if not 1 <= day <= num_days:
+                cell.day = 0
+                self.set_cell_text(cell, "")
+                self.style_cell(cell, EMPTY_CELL)
+                continue
+            cell.day = day
+            self.set_cell_text(cell, str(day))
+            is_today = (self.current_year, self.current_month, day) == et_day
+            if is_today:
+                self.today_cell = cell
+            # Only blur future days if it's the current month/year
+            if (self.current_year, self.current_month, day) > et_day:
+                self.style_cell(cell, FUTURE_DAY)
+            elif status and status.recorded.get(day):
+                recorded = status.recorded[day]
+                self.style_cell(cell, COMPLETE_DAY if recorded >= status.assigned else PARTIAL_DAY)
+            elif is_today:
+                # Highlight current day
+                self.style_cell(cell, TODAY)
+            else:
+                self.style_cell(cell, NORMAL_DAY)
+        self.place_today_border()
+
+    def month_status(self):
+        """Attendance completion for the shown month, one cached query per month."""
+        if self.teacher_id is None:
+            return None
+        status = month_status(Session, self.teacher_id, self.current_year, self.current_month)
+        return status if status.assigned else None
+
+    def on_teacher_id(self, instance, value):
+        if hasattr(self, 'day_cells'):
+            self.display_calendar()
+
+    def on_pre_enter(self, *args):
+        # attendance may have been written since the month was last shown
+        self.display_calendar()
+
+    def place_today_border(self, *args):
+        cell = self.today_cell
+        if cell is None:
+            self.today_border_color.a = 0
+            return
+        self.today_border_color.a = 1
+        self.today_border.rectangle = (cell.x, cell.y, cell.width, cell.height)
+
+    def set_cell_text(self, cell, text):
+        # unchanged text would still re-render the label texture
+        if cell.text != text:
+            cell.text = text
+
+    def style_cell(self, cell, style):
+        for name, value in style.items():
+            if getattr(cell, name) != value:
+                setattr(cell, name, value)
 
     def  is_today(self,day):
-        return day == self.current_day and self.current_month == EthiopianDateConverter.to_ethiopian(datetime.now().year, datetime.now().month, datetime.now().day).month and self.current_year == EthiopianDateConverter.to_ethiopian(datetime.now().year, datetime.now().month, datetime.now().day).year
+        return (self.current_year, self.current_month, day) == calendar_core.today()
     def select_day(self, year, month, day):
-        print(f"Selected Ethiopian date: {year}/{month}/{day}")
+        if self.teacher_id is None or self.manager is None:
+            return
+        self.manager.get_screen('attendance').open_day(
+            self.teacher_id, calendar.to_gregorian(year, month, day))
+        self.manager.current = 'attendance'
 
     def get_month_name(self, month):
-        names = [
-            "መስከረም", "ጥቅምት", "ኅዳር", "ታህሳስ", "ጥር",
-            "የካቲት", "መጋቢት", "ሚያዝያ", "ግንቦት", "ሰኔ",
-            "ሐምሌ", "ነሐሴ", "ጳጉሜን"
-        ]
-        return names[month - 1]
+        return calendar_core.MONTH_NAMES[month - 1]
 
     def is_leap_year(self, eth_year):
-        # Ethiopian leap year rule: leap every 4 years (no century exception)
-        return eth_year % 4 == 3
+        return calendar_core.is_leap_year(eth_year)
 
     def change_month(self, direction):
         # direction = +1 (next), -1 (previous)
@@ -11,29 +11,110 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+import os
 import re
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
+from lxml import etree
 from pprint import pprint
 
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+CORRECTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corrections.json')
+# \1 or (?P=name) in a pattern, not counting an escaped backslash before it
+BACKREFERENCE = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?P=)')
+
+def _xml_text(paragraph):
+    """Text of a <w:p> element, same as python-docx's Paragraph.text for plain runs."""
+    return "".join(t.text or "" for t in paragraph.iter(W + "t"))
+
+
+class TextNormalizer:
+    """Typo corrections plus GRADE & SECTION extraction in one regex pass.
+
+    All correction rules and the heading pattern are compiled once into a
+    single alternation, so a paragraph is scanned once instead of once per
+    rule. Rules come from a JSON file (see corrections.json) so each school
+    can add its own fixes; hits per rule are counted in ``self.hits``.
+
+    Replacements have re.sub semantics, so \\1 refers to the rule's own first
+    group. Rules with named groups, or with backreferences inside the pattern
+    (which would point at another rule's group in the alternation), are
+    rejected when the rules are loaded.
+    """
+    GRADE_SECTION = r'GRADE & SECTION (?P<grade>\d+)\s*(?P<section>\w+)'
+
+    def __init__(self, rules):
+        self.rules = []
+        for rule in rules:
+            try:
+                pattern = re.compile(rule['pattern'])
+            except re.error as error:
+                raise ValueError(f"correction {rule['name']!r}: {error}") from error
+            if pattern.groupindex:
+                # they would clash with each other and with r<i>/heading in the alternation
+                raise ValueError(f"correction {rule['name']!r}: use numbered groups, not named ones")
+            if BACKREFERENCE.search(rule['pattern']):
+                raise ValueError(f"correction {rule['name']!r}: backreferences in patterns are not supported")
+            self.rules.append((rule['name'], pattern, rule['replacement']))
+        alternatives = [f'(?P<r{i}>{pattern.pattern})' for i, (_, pattern, _) in enumerate(self.rules)]
+        alternatives.append(f'(?P<heading>{self.GRADE_SECTION})')
+        self.regex = re.compile('|'.join(alternatives))
+        self.heading = re.compile(self.GRADE_SECTION)
+        self.hits = Counter()
+
+    @classmethod
+    def from_file(cls, path=CORRECTIONS_FILE):
+        with open(path, 'r') as f:
+            return cls(json.load(f)['corrections'])
+
+    def __call__(self, text):
+        matches = []
+        fixed = []
+
+        def replace(match):
+            name = match.lastgroup
+            if name == 'heading':
+                matches.append((match.group('grade'), match.group('section')))
+                return match.group(0)
+            rule_name, pattern, replacement = self.rules[int(name[1:])]
+            self.hits[rule_name] += 1
+            fixed.append(rule_name)
+            # the rule's groups are renumbered in the alternation, so expand
+            # against the rule's own match at the same place
+            return pattern.match(match.string, match.start()).expand(replacement)
+
+        text = self.regex.sub(replace, text)
+        if fixed and not matches and 'GRADE' in text:
+            # a correction may have completed a heading, e.g. "GRADE & SCETION"
+            matches = self.heading.findall(text)
+        return text, matches
+
+    def report(self):
+        for name, _, _ in self.rules:
+            print(f'{name}: {self.hits[name]}')
+
+
 class MarkListProcessor:
-    def __init__(self, file_path):
-        self.doc = Document(file_path)
+    def __init__(self, file_path, rules_path=CORRECTIONS_FILE):
+        self.file_path = file_path
+        self.normalizer = TextNormalizer.from_file(rules_path)
+        self._doc = None
         self.grade_section_list = []
         self.aranged_dictionary = {}
 
+    @property
+    def doc(self):
+        """The full python-docx Document, only parsed when the in-memory methods need it."""
+        if self._doc is None:
+            self._doc = Document(self.file_path)
+        return self._doc
+
     def fix_and_extract(self, text):
         """Fix common spelling mistakes and extract grade & section."""
-        corrections = {
-            r'\bYEER\b': 'YEAR',
-            r'\bSCETION\b': 'SECTION',
-            r'CHENCHA SECONDARY SCHOOL STUDENTS': 'CHENCHA SECONDARY & PERPARATORY SCHOOL STUDENTS'
-        }
-        for wrong, correct in corrections.items():
-            text = re.sub(wrong, correct, text)
-
-        pattern = r'GRADE & SECTION (\d+)\s*(\w+)'
-        matches = re.findall(pattern, text)
-        return text, matches
+        return self.normalizer(text)
 
     def extract_grade_sections(self):
         """Extract all grades and sections from the document paragraphs."""
@@ -64,19 +145,84 @@ class MarkListProcessor:
             key = str(i)
             if key in table_dict:
                 # Remove header row and incomplete rows
-                filtered_rows = [
-                    row for row in table_dict[key]
-                    if row[0] != 'No' and len(row) >= 2 and row[1].strip()
-                ]
+                filtered_rows = [row for row in table_dict[key] if self.keep_row(row)]
                 arranged_dict[grade_section] = filtered_rows
 
         self.aranged_dictionary = arranged_dict
         return self.aranged_dictionary
 
+    @staticmethod
+    def keep_row(row):
+        """Drop header rows and rows without a name."""
+        return row[0] != 'No' and len(row) >= 2 and bool(row[1].strip())
+
+    def iter_rows(self):
+        """Stream (grade, section, row) tuples without loading the whole document.
+
+        Walks word/document.xml in order with iterparse, pairing each
+        "GRADE & SECTION" heading paragraph with the table that follows it.
+        Parsed elements are freed as soon as they're consumed, so memory stays
+        flat however many sections the file has.
+        """
+        pending = deque()
+        with zipfile.ZipFile(self.file_path) as archive, archive.open("word/document.xml") as xml:
+            for _, element in etree.iterparse(xml, events=("end",), tag=(W + "p", W + "tbl")):
+                parent = element.getparent()
+                if parent is None or parent.tag != W + "body":
+                    # paragraphs inside table cells are read with their table
+                    continue
+
+                if element.tag == W + "p":
+                    _, matches = self.fix_and_extract(_xml_text(element))
+                    pending.extend(matches)
+                elif pending:
+                    grade, section = pending.popleft()
+                    for tr in element.iterchildren(W + "tr"):
+                        cells = [
+                            "\n".join(_xml_text(p) for p in tc.iter(W + "p")).strip()
+                            for tc in tr.iterchildren(W + "tc")
+                        ][:4]
+                        cells = [cell for cell in cells if cell]
+                        if cells and self.keep_row(cells):
+                            yield grade, section, cells
+
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+
     def pretty_print(self):
         pprint(self.aranged_dictionary)
 
 
+def _file_rows(file_path):
+    processor = MarkListProcessor(file_path)
+    rows = list(processor.iter_rows())
+    return rows, processor.normalizer.hits
+
+
+def iter_rows_from_files(file_paths, max_workers=None, hits=None):
+    """Stream (grade, section, row) from several docx files, parsed in a process pool.
+
+    Results come back in file order; each file's rows are yielded as soon as
+    that file is done. Correction hits from every file are added to the
+    ``hits`` Counter, if one is given.
+    """
+    file_paths = list(file_paths)
+    if len(file_paths) < 2:
+        for file_path in file_paths:
+            processor = MarkListProcessor(file_path)
+            yield from processor.iter_rows()
+            if hits is not None:
+                hits.update(processor.normalizer.hits)
+        return
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows, file_hits in pool.map(_file_rows, file_paths):
+            if hits is not None:
+                hits.update(file_hits)
+            yield from rows
+
+
 # =========================
 # Example usage
 # =========================
@@ -84,3 +230,4 @@ if __name__ == "__main__":
     processor = MarkListProcessor("9th mark.docx")
     processor.arrange_by_grade_section()
     processor.pretty_print()
+    processor.normalizer.report()
@@ -12,46 +12,111 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from models import db, Student, GradeSection
+import sys
+import time
+
+from sqlalchemy import insert
+
+from db.base import Session, init_db
+from db.models import Student, GradeSection
+from db.roster import roster_cache
 from extract_students import MarkListProcessor
-from peewee import IntegrityError
-
-def import_students(file_path):
-    processor = MarkListProcessor(file_path)
-    processor.arrange_by_grade_section()
-    data = processor.aranged_dictionary
-
-    for grade_section, students in data.items():
-        grade, section = grade_section.split()
-        # Ensure GradeSection exists
-        grade_section_obj, created = GradeSection.get_or_create(grade=grade, section=section)
-        if created:
-            print(f'Created new GradeSection: {grade} {section}')
-
-        for student in students:
-            if len(student) < 3:
-                print(f'Skipping incomplete student data: {student}')
+
+CHUNK_SIZE = 500
+
+
+def parse_student(grade, row):
+    """Turn a mark list row [No, Name, Sex, Age?] into Student column values, or None if unusable."""
+    if len(row) < 3:
+        return None
+    names = row[1].split()
+    if len(names) < 2:
+        return None
+    first_name, father_name = names[0], names[1]
+    grandfather_name = names[2] if len(names) >= 3 else ''
+    try:
+        age = int(row[3]) if len(row) > 3 else int(grade) + 6
+    except ValueError:
+        age = int(grade) + 6
+    return {
+        "first_name": first_name,
+        "father_name": father_name,
+        "grandfather_name": grandfather_name,
+        "sex": row[2],
+        "age": age,
+    }
+
+
+def import_students(file_path, session=None, chunk_size=CHUNK_SIZE):
+    """Import every student in a mark list docx in one transaction.
+
+    Existing sections and student keys are loaded up front, duplicates are
+    dropped in Python and new students go in with chunked executemany
+    inserts. Returns a summary dict of counts, correction hits per rule under
+    "corrections" and elapsed seconds.
+    """
+    session = session or Session()
+    started = time.perf_counter()
+    report = {"inserted": 0, "skipped": 0, "invalid": 0, "sections_created": 0}
+
+    sections = {(gs.grade, gs.section): gs.id for gs in session.query(GradeSection)}
+    seen = set(session.query(Student.first_name, Student.father_name,
+                             Student.grandfather_name, Student.section_id))
+    pending = []
+    touched_sections = set()
+
+    def flush():
+        if pending:
+            session.execute(insert(Student), pending)
+            report["inserted"] += len(pending)
+            pending.clear()
+
+    try:
+        processor = MarkListProcessor(file_path)
+        for grade, section, row in processor.iter_rows():
+            values = parse_student(grade, row)
+            if values is None:
+                print(f'Skipping incomplete student data: {row}')
+                report["invalid"] += 1
+                continue
+
+            section_id = sections.get((grade, section))
+            if section_id is None:
+                grade_section = GradeSection(grade=grade, section=section)
+                session.add(grade_section)
+                session.flush()
+                section_id = sections[(grade, section)] = grade_section.id
+                report["sections_created"] += 1
+                print(f'Created new GradeSection: {grade} {section}')
+
+            key = (values["first_name"], values["father_name"], values["grandfather_name"], section_id)
+            if key in seen:
+                report["skipped"] += 1
                 continue
-            
-            first_name,father_name,grand_father_name=student[1].split() if len(student[1].split())==3 else (student[1].split()[0],student[1].split()[1],'')
-            student = Student(
-                first_name=first_name,
-                father_name=father_name,   
-                grandfather_name=grand_father_name,
-                section_id=grade_section_obj,
-                sex=student[2],
-                age=student[3] if len(student) > 4 else int(grade) + 6
-            )
-            try : 
-                student.save()
-            except IntegrityError:
-                print(f'student : {student} already exists. in grade {student.section}')
-                
-
-            print(f'Imported {len(students)} students into {grade} {section}')
+            seen.add(key)
+            values["section_id"] = section_id
+            touched_sections.add(section_id)
+            pending.append(values)
+            if len(pending) >= chunk_size:
+                flush()
+        flush()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    # Core inserts skip the ORM events that keep rosters fresh
+    roster_cache.forget(*touched_sections)
+
+    report["corrections"] = dict(processor.normalizer.hits)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
 
 if __name__ == '__main__':
-    if not db.is_closed():
-        db.close()
-    import_students('grade 12 Mark List.docx')
-    db.close()
\ No newline at end of file
+    init_db()
+    report = import_students(sys.argv[1] if len(sys.argv) > 1 else 'grade 12 Mark List.docx')
+    print(f"inserted {report['inserted']}, skipped {report['skipped']} existing, "
+          f"{report['invalid']} invalid, {report['sections_created']} new sections "
+          f"in {report['seconds']:.2f}s")
+    for name, count in report["corrections"].items():
+        print(f"corrected {name}: {count}")
@@ -1,14 +1,19 @@
+import importlib
+import threading
+
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.core.text import LabelBase
 from kivy.uix.popup import Popup
+from kivy.properties import BooleanProperty
 
-from eth_custom_calendar.ethiopia_custom_calender import EthiopianCalendarScreen
 Window.clearcolor = (0.95, 0.95, 0.95, 1)
-from admin.superadmin.admin import SuperAdminScreen ,  authenticate_admin 
-from db import models
-from admin.school_admin import SchoolAdminTeacherCRUDScreen 
+# the other screens, the database layer and the auth service are imported on
+# first use, so the login screen is drawn before any of them load
+
+
 class ErrorPopup(Popup):
 	
     def on_ok(self):
@@ -23,26 +28,39 @@ class ErrorPopup(Popup):
 
 # -------- LOGIN SCREEN --------
 class LoginScreen(Screen):
+    busy = BooleanProperty(False)
+
     def login(self):
+        # the login button stays disabled until the auth service is up
+        if self.busy or not App.get_running_app().services_ready:
+            return
         username = self.username_input.text.strip()
         password = self.password_input.text.strip()
-        admin_result = authenticate_admin(username, password)
         if not username and not password:
             ErrorPopup().show_message(message='empty user name and password ')
             return
-        if admin_result is not None:
-            print(f"Admin {admin_result['admin_name']} successful logged in")
+        # hashing runs in the auth worker, the spinner shows until on_login_result
+        self.busy = True
+        App.get_running_app().auth.login(username, password, self.on_login_result)
+
+    def on_login_result(self, kind, user):
+        # loaded by the auth service already, the import is only a lookup
+        from db.teacher_context import current_teacher
+        self.busy = False
+        if kind == "super_admin":
+            current_teacher.clear()
+            print(f"Admin {user['admin_name']} successful logged in")
             self.clear_userdata()
 
             self.manager.current = "super_admin"
             return
-        
-            
 
-        teacher = models.Teacher.authenticate(models.session, username, password)
+        teacher = user
+        current_teacher.set(teacher)
         if teacher is not None and teacher.role == 'teacher':
             print(f"Login successful for {teacher.full_name}")
             self.clear_userdata()
+            self.manager.get_screen("calendar").teacher_id = teacher.id
             self.manager.current = "dashboard"
             return
         elif teacher is not None and teacher.role == 'admin':
@@ -72,18 +90,105 @@ class DashboardScreen(Screen):
 
 
 
+# -------- SCREEN MANAGER --------
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that builds a registered screen the first time it is used.
+
+    A factory is a screen class or a "module:Class" string; the module is
+    imported only when the screen is first shown or fetched with get_screen.
+
+    usage :
+        sm = LazyScreenManager()
+        sm.register("calendar", "eth_custom_calendar.ethiopia_custom_calender:EthiopianCalendarScreen")
+        sm.current = "calendar"     # imports the module and builds the screen now
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.factories = {}
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def has_screen(self, name):
+        return name in self.factories or super().has_screen(name)
+
+    def get_screen(self, name):
+        factory = self.factories.get(name)
+        if factory is not None:
+            if isinstance(factory, str):
+                module, _, class_name = factory.partition(":")
+                factory = getattr(importlib.import_module(module), class_name)
+            self.add_widget(factory(name=name))
+            del self.factories[name]
+        return super().get_screen(name)
+
+
 # -------- MAIN APP --------
 class SmisApp(App):
+    _auth = None
+    _services = None
+    services_ready = BooleanProperty(False)
+
     def build(self):
         LabelBase.register(name="AmharicFont", fn_regular="AbyssinicaSIL-2.300/AbyssinicaSIL-2.300/AbyssinicaSIL-Regular.ttf")
-        sm = ScreenManager()
+        sm = LazyScreenManager()
         sm.add_widget(LoginScreen(name="login"))
-        sm.add_widget(DashboardScreen(name="dashboard"))
-        sm.add_widget(EthiopianCalendarScreen(name="calendar"))
-        sm.add_widget(SuperAdminScreen(name="super_admin"))
-        sm.add_widget(SchoolAdminTeacherCRUDScreen(name="school_admin_teacher_crud"))
+        sm.register("dashboard", DashboardScreen)
+        sm.register("calendar", "eth_custom_calendar.ethiopia_custom_calender:EthiopianCalendarScreen")
+        sm.register("attendance", "attendance.attendance_screen:AttendanceScreen")
+        sm.register("super_admin", "admin.superadmin.admin:SuperAdminScreen")
+        sm.register("school_admin_teacher_crud", "admin.school_admin:SchoolAdminTeacherCRUDScreen")
+        sm.register("assignment_matrix", "admin.assignment_matrix:AssignmentMatrixScreen")
         return sm
 
+    def on_start(self):
+        Window.bind(on_flip=self.on_first_frame)
+
+    def on_first_frame(self, *args):
+        # the login screen is up; start the rest while the user types
+        Window.unbind(on_flip=self.on_first_frame)
+        Clock.schedule_once(self.start_services)
+
+    def start_services(self, *args):
+        """Open the database and start the auth worker, once, off the UI thread.
+
+        Importing the database layer and the auth service and running init_db
+        take about half a second, so a thread does all three and the login
+        screen stays responsive; services_ready turns True, enabling login,
+        once they are done.
+        """
+        if self._services is None:
+            self._services = threading.Thread(target=self._start_services, name="services", daemon=True)
+            self._services.start()
+
+    def _start_services(self):
+        auth = error = None
+        try:
+            from auth.service import AuthService
+            from db.base import init_db
+            init_db()
+            auth = AuthService()
+        except Exception as e:
+            error = e
+        Clock.schedule_once(lambda dt: self.on_services_started(auth, error))
+
+    def on_services_started(self, auth, error):
+        if error is not None:
+            ErrorPopup().show_message(message=f"Could not open the database: {error}")
+            return
+        self._auth = auth
+        self.services_ready = True
+
+    @property
+    def auth(self):
+        """The AuthService; None until services_ready."""
+        return self._auth
+
+    def on_stop(self):
+        if self._auth is not None:
+            self._auth.shutdown()
+
 
 if __name__ == "__main__":
     SmisApp().run()
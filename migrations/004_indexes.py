@@ -0,0 +1,36 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Create the roster / attendance / directory indexes on an existing database.
+
+usage :
+    python -m migrations.004_indexes [database path]
+"""
+
+import sys
+
+from db.base import DATABASE_PATH, make_engine
+from db.models import Attendance, Student, Teacher, TeachingAssignment
+
+
+def run(engine):
+    for model in (Student, Teacher, Attendance, TeachingAssignment):
+        for index in model.__table__.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+if __name__ == "__main__":
+    run(make_engine(sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH))
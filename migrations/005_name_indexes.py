@@ -0,0 +1,41 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rebuild the directory name indexes with NOCASE father and first names.
+
+004_indexes created them case-sensitive, which the case-insensitive prefix
+filter and page order in db/directory.py cannot use.
+
+usage :
+    python -m migrations.005_name_indexes [database path]
+"""
+
+import sys
+
+from db.base import DATABASE_PATH, make_engine
+from db.models import Student, Teacher
+
+
+def run(engine):
+    with engine.begin() as connection:
+        for model in (Student, Teacher):
+            for index in model.__table__.indexes:
+                if index.name in ("ix_student_name", "ix_teacher_name"):
+                    connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+                    index.create(connection)
+        connection.exec_driver_sql("ANALYZE")
+
+
+if __name__ == "__main__":
+    run(make_engine(sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH))
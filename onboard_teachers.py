@@ -0,0 +1,214 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk teacher onboarding from a CSV or XLSX spreadsheet.
+
+Every row is read and validated in one pass (names present, sex, role,
+duplicates within the sheet or already in the database). Initial passwords,
+generated where the sheet leaves them blank, are hashed across a process
+pool; usernames come from one Teacher.allocate_codes call per role, and all
+teachers are inserted in a single transaction, so a failing import changes
+nothing. A credentials slip (.docx to print, or .csv) lists each new
+username with its initial password; it is written readable by its owner only.
+
+Header names are matched ignoring case, spaces and underscores:
+    first_name, father_name (required), grandfather_name, sex, role, password
+
+usage :
+    python onboard_teachers.py <staff.csv|staff.xlsx> [slip path] [database path]
+"""
+
+import csv
+import datetime
+import os
+import secrets
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from auth.service import hash_passwords
+from db.base import Session, init_db
+from db.models import SexEnum, Teacher
+
+try:
+    import openpyxl
+except ImportError:  # CSV only
+    openpyxl = None
+
+COLUMNS = ("first_name", "father_name", "grandfather_name", "sex", "role", "password")
+ROLES = ("teacher", "admin")
+SEX_VALUES = {"m": SexEnum.MALE.value, "f": SexEnum.FEMALE.value,
+              **{sex.value.lower(): sex.value for sex in SexEnum}}
+# no 0/O or 1/l/I, the slip is read off paper
+PASSWORD_ALPHABET = "abcdefghjkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+PASSWORD_LENGTH = 10
+
+
+def _column(header):
+    return "".join(ch for ch in str(header or "").lower() if ch.isalnum())
+
+
+_COLUMN_KEYS = {_column(name): name for name in COLUMNS}
+
+
+def read_rows(path):
+    """Yield (spreadsheet row number, {column: text}) for every non-empty row."""
+    if path.lower().endswith(".xlsx"):
+        if openpyxl is None:
+            raise RuntimeError("reading .xlsx needs openpyxl; save the sheet as CSV instead")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            yield from _records(rows)
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from _records(csv.reader(f))
+
+
+def _records(rows):
+    header = [_COLUMN_KEYS.get(_column(cell)) for cell in next(rows, ())]
+    for number, row in enumerate(rows, 2):
+        values = {key: str(cell).strip() for key, cell in zip(header, row)
+                  if key and cell is not None}
+        if any(values.values()):
+            yield number, values
+
+
+def validate(records, existing):
+    """Split records into (teacher values, [(row number, reason)]) in one pass.
+
+    ``existing`` is the set of (first, father, grandfather) names already in
+    the database; it grows as rows are accepted, so repeats in the sheet fail.
+    """
+    teachers, invalid = [], []
+    for number, values in records:
+        first_name, father_name = values.get("first_name", ""), values.get("father_name", "")
+        grandfather_name = values.get("grandfather_name", "")
+        sex = values.get("sex", "")
+        role = values.get("role", "").lower() or "teacher"
+        if not first_name or not father_name:
+            invalid.append((number, "first and father name are required"))
+        elif sex and sex.lower() not in SEX_VALUES:
+            invalid.append((number, f"unknown sex {sex!r}"))
+        elif role not in ROLES:
+            invalid.append((number, f"role must be one of {', '.join(ROLES)}"))
+        elif (first_name, father_name, grandfather_name) in existing:
+            invalid.append((number, "a teacher with the same name already exists"))
+        else:
+            existing.add((first_name, father_name, grandfather_name))
+            teachers.append({
+                "first_name": first_name, "father_name": father_name,
+                "grandfather_name": grandfather_name, "sex": SEX_VALUES.get(sex.lower()),
+                "role": role,
+                "password": values.get("password") or "".join(
+                    secrets.choice(PASSWORD_ALPHABET) for _ in range(PASSWORD_LENGTH)),
+            })
+    return teachers, invalid
+
+
+def write_slip(path, teachers):
+    """Credentials slip as .docx (printable) or .csv, written atomically and owner-only."""
+    rows = [{"name": " ".join(n for n in (t["first_name"], t["father_name"], t["grandfather_name"]) if n),
+             "role": t["role"], "username": t["username"], "password": t["password"]}
+            for t in teachers]
+    if path.lower().endswith(".docx"):
+        from reports.docx_template import DocxTemplate
+        from reports.templates import credentials_slip
+        # DocxTemplate.save goes through mkstemp, which creates the file 0600
+        DocxTemplate(credentials_slip()).save(path, {"created": datetime.date.today().isoformat()}, rows)
+        return
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=["name", "role", "username", "password"])
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def onboard_teachers(file_path, slip_path=None, session=None, workers=None):
+    """Create every valid teacher in the spreadsheet in one transaction.
+
+    Returns a summary dict: inserted, invalid (a list of (row number, reason)),
+    slip path and per-stage seconds under "timings".
+    """
+    session = session or Session()
+    started = time.perf_counter()
+    timings = {}
+
+    def lap(stage):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = now - started
+        started = now
+
+    records = list(read_rows(file_path))
+    lap("read")
+    existing = {(first, father, grandfather or "") for first, father, grandfather in
+                session.query(Teacher.first_name, Teacher.father_name, Teacher.grandfather_name)}
+    teachers, invalid = validate(records, existing)
+    lap("validate")
+    # hash before allocating usernames: the allocation holds SQLite's write lock until commit
+    hashes = hash_passwords([t["password"] for t in teachers], max_workers=workers)
+    for values, password_hash in zip(teachers, hashes):
+        values["password_hash"] = password_hash
+    lap("hash")
+
+    slip_path = slip_path or f"credentials-{datetime.date.today().isoformat()}.docx"
+    slip_written = False
+    try:
+        for role in ROLES:
+            group = [t for t in teachers if t["role"] == role]
+            if group:
+                for values, username in zip(group, Teacher.allocate_codes(session, role, len(group))):
+                    values["username"] = username
+        lap("allocate")
+        if teachers:
+            session.execute(insert(Teacher), [{key: values[key] for key in (
+                "first_name", "father_name", "grandfather_name", "sex", "role", "username",
+                "password_hash")} for values in teachers])
+            lap("insert")
+            # only the hashes are stored: without the slip the passwords are lost,
+            # so it is written before the commit and removed if the commit fails
+            write_slip(slip_path, teachers)
+            slip_written = True
+            lap("slip")
+        session.commit()
+    except Exception:
+        session.rollback()
+        if slip_written:
+            os.remove(slip_path)
+        raise
+    lap("commit")
+    return {"inserted": len(teachers), "invalid": invalid,
+            "slip": slip_path if teachers else None, "timings": timings}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    init_db(*sys.argv[3:4])
+    report = onboard_teachers(sys.argv[1], *sys.argv[2:3])
+    for number, reason in report["invalid"]:
+        print(f"row {number}: {reason}")
+    print(f"inserted {report['inserted']}, {len(report['invalid'])} invalid"
+          + (f", credentials slip {report['slip']}" if report["slip"] else ""))
+    print("  ".join(f"{stage} {seconds:.2f}s" for stage, seconds in report["timings"].items()))
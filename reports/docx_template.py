@@ -0,0 +1,136 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fill .docx templates with {{field}} placeholders, parsed once and rendered many times.
+
+The template's word/document.xml is parsed with lxml once and compiled into
+literal strings around the placeholders; every other part of the package
+(styles, fonts, images) is compressed once. Rendering a document is then
+string joins plus compressing its own document.xml, no XML parsing.
+
+A table row containing {{row.field}} placeholders is repeated once per item
+of ``rows``. A placeholder typed across several runs (Word splits text when
+formatting changes mid-word) is joined into the paragraph's first run.
+
+usage :
+    template = DocxTemplate("card.docx")          # path or bytes
+    template.save("out/42.docx", {"name": "Abebe"}, rows=[{"subject": "Maths"}])
+"""
+
+import io
+import os
+import re
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCUMENT_PART = "word/document.xml"
+PLACEHOLDER = re.compile(r"\{\{\s*(row\.)?(\w+)\s*\}\}")
+_REPEAT_MARK = re.compile(r"<!--repeat (\d+)-->")
+
+
+def _compile(xml):
+    """Split xml into (literals, fields): literals[i] comes before fields[i]."""
+    literals, fields, position = [], [], 0
+    for match in PLACEHOLDER.finditer(xml):
+        literals.append(xml[position:match.start()])
+        fields.append(match.group(2))
+        position = match.end()
+    literals.append(xml[position:])
+    return literals, fields
+
+
+def _fill(compiled, values):
+    literals, fields = compiled
+    parts = [literals[0]]
+    for field, literal in zip(fields, literals[1:]):
+        value = values.get(field)
+        parts.append("" if value is None else escape(str(value)))
+        parts.append(literal)
+    return "".join(parts)
+
+
+def _join_split_placeholders(document):
+    for paragraph in document.iter(W + "p"):
+        texts = list(paragraph.iter(W + "t"))
+        joined = "".join(t.text or "" for t in texts)
+        if "{{" not in joined:
+            continue
+        whole = len(PLACEHOLDER.findall(joined))
+        if whole != sum(len(PLACEHOLDER.findall(t.text or "")) for t in texts):
+            texts[0].text = joined
+            for t in texts[1:]:
+                t.text = ""
+
+
+class DocxTemplate:
+    """A parsed .docx template; save() writes one filled-in copy."""
+
+    def __init__(self, source):
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        # every other part is compressed once into a base package that each
+        # document copies and appends its own document.xml to
+        base = io.BytesIO()
+        with zipfile.ZipFile(source) as package, zipfile.ZipFile(base, "w") as out:
+            for info in package.infolist():
+                if info.filename != DOCUMENT_PART:
+                    out.writestr(info, package.read(info), zipfile.ZIP_DEFLATED)
+            document = etree.fromstring(package.read(DOCUMENT_PART))
+        self.base = base.getvalue()
+        _join_split_placeholders(document)
+
+        # swap each repeating row for a marker comment, compiled separately
+        self.rows = []
+        for row in list(document.iter(W + "tr")):
+            if any("{{row." in (t.text or "").replace(" ", "") for t in row.iter(W + "t")):
+                marker = etree.Comment(f"repeat {len(self.rows)}")
+                row.addprevious(marker)
+                row.getparent().remove(row)
+                self.rows.append(_compile(etree.tostring(row, encoding="unicode")))
+        xml = etree.tostring(document, encoding="unicode")
+
+        # body alternates compiled text and repeating row indexes
+        pieces = _REPEAT_MARK.split(xml)
+        self.body = [int(piece) if i % 2 else _compile(piece) for i, piece in enumerate(pieces)]
+
+    def render(self, values, rows=()):
+        """document.xml bytes with values filled in and repeating rows expanded."""
+        out = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n']
+        for piece in self.body:
+            if isinstance(piece, int):
+                out.extend(_fill(self.rows[piece], row) for row in rows)
+            else:
+                out.append(_fill(piece, values))
+        return "".join(out).encode("utf-8")
+
+    def save(self, path, values, rows=()):
+        """Write the rendered .docx to path atomically; returns its size in bytes."""
+        package = io.BytesIO(self.base)
+        with zipfile.ZipFile(package, "a", zipfile.ZIP_DEFLATED) as out:
+            out.writestr(DOCUMENT_PART, self.render(values, rows))
+        data = package.getvalue()
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # readers see either the previous file or the complete new one
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return len(data)
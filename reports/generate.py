@@ -0,0 +1,282 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""End-of-term report cards and monthly attendance sheets as .docx (or PDF).
+
+The main process reads one section at a time out of SQLite into plain dicts
+and hands it to a process pool; each worker parses the template once (the
+bytes arrive through the pool initializer) and writes every document
+atomically, so an interrupted run never leaves a half-written file. At most
+two sections per worker are in flight, so memory stays flat however large
+the school is. Report cards read the materialized ranks, so run
+``python -m db.ranking`` for the term first.
+
+PDF output converts each section's documents with one LibreOffice
+(soffice) call and needs it installed.
+
+usage :
+    python -m reports.generate cards <year> <term> [out dir] [database path] [--pdf]
+    python -m reports.generate sheets <year> <month> [out dir] [database path] [--pdf]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import func, select, text
+
+from db.analytics import ABSENT_DAY_SHARE
+from db.models import AttendanceStatusEnum, GradeSection, Student, TermResult
+from db.ranking import section_ranking, subject_results
+from db.rollups import TERMS
+from eth_custom_calendar.calendar_core import MONTH_NAMES, calendar
+from .docx_template import DocxTemplate
+from .templates import DEFAULT_TEMPLATES
+
+# printed in the attendance sheet's day columns
+STATUS_LETTERS = {
+    AttendanceStatusEnum.PRESENT.value: "P",
+    AttendanceStatusEnum.ABSENT.value: "A",
+    AttendanceStatusEnum.LATE.value: "L",
+    AttendanceStatusEnum.HAS_PERMISSION.value: "E",
+}
+
+# day of the Ethiopian month: its months are runs of consecutive days from :start
+SECTION_MONTH_MARKS_SQL = (
+    "SELECT a.student_id, CAST(julianday(a.date) - julianday(:start) AS INTEGER) + 1, a.status "
+    "FROM student AS s JOIN attendance AS a ON a.student_id = s.id "
+    "WHERE s.section_id = :section_id AND a.date BETWEEN :start AND :end"
+)
+
+# days a student counts as absent by _day_letter's rule, for a whole term
+SECTION_ABSENT_DAYS_SQL = (
+    "SELECT student_id, COUNT(*) FROM ("
+    "SELECT a.student_id, SUM(a.status = :absent) AS absent, COUNT(*) AS marks "
+    "FROM student AS s JOIN attendance AS a ON a.student_id = s.id "
+    "WHERE s.section_id = :section_id AND a.date BETWEEN :start AND :end "
+    "GROUP BY a.student_id, a.date) "
+    "WHERE absent >= :share * marks GROUP BY student_id"
+)
+
+# batches yield (section label, [(file name, values, rows), ...])
+Throughput = namedtuple("Throughput", "documents bytes seconds")
+
+
+def _full_name(student):
+    return " ".join(name for name in (student.first_name, student.father_name,
+                                      student.grandfather_name) if name)
+
+
+def _sections(session):
+    return session.execute(
+        select(GradeSection.id, GradeSection.grade, GradeSection.section)
+        .order_by(GradeSection.grade, GradeSection.section)
+    ).all()
+
+
+def report_card_batches(session, year, term):
+    """Yield (section label, documents) for every ranked section, one section at a time."""
+    grade_sizes = dict(session.execute(
+        select(TermResult.grade, func.count())
+        .where(TermResult.year == year, TermResult.term == term)
+        .group_by(TermResult.grade)
+    ).all())
+    first_month, last_month = TERMS[term]
+    term_days = {"start": calendar.to_gregorian(year, first_month, 1).isoformat(),
+                 "end": calendar.to_gregorian(year, last_month,
+                                              calendar.month_length(year, last_month)).isoformat()}
+    for section_id, grade, section in _sections(session):
+        results = section_ranking(session, section_id, year, term)
+        if not results:
+            continue
+        ids = [result.student_id for result in results]
+        subjects = subject_results(session, ids, year, term)
+        names = {student.id: _full_name(student) for student in
+                 session.scalars(select(Student).where(Student.id.in_(ids)))}
+        # days absent by the attendance sheet's rule, not one per teacher's mark
+        absent = dict(session.execute(text(SECTION_ABSENT_DAYS_SQL), dict(
+            term_days, section_id=section_id, absent=AttendanceStatusEnum.ABSENT.value,
+            share=ABSENT_DAY_SHARE)).all())
+        documents = []
+        for result in results:
+            values = {
+                "name": names.get(result.student_id, ""), "grade": grade, "section": section,
+                "year": year, "term": term, "total": f"{result.total:g}",
+                "average": f"{result.average:.1f}", "section_rank": result.section_rank,
+                "section_size": len(results), "grade_rank": result.grade_rank,
+                "grade_size": grade_sizes.get(grade, 0), "absent": absent.get(result.student_id, 0),
+            }
+            rows = [{"subject": subject, "total": f"{total:g}", "out_of": f"{out_of:g}",
+                     "percent": f"{100 * total / out_of:.0f}", "rank": rank}
+                    for subject, total, out_of, rank in subjects.get(result.student_id, ())]
+            documents.append((f"{result.student_id}.docx", values, rows))
+        # keep the identity map from growing section after section
+        session.expunge_all()
+        yield f"{grade}{section}", documents
+
+
+def _day_letter(statuses):
+    """One letter for a student's marks on a day (one mark per teacher).
+
+    SECTION_ABSENT_DAYS_SQL counts absent days by the same rule.
+    """
+    counts = Counter(statuses)
+    absent = counts.pop(AttendanceStatusEnum.ABSENT.value, 0)
+    if absent >= ABSENT_DAY_SHARE * len(statuses) or not counts:
+        return STATUS_LETTERS[AttendanceStatusEnum.ABSENT.value]
+    return STATUS_LETTERS.get(counts.most_common(1)[0][0], "?")
+
+
+def attendance_sheet_batches(session, year, month):
+    """Yield (section label, [one sheet]) for every section with students, one section at a time."""
+    days = calendar.month_length(year, month)
+    params = {"start": calendar.to_gregorian(year, month, 1).isoformat(),
+              "end": calendar.to_gregorian(year, month, days).isoformat()}
+    for section_id, grade, section in _sections(session):
+        students = session.execute(
+            select(Student.id, Student.first_name, Student.father_name, Student.grandfather_name)
+            .where(Student.section_id == section_id)
+            .order_by(Student.father_name, Student.first_name)
+        ).all()
+        if not students:
+            continue
+        marks = {}
+        for student_id, day, status in session.execute(
+                text(SECTION_MONTH_MARKS_SQL), dict(params, section_id=section_id)):
+            marks.setdefault((student_id, day), []).append(status)
+        rows = []
+        for number, student in enumerate(students, 1):
+            row = {"no": number, "name": _full_name(student), "absent": 0}
+            for day in range(1, days + 1):
+                statuses = marks.get((student.id, day))
+                if statuses:
+                    row[f"d{day}"] = letter = _day_letter(statuses)
+                    row["absent"] += letter == "A"
+            rows.append(row)
+        values = {"grade": grade, "section": section, "year": year,
+                  "month_name": MONTH_NAMES[month - 1]}
+        yield f"{grade}{section}", [(f"attendance-{year}-{month:02d}.docx", values, rows)]
+
+
+BATCHES = {"cards": report_card_batches, "sheets": attendance_sheet_batches}
+
+
+# ---- rendering (runs in the worker processes) ----
+
+_template = None
+
+
+def _load_template(template):
+    global _template
+    _template = DocxTemplate(template)
+
+
+def to_pdf(paths, directory):
+    """Convert .docx files to PDF in directory with one soffice call; returns bytes written."""
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        # a private profile, so parallel soffice processes don't share a lock
+        subprocess.run(["soffice", f"-env:UserInstallation=file://{scratch}/profile", "--headless",
+                        "--convert-to", "pdf", "--outdir", scratch, *paths],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        written = 0
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0] + ".pdf"
+            written += os.path.getsize(os.path.join(scratch, name))
+            os.replace(os.path.join(scratch, name), os.path.join(directory, name))
+    for path in paths:
+        os.remove(path)
+    return written
+
+
+def render_section(out_dir, label, documents, pdf=False):
+    """Write one section's documents under out_dir/label; returns (documents, bytes)."""
+    directory = os.path.join(out_dir, label)
+    os.makedirs(directory, exist_ok=True)
+    written, paths = 0, []
+    for name, values, rows in documents:
+        path = os.path.join(directory, name)
+        written += _template.save(path, values, rows)
+        paths.append(path)
+    if pdf:
+        written = to_pdf(paths, directory)
+    return len(documents), written
+
+
+# ---- pipeline ----
+
+def generate(batches, out_dir, template, workers=None, pdf=False, progress=None):
+    """Render every (label, documents) batch from template bytes; returns Throughput.
+
+    ``progress(label, documents)`` is called as each section finishes.
+    """
+    if pdf and shutil.which("soffice") is None:
+        raise RuntimeError("PDF output needs LibreOffice (soffice) on the PATH")
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    total_documents = total_bytes = 0
+
+    def finished(label, result):
+        nonlocal total_documents, total_bytes
+        documents, written = result
+        total_documents += documents
+        total_bytes += written
+        if progress:
+            progress(label, documents)
+
+    if workers == 1:
+        _load_template(template)
+        for label, documents in batches:
+            finished(label, render_section(out_dir, label, documents, pdf))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_load_template, initargs=(template,)) as pool:
+            pending = deque()
+            for label, documents in batches:
+                pending.append((label, pool.submit(render_section, out_dir, label, documents, pdf)))
+                # reading ahead of the workers only costs memory
+                while len(pending) >= 2 * workers:
+                    label, future = pending.popleft()
+                    finished(label, future.result())
+            for label, future in pending:
+                finished(label, future.result())
+    return Throughput(total_documents, total_bytes, time.perf_counter() - started)
+
+
+def template_bytes(kind, path=None):
+    """The template at path, or the built-in one for kind (a key of DEFAULT_TEMPLATES)."""
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    return DEFAULT_TEMPLATES[kind]()
+
+
+if __name__ == "__main__":
+    from db.base import DATABASE_PATH, Session, init_db
+
+    pdf = "--pdf" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--pdf"]
+    if len(args) < 3 or args[0] not in BATCHES:
+        sys.exit(__doc__)
+    kind, year, period = args[0], int(args[1]), int(args[2])
+    out_dir = args[3] if len(args) > 3 else os.path.join("reports_out", f"{kind}-{year}-{period}")
+    init_db(args[4] if len(args) > 4 else DATABASE_PATH)
+    os.makedirs(out_dir, exist_ok=True)
+    result = generate(BATCHES[kind](Session(), year, period), out_dir, template_bytes(kind),
+                      pdf=pdf, progress=lambda label, n: print(f"{label}: {n} documents"))
+    print(f"{result.documents} documents, {result.bytes / 1e6:.1f} MB in {result.seconds:.1f}s "
+          f"({result.documents / max(result.seconds, 1e-9):.0f}/s) -> {out_dir}")
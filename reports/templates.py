@@ -0,0 +1,114 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Default report card and attendance sheet templates, built with python-docx.
+
+A school can design its own in Word instead (letterhead, logo, layout) as
+long as it keeps the same placeholders; see DocxTemplate for the syntax.
+
+usage :
+    python -m reports.templates [directory]   # write both to edit as a starting point
+"""
+
+import io
+import os
+import sys
+
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from docx.shared import Cm, Pt
+
+from eth_custom_calendar.calendar_core import DAYS_PER_MONTH
+
+# names are in Ethiopic script; Word falls back to another font if it's missing
+FONT = "Abyssinica SIL"
+
+
+def _document(landscape=False, size=11):
+    document = Document()
+    normal = document.styles["Normal"]
+    normal.font.name = FONT
+    normal.font.size = Pt(size)
+    section = document.sections[0]
+    if landscape:
+        section.orientation = WD_ORIENT.LANDSCAPE
+        section.page_width, section.page_height = section.page_height, section.page_width
+    section.left_margin = section.right_margin = Cm(1.5)
+    return document
+
+
+def _table(document, header, row):
+    table = document.add_table(rows=2, cols=len(header))
+    table.style = "Table Grid"
+    for cell, text in zip(table.rows[0].cells, header):
+        cell.text = text
+    for cell, text in zip(table.rows[1].cells, row):
+        cell.text = text
+    return table
+
+
+def _to_bytes(document):
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def report_card():
+    document = _document()
+    document.add_heading("Student Report Card", level=1)
+    document.add_paragraph("Name: {{name}}")
+    document.add_paragraph("Grade {{grade}} Section {{section}}    Year {{year}} Term {{term}}")
+    _table(document, ["Subject", "Score", "Out of", "%", "Rank in section"],
+           ["{{row.subject}}", "{{row.total}}", "{{row.out_of}}", "{{row.percent}}", "{{row.rank}}"])
+    document.add_paragraph("")
+    document.add_paragraph("Total: {{total}}    Average: {{average}}")
+    document.add_paragraph("Rank in section: {{section_rank}} of {{section_size}}    "
+                           "Rank in grade: {{grade_rank}} of {{grade_size}}")
+    document.add_paragraph("Days absent: {{absent}}")
+    document.add_paragraph("")
+    document.add_paragraph("Homeroom teacher: ____________________    Director: ____________________")
+    return _to_bytes(document)
+
+
+def attendance_sheet():
+    document = _document(landscape=True, size=7)
+    document.add_heading("Attendance Sheet", level=1)
+    document.add_paragraph("Grade {{grade}} Section {{section}}    {{month_name}} {{year}}")
+    days = [str(day) for day in range(1, DAYS_PER_MONTH + 1)]
+    _table(document, ["No", "Name"] + days + ["Absent"],
+           ["{{row.no}}", "{{row.name}}"] + [f"{{{{row.d{day}}}}}" for day in days] + ["{{row.absent}}"])
+    document.add_paragraph("P present, A absent, L late, E excused (has permission)")
+    return _to_bytes(document)
+
+
+def credentials_slip():
+    document = _document()
+    document.add_heading("New Staff Accounts", level=1)
+    document.add_paragraph("Created {{created}}. Cut along the lines and hand each slip over in person; "
+                           "the password must be changed at first login.")
+    _table(document, ["Name", "Role", "Username", "Initial password"],
+           ["{{row.name}}", "{{row.role}}", "{{row.username}}", "{{row.password}}"])
+    return _to_bytes(document)
+
+
+DEFAULT_TEMPLATES = {"cards": report_card, "sheets": attendance_sheet, "slips": credentials_slip}
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    for kind, build in DEFAULT_TEMPLATES.items():
+        path = os.path.join(directory, f"{kind}.docx")
+        with open(path, "wb") as f:
+            f.write(build())
+        print(f"wrote {path}")
@@ -0,0 +1,38 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from db import rollups, search
+from db.base import make_engine
+from db.models import Base
+
+
+@pytest.fixture
+def engine():
+    """An in-memory database with the full schema, FTS tables and rollup triggers."""
+    engine = make_engine(":memory:")
+    Base.metadata.create_all(engine)
+    search.install(engine)
+    rollups.install(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
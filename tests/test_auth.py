@@ -0,0 +1,63 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk hashing follows the configured profile, and login needs no Kivy widgets."""
+
+import functools
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+
+from auth import policy, service
+from auth.admins import AdminCredentialStore
+
+
+@pytest.fixture
+def lab_profile():
+    active = policy.profile
+    policy.configure("lab")
+    yield
+    policy.configure(active)
+
+
+def test_pool_workers_hash_with_the_configured_profile(lab_profile, monkeypatch):
+    # spawned workers start from the environment's profile, as they do on Windows
+    monkeypatch.setattr(service, "ProcessPoolExecutor", functools.partial(
+        service.ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")))
+    hashes = service.hash_passwords([f"secret{n}" for n in range(service.MIN_PARALLEL_BATCH)], max_workers=2)
+    rounds = policy.PROFILES["lab"]
+    assert all(h.startswith(f"$pbkdf2-sha256${rounds}$") for h in hashes)
+    assert all(policy.verify(f"secret{n}", h) for n, h in enumerate(hashes))
+
+
+def test_importing_auth_service_leaves_kivy_widgets_alone():
+    code = ("import sys, auth.service; "
+            "print(sorted(m for m in sys.modules if m.startswith(('kivy.core.window', 'kivy.uix'))))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env=dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1"))
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+@pytest.mark.parametrize("username, password", [("root", ""), ("root", None), ("", "secret"), (None, "secret")])
+def test_empty_admin_credentials_fail_like_wrong_ones(lab_profile, tmp_path, username, password):
+    path = tmp_path / "admin.json"
+    path.write_text(json.dumps({"admin_name": "root", "admin_password": policy.hash_password("secret"),
+                                "admin_role": "super_admin"}))
+    store = AdminCredentialStore(str(path))
+    assert store.authenticate("root", "secret") is not None
+    assert store.authenticate(username, password) is None
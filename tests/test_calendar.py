@@ -0,0 +1,85 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Ethiopian <-> Gregorian conversion for E.C. 1900-2100, checked day by day against ethiopian_date."""
+
+import datetime
+
+import pytest
+from ethiopian_date import EthiopianDateConverter
+
+from eth_custom_calendar.calendar_core import (
+    MONTHS_PER_YEAR, calendar, library_is_wrong, verify_against_ethiopian_date,
+)
+
+# ethiopian_date moves the new-year offset at the Ethiopian century instead of
+# at the Gregorian non-leap centuries 1900 and 2100, so these come out a day off
+CENTURY_SHIFT = "ethiopian_date shifts at the E.C. century, not at the Gregorian non-leap century"
+LIBRARY_WRONG_YEARS = {1900: CENTURY_SHIFT, **{year: CENTURY_SHIFT for year in range(2093, 2101)}}
+
+
+def days(year):
+    for month in range(1, MONTHS_PER_YEAR + 1):
+        for day in range(1, calendar.month_length(year, month) + 1):
+            yield month, day
+
+
+def library_mismatches(year):
+    mismatches = []
+    for month, day in days(year):
+        gregorian = calendar.to_gregorian(year, month, day)
+        if EthiopianDateConverter.to_gregorian(year, month, day) != gregorian:
+            mismatches.append((year, month, day))
+        try:
+            expected = EthiopianDateConverter.date_to_ethiopian(gregorian)
+        except ValueError:
+            # returned as a datetime.date, which can't hold Pagumen or day 29/30 of a "February"
+            continue
+        if (expected.year, expected.month, expected.day) != (year, month, day):
+            mismatches.append((year, month, day))
+    return mismatches
+
+
+@pytest.mark.parametrize("year", [
+    pytest.param(year, marks=pytest.mark.xfail(strict=True, reason=LIBRARY_WRONG_YEARS[year]))
+    if year in LIBRARY_WRONG_YEARS else year
+    for year in range(1900, 2101)
+])
+def test_year_agrees_with_ethiopian_date(year):
+    assert library_mismatches(year) == []
+
+
+def test_every_day_round_trips():
+    for year in range(calendar.first_year, calendar.last_year + 1):
+        for month, day in days(year):
+            assert calendar.to_ethiopian(calendar.to_gregorian(year, month, day)) == (year, month, day)
+
+
+@pytest.mark.parametrize("ethiopian, gregorian", [
+    ((2017, 1, 1), datetime.date(2024, 9, 11)),
+    ((2016, 1, 1), datetime.date(2023, 9, 12)),    # after the Pagumen 6 of 2015
+    ((2016, 13, 5), datetime.date(2024, 9, 10)),
+    ((1900, 1, 1), datetime.date(1907, 9, 12)),
+    ((2093, 1, 1), datetime.date(2100, 9, 12)),    # Gregorian 2100 has no February 29
+    ((2100, 13, 5), datetime.date(2108, 9, 11)),
+])
+def test_known_dates(ethiopian, gregorian):
+    assert calendar.to_gregorian(*ethiopian) == gregorian
+    assert calendar.to_ethiopian(gregorian) == ethiopian
+
+
+def test_verify_skips_exactly_the_listed_years():
+    assert [year for year in range(1900, 2101) if library_is_wrong(year)] == sorted(LIBRARY_WRONG_YEARS)
+    assert verify_against_ethiopian_date() == ([], sorted(LIBRARY_WRONG_YEARS))
@@ -0,0 +1,68 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import Counter
+
+import pytest
+from docx import Document
+
+from extract_students import TextNormalizer, iter_rows_from_files
+
+
+def test_backreferences_use_each_rules_own_groups():
+    normalizer = TextNormalizer([
+        {"name": "year", "pattern": r"\bYEER\b", "replacement": "YEAR"},
+        {"name": "swap", "pattern": r"(\d+)-(\w)\b", "replacement": r"\2-\1"},
+        {"name": "double", "pattern": r"\b(c)c(at)\b", "replacement": r"\1\2"},
+    ])
+    text, matches = normalizer("YEER 12-A ccat GRADE & SECTION 9 B")
+    assert text == "YEAR A-12 cat GRADE & SECTION 9 B"
+    assert matches == [("9", "B")]
+    assert normalizer.hits == Counter({"year": 1, "swap": 1, "double": 1})
+
+
+@pytest.mark.parametrize("pattern", [r"(?P<word>\w+)", r"\b(\w)\1", r"(?P=x)"])
+def test_named_groups_and_backreferences_are_rejected(pattern):
+    with pytest.raises(ValueError):
+        TextNormalizer([{"name": "bad", "pattern": pattern, "replacement": ""}])
+
+
+def test_a_correction_can_complete_a_heading():
+    normalizer = TextNormalizer([{"name": "section", "pattern": r"\bSCETION\b", "replacement": "SECTION"}])
+    assert normalizer("GRADE & SCETION 10 C") == ("GRADE & SECTION 10 C", [("10", "C")])
+
+
+def make_mark_list(path, sections):
+    doc = Document()
+    for grade, section in sections:
+        doc.add_paragraph("2017 E.C YEER")
+        doc.add_paragraph(f"GRADE & SECTION {grade} {section}")
+        table = doc.add_table(rows=2, cols=4)
+        for cell, value in zip(table.rows[0].cells, ("No", "Name", "Sex", "Age")):
+            cell.text = value
+        for cell, value in zip(table.rows[1].cells, ("1", f"Abebe Kebede {section}", "M", "16")):
+            cell.text = value
+    doc.save(path)
+
+
+@pytest.mark.parametrize("files", [1, 2])
+def test_hits_from_every_file_are_merged(tmp_path, files):
+    paths = []
+    for i in range(files):
+        paths.append(str(tmp_path / f"marks{i}.docx"))
+        make_mark_list(paths[-1], [(9, "A"), (9, "B")])
+    hits = Counter()
+    rows = list(iter_rows_from_files(paths, max_workers=2, hits=hits))
+    assert [(grade, section) for grade, section, _ in rows] == [("9", "A"), ("9", "B")] * files
+    assert hits["year"] == 2 * files
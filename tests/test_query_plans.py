@@ -0,0 +1,55 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""EXPLAIN QUERY PLAN for the statements the hot code paths actually run.
+
+Each test calls the real function, records the SQL it sends to SQLite and
+checks that no step is a full SCAN or a temp b-tree sort; db.query_plans
+runs the same HOT_PATHS against a school's database.
+"""
+
+import datetime
+
+import pytest
+
+from db import directory
+from db.query_plans import HOT_PATHS, bad_steps, check_query_plans, explain, recorded
+from db.roster import RosterCache, roster_for_day
+
+
+@pytest.mark.parametrize("name", list(HOT_PATHS))
+def test_hot_path(session, name):
+    assert check_query_plans(session, {name: HOT_PATHS[name]}) == {}
+
+
+def test_cached_roster_for_day(engine, session):
+    cache = RosterCache()
+    day = datetime.date(2025, 9, 11)
+    roster_for_day(session, 1, 1, day, cache=cache)
+    with recorded(engine) as cached:
+        roster_for_day(session, 1, 1, day, cache=cache)
+    assert cached
+    assert bad_steps(session, cached) == []
+
+
+@pytest.mark.parametrize("page", [directory.teacher_page, directory.student_page])
+def test_directory_first_page_walks_the_name_index(engine, session, page):
+    # the first page has no key to seek to: an in-order walk of the name index
+    # that stops after PAGE_SIZE rows, never a sort of the whole table
+    with recorded(engine) as seen:
+        page(session)
+    steps = [step for sql, parameters in seen for step in explain(session, sql, parameters)]
+    assert any(step.endswith(("USING INDEX ix_teacher_name", "USING INDEX ix_student_name")) for step in steps)
+    assert bad_steps(session, seen, allowed=("SCAN teacher USING INDEX ix_teacher_name",
+                                             "SCAN student USING INDEX ix_student_name")) == []
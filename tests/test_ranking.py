@@ -0,0 +1,76 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""rank_term counts missing scores as 0 and copes with students who changed section."""
+
+import pytest
+
+from db.models import (Assessment, GradeSection, Score, Student, Subject, SubjectResult, Teacher,
+                       TeachingAssignment, TermResult)
+from db.ranking import rank_term
+
+YEAR, TERM = 2018, 1
+
+
+@pytest.fixture
+def school(session):
+    a, b = GradeSection(grade=9, section="A"), GradeSection(grade=9, section="B")
+    maths, physics = Subject(name="Maths"), Subject(name="Physics")
+    teacher = Teacher(first_name="Abebe", father_name="Kebede", username="abebe", password_hash="x",
+                      role="teacher")
+    students = {name: Student(first_name=name, father_name="Test", age=15, section=a)
+                for name in ("Hana", "Sara", "Abel")}
+    session.add_all([a, b, maths, physics, teacher, *students.values()])
+    assessments = {}
+    for section in (a, b):
+        for subject in (maths, physics):
+            assignment = TeachingAssignment(teacher=teacher, subject=subject, grade_section=section)
+            assessments[section.section, subject.name] = Assessment(
+                teaching_assignment=assignment, year=YEAR, term=TERM, name="Mid", max_score=50)
+    session.add_all(assessments.values())
+    session.flush()
+
+    def score(student, section, subject, value):
+        session.add(Score(assessment_id=assessments[section, subject].id,
+                          student_id=students[student].id, score=value))
+
+    score("Hana", "A", "Maths", 40)
+    score("Hana", "A", "Physics", 40)
+    # Sara sat only the maths test
+    score("Sara", "A", "Maths", 50)
+    # Abel did maths in B before moving to A
+    score("Abel", "B", "Maths", 45)
+    score("Abel", "A", "Physics", 20)
+    session.commit()
+    return session, students
+
+
+def test_missing_scores_count_zero(school):
+    session, students = school
+    assert rank_term(session, YEAR, TERM) == 3
+    ranks = {r.student_id: r for r in session.query(TermResult)}
+    hana, sara = ranks[students["Hana"].id], ranks[students["Sara"].id]
+    assert (sara.subjects, sara.total, sara.average) == (2, 50, 50)
+    assert (hana.subjects, hana.total, hana.average) == (2, 80, 80)
+    assert hana.section_rank < sara.section_rank
+
+
+def test_student_who_changed_section_gets_one_row_per_subject(school):
+    session, students = school
+    rank_term(session, YEAR, TERM)
+    abel = {r.subject_id: (r.total, r.out_of) for r in
+            session.query(SubjectResult).filter_by(student_id=students["Abel"].id)}
+    maths, physics = (session.query(Subject).filter_by(name=name).one().id for name in ("Maths", "Physics"))
+    # section A's maths test counts as missed next to the one he sat in B
+    assert abel == {maths: (45, 100), physics: (20, 50)}
@@ -0,0 +1,52 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Report cards and attendance sheets agree on days absent."""
+
+from db.models import Attendance, GradeSection, Student, Teacher, TermResult
+from eth_custom_calendar.calendar_core import calendar
+from reports.generate import attendance_sheet_batches, report_card_batches
+
+YEAR, TERM, MONTH = 2018, 1, 1
+
+# (teacher marks on day 1, day 2, day 3) for each student
+MARKS = {
+    "Hana": (["Absent", "Absent"], ["Absent", "Present"], ["Present", "Present"]),
+    "Sara": (["Absent", "Present", "Present"], ["Late", "Late"], ["Absent", "Absent", "Absent"]),
+}
+
+
+def test_card_counts_absent_days_like_the_sheet(session):
+    section = GradeSection(grade=9, section="A")
+    teachers = [Teacher(first_name=f"T{n}", father_name="Test", username=f"t{n}", password_hash="x",
+                        role="teacher") for n in range(3)]
+    session.add_all([section, *teachers])
+    for rank, (name, days) in enumerate(MARKS.items(), 1):
+        student = Student(first_name=name, father_name="Test", age=15, section=section)
+        session.add(student)
+        session.flush()
+        session.add(TermResult(student_id=student.id, year=YEAR, term=TERM, section_id=section.id,
+                               grade=9, subjects=0, total=0, average=0, section_rank=rank, grade_rank=rank))
+        for day, statuses in enumerate(days, 1):
+            date = calendar.to_gregorian(YEAR, MONTH, day)
+            session.add_all(Attendance(student_id=student.id, teacher_id=teacher.id, date=date, status=status)
+                            for teacher, status in zip(teachers, statuses))
+    session.commit()
+
+    [(_, cards)] = report_card_batches(session, YEAR, TERM)
+    card_absent = {values["name"]: values["absent"] for _, values, _ in cards}
+    [(_, [(_, _, sheet_rows)])] = attendance_sheet_batches(session, YEAR, MONTH)
+    sheet_absent = {row["name"]: row["absent"] for row in sheet_rows}
+    # Hana: absent for both teachers, then for half of them; Sara: absent only on day 3
+    assert card_absent == sheet_absent == {"Hana Test": 2, "Sara Test": 1}
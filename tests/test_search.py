@@ -0,0 +1,85 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""search_people finds short and misspelled names the trigram index can't."""
+
+import pytest
+
+from db.models import GradeSection, Student
+from db.search import edit_distance, search_people
+
+NAMES = [("ካሳ", "ተሰማ"), ("ካሳሁን", "በቀለ"), ("Abel", "Tesfaye"), ("Abebe", "Kebede"), ("Ab", "Girma"), ("ሰላም", "ደጉ")]
+
+
+@pytest.fixture
+def people(session):
+    section = GradeSection(grade=9, section="A")
+    session.add(section)
+    session.add_all(Student(first_name=first, father_name=father, age=15, section=section)
+                    for first, father in NAMES)
+    session.commit()
+    return session
+
+
+def names(results):
+    return [(result.first_name, result.father_name) for result in results]
+
+
+def test_two_character_word_matches_name_prefixes(people):
+    assert sorted(names(search_people(people, "ካሳ"))) == [("ካሳ", "ተሰማ"), ("ካሳሁን", "በቀለ")]
+
+
+def test_short_word_narrows_a_full_text_match(people):
+    # "Abel" shares the trigram "abe" and only tops up after the real match
+    assert names(search_people(people, "abebe ke"))[0] == ("Abebe", "Kebede")
+
+
+def test_misspelled_short_name(people):
+    assert ("Abel", "Tesfaye") in names(search_people(people, "Abl"))
+    assert ("ሰላም", "ደጉ") in names(search_people(people, "ሰለም"))
+
+
+def one_edit(word):
+    for i in range(len(word) + 1):
+        yield word[:i] + "x" + word[i:]
+        if i < len(word):
+            yield word[:i] + word[i + 1:]
+            yield word[:i] + "x" + word[i + 1:]
+        if i < len(word) - 1:
+            yield word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+@pytest.mark.parametrize("query", sorted(set(one_edit("kebede")) - {"kebede"}))
+def test_every_single_edit_is_found(people, query):
+    assert ("Abebe", "Kebede") in names(search_people(people, query))
+
+
+def test_renamed_and_grandfather_names_are_found(people):
+    student = people.query(Student).filter_by(first_name="Abel").one()
+    student.father_name, student.grandfather_name = "Worku", "Alemayehu"
+    people.commit()
+    assert ("Abel", "Worku") in names(search_people(people, "wrku"))
+    assert ("Abel", "Worku") in names(search_people(people, "alemayhu"))
+
+
+def test_exact_matches_rank_first(people):
+    assert names(search_people(people, "abebe"))[0] == ("Abebe", "Kebede")
+    assert names(search_people(people, "zzz")) == []
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("abel", "abel", 0), ("abl", "abel", 1), ("abel", "aebl", 1), ("ካሳ", "ካሣ", 1), ("abel", "kebede", 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, cutoff=2) == min(distance, 3)
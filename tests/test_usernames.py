@@ -0,0 +1,79 @@
+# Copyright 2025 Dagim Genene
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     https://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Teacher.allocate_codes hands out unique, gap-free usernames under concurrent writers."""
+
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from db.base import make_engine
+from db.models import Base, Teacher
+
+THREADS, PER_THREAD, BATCH = 6, 30, 10
+
+
+def new_teacher(username):
+    return Teacher(first_name="T", father_name="F", username=username, password_hash="x", role="teacher")
+
+
+@pytest.fixture
+def Session(tmp_path):
+    # a file, not :memory:, so every thread gets its own connection and the write lock is real
+    engine = make_engine(str(tmp_path / "school.db"))
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_concurrent_writers_get_unique_gap_free_usernames(Session):
+    errors = []
+
+    def writer(batch):
+        session = Session()
+        try:
+            for _ in range(PER_THREAD // batch):
+                session.add_all(map(new_teacher, Teacher.allocate_codes(session, "teacher", batch)))
+                session.commit()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            session.close()
+
+    # half the threads take one username per commit, half ten at a time
+    threads = [threading.Thread(target=writer, args=(BATCH if n % 2 else 1,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with Session() as session:
+        usernames = sorted(username for (username,) in session.query(Teacher.username))
+    assert usernames == [f"TH{n:05d}" for n in range(1, THREADS * PER_THREAD + 1)]
+
+
+def test_first_allocation_starts_after_existing_usernames(Session):
+    with Session() as session:
+        session.add_all([new_teacher("TH00041"), new_teacher("STF007")])
+        session.commit()
+        assert Teacher.allocate_codes(session, "teacher", 2) == ["TH00042", "TH00043"]
+        assert Teacher.generate_code(session, "admin") == "STF008"
+
+
+def test_rollback_returns_the_codes(Session):
+    with Session() as session:
+        assert Teacher.allocate_codes(session, "teacher", 3) == ["TH00001", "TH00002", "TH00003"]
+        session.rollback()
+        assert Teacher.generate_code(session, "teacher") == "TH00001"